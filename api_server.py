@@ -10,12 +10,34 @@ from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Body, status
 from fastapi.middleware.cors import CORSMiddleware
 import tempfile
 import glob
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+from app.core.admission_controller import AdmissionController
+from app.core.config_manager import read_config_file, write_config_file
+from app.core.recording_index import RecordingIndex, find_media_files
+from app.core.retention_engine import RetentionEngine, load_retention_policies, save_retention_policies
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """服务启动时打开录制文件索引, 关闭时释放, 导入本模块不会创建数据库文件"""
+    global recording_index, retention_engine
+    os.makedirs(CONFIG_DIR, exist_ok=True)
+    recording_index = RecordingIndex(os.path.join(CONFIG_DIR, "recordings_index.db"))
+    retention_engine = RetentionEngine(recording_index, load_user_settings)
+    try:
+        yield
+    finally:
+        recording_index.close()
+        recording_index = retention_engine = None
 
 # 创建FastAPI应用
 app = FastAPI(
     title="StreamCap API",
     description="直播流录制服务API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # 添加CORS中间件，允许所有来源访问API
@@ -46,6 +68,7 @@ class RecordRequest(BaseModel):
     title_folder: Optional[bool] = Field(False, description="是否按标题创建文件夹")
     interval: Optional[int] = Field(60, description="检查直播状态的间隔时间(秒)")
     script: Optional[str] = Field(None, description="录制完成后运行的自定义脚本")
+    priority: Optional[int] = Field(0, description="录制优先级, 并发名额不足时数值越大越先启动")
 
 class StopRequest(BaseModel):
     id: Optional[int] = Field(None, description="录制ID")
@@ -63,6 +86,17 @@ class RecordStatusResponse(BaseModel):
 class RecordListResponse(BaseModel):
     recordings: List[RecordStatusResponse] = []
 
+class RetentionPolicy(BaseModel):
+    max_age_days: Optional[float] = Field(0, description="删除早于多少天的录制, 0表示不限制")
+    max_size_gb: Optional[float] = Field(0, description="录制文件总大小上限(GB), 0表示不限制")
+    keep_sessions: Optional[int] = Field(0, description="保留最近的场次数, 0表示不限制")
+
+class RetentionRequest(BaseModel):
+    enabled: Optional[bool] = Field(None, description="是否启用图形界面中的自动清理")
+    global_policy: Optional[RetentionPolicy] = Field(None, alias="global", description="全局策略")
+    platform: Optional[Dict[str, RetentionPolicy]] = Field(None, description="按平台设置的策略")
+    streamer: Optional[Dict[str, RetentionPolicy]] = Field(None, description="按主播设置的策略")
+
 class ApiResponse(BaseModel):
     success: bool
     message: str
@@ -71,6 +105,46 @@ class ApiResponse(BaseModel):
 # 运行状态跟踪
 running_processes = {}
 
+# 后台任务需要保留引用, 否则可能在运行中被垃圾回收
+background_task_refs = set()
+
+
+def spawn_background_task(coro):
+    """创建后台任务并保留引用, 任务结束后移除并记录异常"""
+    task = asyncio.create_task(coro)
+    background_task_refs.add(task)
+
+    def on_done(done_task: asyncio.Task):
+        background_task_refs.discard(done_task)
+        if not done_task.cancelled() and done_task.exception():
+            print(f"后台任务异常: {done_task.exception()}")
+
+    task.add_done_callback(on_done)
+    return task
+
+# 并发录制准入控制, 通过环境变量配置, 0表示不限制
+admission_controller = AdmissionController(
+    max_concurrent=int(os.environ.get("MAX_CONCURRENT_RECORDINGS", 0)),
+    max_cpu_percent=float(os.environ.get("MAX_CPU_PERCENT", 0)),
+    min_free_memory_percent=float(os.environ.get("MIN_FREE_MEMORY_PERCENT", 0)),
+)
+
+# 录制保留策略, 与图形界面共用用户配置和录制文件索引
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config")
+USER_SETTINGS_PATH = os.path.join(CONFIG_DIR, "user_settings.json")
+# 在lifespan中打开
+recording_index: Optional[RecordingIndex] = None
+retention_engine: Optional[RetentionEngine] = None
+
+def load_user_settings() -> dict:
+    try:
+        return read_config_file(USER_SETTINGS_PATH)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def save_user_settings(user_settings: dict):
+    write_config_file(USER_SETTINGS_PATH, user_settings)
+
 # 帮助函数
 def build_start_command(record_request: RecordRequest) -> List[str]:
     """构建start.py的命令行参数"""
@@ -263,6 +337,12 @@ async def start_recording_task(cmd: List[str]):
             stdin=asyncio.subprocess.PIPE
         )
         
+        # 降低录制进程的CPU/IO优先级, 避免影响API服务响应
+        try:
+            os.setpriority(os.PRIO_PROCESS, process.pid, 10)
+        except (AttributeError, OSError):
+            pass
+
         # 记录进程
         running_processes[process.pid] = {
             "cmd": cmd,
@@ -275,6 +355,30 @@ async def start_recording_task(cmd: List[str]):
     except Exception as e:
         raise Exception(f"启动录制进程失败: {str(e)}")
 
+async def admit_and_start_recording(cmd: List[str], key: str, priority: int = 0):
+    """等待准入控制分配名额后启动录制进程, 进程退出时释放名额"""
+    await admission_controller.acquire(key, priority=priority)
+    try:
+        pid = await start_recording_task(cmd)
+    except Exception:
+        await admission_controller.release(key)
+        raise
+
+    async def release_on_exit():
+        try:
+            await running_processes[pid]["process"].wait()
+        finally:
+            await admission_controller.release(key)
+
+    spawn_background_task(release_on_exit())
+    return pid
+
+async def run_queued_recording(cmd: List[str], key: str, priority: int = 0):
+    try:
+        await admit_and_start_recording(cmd, key, priority)
+    except Exception as e:
+        print(f"排队的录制任务启动失败: {key}, {str(e)}")
+
 # API端点
 @app.get("/", response_model=ApiResponse)
 async def root():
@@ -293,9 +397,24 @@ async def start_record(record_request: RecordRequest, background_tasks: Backgrou
     """开始录制或监控直播"""
     try:
         cmd = build_start_command(record_request)
-        
+        # 每次请求使用独立的准入键, 同一URL的多个录制各占一个名额, 互不释放对方的名额
+        key = f"{record_request.url}#{uuid.uuid4().hex[:8]}"
+        priority = record_request.priority or 0
+
+        # 并发名额已满时进入排队, 由后台任务在名额空出后启动
+        if not admission_controller.has_capacity():
+            spawn_background_task(run_queued_recording(cmd, key, priority))
+            return {
+                "success": True,
+                "message": f"并发录制数已达上限, 已加入等待队列: {record_request.url}",
+                "data": {
+                    "queued": True,
+                    "admission": admission_controller.snapshot()
+                }
+            }
+
         # 异步启动录制进程
-        process_pid = await start_recording_task(cmd)
+        process_pid = await admit_and_start_recording(cmd, key, priority)
         
         return {
             "success": True,
@@ -340,6 +459,82 @@ async def get_status():
             detail=f"获取状态失败: {str(e)}"
         )
 
+@app.get("/admission", response_model=ApiResponse)
+async def get_admission():
+    """获取并发录制名额与排队状态"""
+    snapshot = admission_controller.snapshot()
+    return {
+        "success": True,
+        "message": f"录制中 {snapshot['active']} 个, 排队 {snapshot['queued']} 个",
+        "data": snapshot
+    }
+
+@app.get("/retention", response_model=ApiResponse)
+async def get_retention():
+    """获取录制保留策略与录制文件索引统计"""
+    user_settings = load_user_settings()
+    return {
+        "success": True,
+        "message": "获取保留策略成功",
+        "data": {
+            "enabled": bool(user_settings.get("retention_enabled")),
+            "policies": load_retention_policies(user_settings),
+            "index": recording_index.get_stats(),
+        }
+    }
+
+@app.put("/retention", response_model=ApiResponse)
+async def update_retention(retention_request: RetentionRequest):
+    """更新录制保留策略, 未提供的部分保持不变"""
+    user_settings = load_user_settings()
+    policies = load_retention_policies(user_settings)
+    if retention_request.global_policy is not None:
+        policies["global"] = retention_request.global_policy.model_dump()
+    if retention_request.platform is not None:
+        policies["platform"] = {k: v.model_dump() for k, v in retention_request.platform.items()}
+    if retention_request.streamer is not None:
+        policies["streamer"] = {k: v.model_dump() for k, v in retention_request.streamer.items()}
+    save_retention_policies(user_settings, policies)
+    if retention_request.enabled is not None:
+        user_settings["retention_enabled"] = retention_request.enabled
+    try:
+        save_user_settings(user_settings)
+    except OSError as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"保存保留策略失败: {e}")
+    return {
+        "success": True,
+        "message": "保留策略已更新",
+        "data": {"enabled": bool(user_settings.get("retention_enabled")), "policies": policies}
+    }
+
+@app.post("/retention/run", response_model=ApiResponse)
+async def run_retention(output_dir: str = Query("downloads", description="要登记到索引中的录制目录")):
+    """登记目录中的录制文件并立即执行一次清理, 每次最多删除一批文件"""
+    if os.path.isdir(output_dir):
+        paths = await asyncio.to_thread(find_media_files, output_dir)
+        await asyncio.to_thread(recording_index.register_untracked, paths)
+    deleted = await retention_engine.run_once()
+    return {
+        "success": True,
+        "message": f"已删除 {deleted} 个录制文件",
+        "data": {"deleted": deleted, "index": recording_index.get_stats()}
+    }
+
+@app.get("/sessions", response_model=ApiResponse)
+async def get_sessions(
+    rec_id: Optional[str] = Query(None, description="只返回该直播间的录制场次"),
+    days: Optional[float] = Query(None, description="只返回最近若干天开始的场次"),
+    limit: int = Query(100, ge=1, le=1000, description="最多返回的场次数"),
+):
+    """获取已结束的录制场次历史与时长、大小、码率统计"""
+    since = time.time() - days * 86400 if days else None
+    sessions = recording_index.get_session_history(rec_id, since, limit=limit)
+    return {
+        "success": True,
+        "message": f"找到 {len(sessions)} 个录制场次",
+        "data": {"sessions": sessions, "stats": recording_index.get_session_stats(rec_id, since)}
+    }
+
 @app.post("/stop", response_model=ApiResponse)
 async def stop_record(stop_request: StopRequest):
     """停止录制或监控"""
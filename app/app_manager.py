@@ -3,9 +3,17 @@ import os
 import flet as ft
 
 from . import InstallationManager, execute_dir
+from .core.admission_controller import AdmissionController
 from .core.config_manager import ConfigManager
+from .core.disk_space_monitor import DiskSpaceMonitor
+from .core.job_queue import JobQueue
 from .core.language_manager import LanguageManager
 from .core.record_manager import RecordingManager
+from .core.recording_index import RecordingIndex
+from .core.recording_journal import RecordingJournal
+from .core.retention_engine import RetentionEngine
+from .core.room_identity import RoomIdentityResolver
+from .core.volume_manager import VolumeManager
 from .process_manager import AsyncProcessManager
 from .ui.components.recording_card import RecordingCardManager
 from .ui.components.show_snackbar import ShowSnackBar
@@ -25,6 +33,7 @@ class App:
         self.assets_dir = os.path.join(execute_dir, "assets")
         self.process_manager = AsyncProcessManager()
         self.config_manager = ConfigManager(self.run_path)
+        self.settings_cache = self.config_manager.settings_cache
         self.content_area = ft.Column(
             controls=[],
             expand=True,
@@ -57,13 +66,35 @@ class App:
         self.snack_bar = ShowSnackBar(self.page)
         self.subprocess_start_up_info = utils.get_startup_info()
         self.record_card_manager = RecordingCardManager(self)
+        self.admission_controller = AdmissionController(on_change=self.on_admission_change)
+        self.job_queue = JobQueue(
+            self.config_manager,
+            max_workers=int(self.settings.user_config.get("post_processing_workers") or 2),
+            subprocess_start_info=self.subprocess_start_up_info,
+            on_change=self.on_jobs_change,
+        )
+        self.recording_journal = RecordingJournal(os.path.join(self.config_manager.config_path, "journal.json"))
+        self.volume_manager = VolumeManager()
+        self.recording_index = RecordingIndex(os.path.join(self.config_manager.config_path, "recordings_index.db"))
+        self.room_identity = RoomIdentityResolver(os.path.join(self.config_manager.config_path, "room_identity.db"))
+        self.retention_engine = RetentionEngine(
+            self.recording_index, lambda: self.settings.user_config, is_protected=self.job_queue.uses_path
+        )
         self.record_manager = RecordingManager(self)
+        self.disk_monitor = DiskSpaceMonitor(self)
         self.current_page = None
         self._loading_page = False
         self.recording_enabled = True
         self.install_manager = InstallationManager(self)
         self.page.run_task(self.install_manager.check_env)
         self.page.run_task(self.record_manager.check_free_space)
+        self.page.run_task(self.job_queue.start)
+        self.page.run_task(self.settings_cache.start)
+        self.page.run_task(self.disk_monitor.start)
+        self.page.run_task(self.record_manager.index_untracked_files)
+        self.page.run_task(self.retention_engine.start)
+        self.page.run_task(self.record_manager.recover_interrupted_sessions)
+        self.page.run_task(self.record_manager.canonicalize_recordings)
 
     def initialize_pages(self):
         return {
@@ -94,6 +125,14 @@ class App:
 
     async def cleanup(self):
         await self.process_manager.cleanup()
+        await self.record_manager.flush_recordings()
+        await self.job_queue.stop()
+
+    def on_admission_change(self, snapshot: dict):
+        self.page.pubsub.send_all_on_topic("admission", snapshot)
+
+    def on_jobs_change(self, snapshot: dict):
+        self.page.pubsub.send_all_on_topic("jobs", snapshot)
 
     def add_ffmpeg_process(self, process):
         self.process_manager.add_process(process)
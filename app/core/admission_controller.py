@@ -0,0 +1,169 @@
+import asyncio
+import itertools
+import os
+import time
+from collections.abc import Callable
+
+from ..process_manager import psutil
+from ..utils.logger import logger
+
+
+class AdmissionDecision:
+    ADMITTED = "ADMITTED"
+    DOWNGRADED = "DOWNGRADED"
+    CANCELLED = "CANCELLED"
+
+
+def get_system_usage() -> tuple[float | None, float | None]:
+    """
+    Return the current CPU usage percent and available memory percent.
+    Values that cannot be measured on this platform are returned as None.
+    """
+    if psutil:
+        memory = psutil.virtual_memory()
+        return psutil.cpu_percent(interval=None), memory.available * 100 / memory.total
+
+    cpu_percent = None
+    if hasattr(os, "getloadavg"):
+        cpu_percent = os.getloadavg()[0] * 100 / (os.cpu_count() or 1)
+
+    memory_percent = None
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as file:
+            meminfo = {line.split(":")[0]: int(line.split()[1]) for line in file if line.strip()}
+        memory_percent = meminfo["MemAvailable"] * 100 / meminfo["MemTotal"]
+    except (OSError, KeyError, ValueError, ZeroDivisionError):
+        pass
+    return cpu_percent, memory_percent
+
+
+class AdmissionController:
+    """
+    Limits the number of concurrently running recordings.
+
+    Recordings that do not fit into the budget wait in a queue ordered by priority (higher first)
+    and arrival. Recordings admitted while the host lacks CPU or memory headroom are downgraded,
+    so the caller can record them at a lower quality.
+    """
+
+    RECHECK_INTERVAL = 5
+    USAGE_CACHE_SECONDS = 2
+
+    def __init__(
+        self,
+        max_concurrent: int = 0,
+        max_cpu_percent: float = 0,
+        min_free_memory_percent: float = 0,
+        on_change: Callable[[dict], None] | None = None,
+    ):
+        """
+        :param max_concurrent: Maximum number of concurrent recordings, 0 means unlimited.
+        :param max_cpu_percent: CPU usage above which new recordings are downgraded, 0 disables the check.
+        :param min_free_memory_percent: Available memory below which new recordings are downgraded.
+        :param on_change: Callback receiving a snapshot whenever the active set or the queue changes.
+        """
+        self.max_concurrent = max_concurrent
+        self.max_cpu_percent = max_cpu_percent
+        self.min_free_memory_percent = min_free_memory_percent
+        self.on_change = on_change
+        self._active: dict[str, int] = {}
+        self._waiting: dict[str, tuple[int, int]] = {}
+        self._counter = itertools.count()
+        self._condition = asyncio.Condition()
+        self._usage = (None, None)
+        self._usage_time = 0.0
+
+    def configure(self, max_concurrent: int, max_cpu_percent: float, min_free_memory_percent: float):
+        self.max_concurrent = max_concurrent
+        self.max_cpu_percent = max_cpu_percent
+        self.min_free_memory_percent = min_free_memory_percent
+
+    def _get_usage(self) -> tuple[float | None, float | None]:
+        now = time.monotonic()
+        if now - self._usage_time > self.USAGE_CACHE_SECONDS:
+            self._usage = get_system_usage()
+            self._usage_time = now
+        return self._usage
+
+    def has_capacity(self) -> bool:
+        return not self.max_concurrent or len(self._active) < self.max_concurrent
+
+    def has_headroom(self) -> bool:
+        cpu_percent, memory_percent = self._get_usage()
+        if self.max_cpu_percent and cpu_percent is not None and cpu_percent > self.max_cpu_percent:
+            return False
+        if self.min_free_memory_percent and memory_percent is not None and (
+            memory_percent < self.min_free_memory_percent
+        ):
+            return False
+        return True
+
+    def _is_next(self, key: str) -> bool:
+        return min(self._waiting, key=self._waiting.get) == key
+
+    def _notify_change(self):
+        if self.on_change:
+            try:
+                self.on_change(self.snapshot())
+            except Exception as e:
+                logger.error(f"Admission state callback failed: {e}")
+
+    async def acquire(self, key: str, priority: int = 0, is_wanted: Callable[[], bool] | None = None) -> str:
+        """
+        Wait until the recording identified by `key` may start.
+
+        :param key: Unique recording identifier.
+        :param priority: Higher values are admitted first.
+        :param is_wanted: Polled while queued, the wait is abandoned once it returns False.
+        :return: An AdmissionDecision value.
+        """
+        async with self._condition:
+            if key in self._active:
+                return AdmissionDecision.ADMITTED
+
+            self._waiting[key] = (-priority, next(self._counter))
+            queued = False
+            try:
+                while not (self.has_capacity() and self._is_next(key)):
+                    if is_wanted and not is_wanted():
+                        return AdmissionDecision.CANCELLED
+                    if not queued:
+                        queued = True
+                        logger.info(f"Recording queued by admission control: {key}, priority={priority}")
+                        self._notify_change()
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout=self.RECHECK_INTERVAL)
+                    except asyncio.TimeoutError:
+                        pass
+
+                self._active[key] = priority
+                decision = AdmissionDecision.ADMITTED if self.has_headroom() else AdmissionDecision.DOWNGRADED
+                logger.info(f"Recording admitted: {key}, decision={decision}, active={len(self._active)}")
+                return decision
+            finally:
+                self._waiting.pop(key, None)
+                self._condition.notify_all()
+                self._notify_change()
+
+    async def release(self, key: str):
+        """Free the slot held by `key` and wake up the queue."""
+        async with self._condition:
+            if self._active.pop(key, None) is None:
+                return
+            self._condition.notify_all()
+        self._notify_change()
+
+    def is_queued(self, key: str) -> bool:
+        return key in self._waiting
+
+    def snapshot(self) -> dict:
+        cpu_percent, memory_percent = self._usage
+        queue = sorted(self._waiting.items(), key=lambda item: item[1])
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": len(self._active),
+            "queued": len(queue),
+            "queue": [{"key": key, "priority": -rank[0]} for key, rank in queue],
+            "cpu_percent": None if cpu_percent is None else round(cpu_percent, 1),
+            "free_memory_percent": None if memory_percent is None else round(memory_percent, 1),
+        }
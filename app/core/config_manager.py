@@ -1,11 +1,78 @@
+import asyncio
 import json
 import os
 import shutil
+import tempfile
+import threading
 from typing import Any
 
-import aiofiles
-
 from ..utils.logger import logger
+from .recordings_store import RecordingsStore
+from .settings_cache import SettingsCache
+from .watchlist_io import write_watchlist
+
+_write_locks: dict[str, threading.Lock] = {}
+_write_locks_guard = threading.Lock()
+
+
+def _fsync_directory(dir_path: str):
+    """Persist a rename in the directory itself, not supported on Windows."""
+    if os.name == "nt":
+        return
+    fd = os.open(dir_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_config_file(config_path: str, config: Any):
+    """
+    Replace a JSON file atomically: the new content is written and fsynced to a temp file in the
+    same directory before it is renamed over the target, so a crash at any point leaves either
+    the old or the new version. The previous version is kept as `<file>.bak`.
+    """
+    config_path = os.path.abspath(config_path)
+    with _write_locks_guard:
+        lock = _write_locks.setdefault(config_path, threading.Lock())
+
+    dir_path, filename = os.path.split(config_path)
+    with lock:
+        fd, temp_path = tempfile.mkstemp(prefix=f".{filename}.", suffix=".tmp", dir=dir_path)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(config, file, ensure_ascii=False, indent=4)
+                file.flush()
+                os.fsync(file.fileno())
+            if os.path.exists(config_path):
+                os.replace(config_path, f"{config_path}.bak")
+            os.replace(temp_path, config_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        _fsync_directory(dir_path)
+
+
+def read_config_file(config_path: str) -> Any:
+    """
+    Read a JSON file written by `write_config_file`, falling back to its backup when the file is
+    missing, empty or corrupt. Raises the error of the file itself when there is no usable backup.
+    """
+    try:
+        with open(config_path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, json.JSONDecodeError) as e:
+        backup_path = f"{config_path}.bak"
+        if not os.path.exists(backup_path):
+            raise
+        try:
+            with open(backup_path, encoding="utf-8") as file:
+                config = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            raise e from None
+        logger.warning(f"Configuration file is unreadable ({e}), restored from backup: {backup_path}")
+        return config
 
 
 class ConfigManager:
@@ -17,10 +84,14 @@ class ConfigManager:
         self.cookies_config_path = os.path.join(self.config_path, "cookies.json")
         self.about_config_path = os.path.join(self.config_path, "version.json")
         self.recordings_config_path = os.path.join(self.config_path, "recordings.json")
+        self.recordings_db_path = os.path.join(self.config_path, "recordings.db")
+        self.recordings_store = None
         self.accounts_config_path = os.path.join(self.config_path, "accounts.json")
+        self.jobs_config_path = os.path.join(self.config_path, "jobs.json")
 
         os.makedirs(os.path.dirname(self.default_config_path), exist_ok=True)
         self.init()
+        self.settings_cache = SettingsCache(self)
 
     def init(self):
         self.init_default_config()
@@ -36,8 +107,7 @@ class ConfigManager:
             if default_config is None:
                 default_config = {}
             try:
-                with open(config_path, "w", encoding="utf-8") as file:
-                    json.dump(default_config, file, ensure_ascii=False, indent=4)
+                write_config_file(config_path, default_config)
                 logger.info(f"Initialized configuration file: {config_path}")
             except Exception as e:
                 logger.error(f"Failed to initialize configuration file {config_path}: {e}")
@@ -60,15 +130,14 @@ class ConfigManager:
         self._init_config(self.accounts_config_path, cookies_config)
 
     def init_recordings_config(self):
-        cookies_config = {}
-        self._init_config(self.recordings_config_path, cookies_config)
+        """Open the recordings store, recordings of an existing recordings.json are migrated into it."""
+        self.recordings_store = RecordingsStore(self.recordings_db_path, self.recordings_config_path)
 
     @staticmethod
     def _load_config(config_path, error_message):
-        """Load configuration from a JSON file."""
+        """Load configuration from a JSON file, or from its backup if the file is damaged."""
         try:
-            with open(config_path, encoding="utf-8") as file:
-                return json.load(file)
+            return read_config_file(config_path)
         except json.JSONDecodeError:
             logger.error(f"Invalid JSON format in file: {config_path}")
             return {}
@@ -86,11 +155,20 @@ class ConfigManager:
         return self._load_config(self.user_config_path, "An error occurred while loading user config")
 
     def load_recordings_config(self):
-        return self._load_config(self.recordings_config_path, "An error occurred while loading recordings config")
+        try:
+            return self.recordings_store.load()
+        except Exception as e:
+            logger.error(f"An error occurred while loading recordings config: {e}")
+            return []
 
     def load_accounts_config(self):
         return self._load_config(self.accounts_config_path, "An error occurred while loading accounts config")
 
+    def load_jobs_config(self):
+        if not os.path.exists(self.jobs_config_path):
+            return []
+        return self._load_config(self.jobs_config_path, "An error occurred while loading jobs config")
+
     def load_cookies_config(self):
         return self._load_config(self.cookies_config_path, "An error occurred while loading cookies config")
 
@@ -106,21 +184,24 @@ class ConfigManager:
 
     @staticmethod
     async def _save_config(config_path, config, success_message, error_message):
-        """Save configuration to a JSON file."""
+        """Save configuration to a JSON file, atomically and durably."""
         try:
-            async with aiofiles.open(config_path, "w", encoding="utf-8") as file:
-                await file.write(json.dumps(config, ensure_ascii=False, indent=4))
+            await asyncio.to_thread(write_config_file, config_path, config)
             logger.info(success_message)
         except Exception as e:
             logger.error(f"{error_message}: {e}")
 
-    async def save_recordings_config(self, config):
-        await self._save_config(
-            self.recordings_config_path,
-            config,
-            success_message="Recordings configuration saved.",
-            error_message="An error occurred while saving recordings config",
-        )
+    async def save_recordings_config(self, config, rec_ids=None):
+        """Write the rows of recordings that changed since the last save, errors are left to the caller."""
+        changed = await asyncio.to_thread(self.recordings_store.save, config, rec_ids)
+        if changed:
+            logger.info(f"Recordings configuration saved ({changed} changed).")
+
+    async def export_recordings_config(self, path) -> int:
+        """Export the recordings to a JSON lines file, e.g. as a backup, returns how many were written."""
+        count = await asyncio.to_thread(write_watchlist, self.recordings_store.iter_recordings(), path)
+        logger.info(f"Recordings exported: {path} ({count})")
+        return count
 
     async def save_accounts_config(self, config):
         await self._save_config(
@@ -130,6 +211,14 @@ class ConfigManager:
             error_message="An error occurred while saving accounts config",
         )
 
+    async def save_jobs_config(self, config):
+        await self._save_config(
+            self.jobs_config_path,
+            config,
+            success_message="Post-processing jobs saved.",
+            error_message="An error occurred while saving jobs config",
+        )
+
     async def save_user_config(self, config):
         await self._save_config(
             self.user_config_path,
@@ -147,6 +236,4 @@ class ConfigManager:
         )
 
     def get_config_value(self, key: str, default: Any = None):
-        user_config = self.load_user_config()
-        default_config = self.load_default_config()
-        return user_config.get(key, default_config.get(key, default))
+        return self.settings_cache.get_raw(key, default)
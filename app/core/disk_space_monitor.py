@@ -0,0 +1,190 @@
+import asyncio
+import time
+
+from ..utils.logger import logger
+from .volume_manager import Volume
+
+
+class DiskPressure:
+    NORMAL = "NORMAL"
+    WARNING = "WARNING"
+    DEGRADING = "DEGRADING"
+    CRITICAL = "CRITICAL"
+
+    ORDER = (NORMAL, WARNING, DEGRADING, CRITICAL)
+
+    @classmethod
+    def at_least(cls, level: str, threshold: str) -> bool:
+        return cls.ORDER.index(level) >= cls.ORDER.index(threshold)
+
+
+class DegradationStep:
+    DOWNGRADE = "downgrade"
+    AUDIO_ONLY = "audio_only"
+    STOP = "stop"
+
+    DEFAULT_STEPS = (DOWNGRADE, AUDIO_ONLY, STOP)
+
+    @classmethod
+    def parse(cls, text: str | None) -> list[str]:
+        """Parse a comma separated list of steps, e.g. 'downgrade,downgrade,audio_only,stop'."""
+        steps = [i.strip().lower() for i in (text or "").replace("，", ",").split(",")]
+        steps = [i for i in steps if i in cls.DEFAULT_STEPS]
+        return steps or list(cls.DEFAULT_STEPS)
+
+
+class DiskSpaceMonitor:
+    """
+    Samples the output volumes in the background and forecasts when each of them fills up.
+
+    The forecast uses the measured bitrates of the recordings writing to a volume, or the observed
+    shrinking of its free space when that is higher. Once a volume is forecast to fill up within
+    `disk_degrade_minutes`, its recordings are degraded one step at a time along the configured
+    steps (lower quality, audio only, stop), lowest priority rooms first and stopping only after
+    every room has gone through the other steps. Every recording on a volume is stopped once its
+    free space is below the threshold.
+    """
+
+    CHECK_INTERVAL = 15
+    # Time for the bitrate of a degraded recording to settle before the next step is taken
+    ACTION_INTERVAL = 60
+
+    def __init__(self, app):
+        self.app = app
+        self.volume_manager = app.volume_manager
+        self.levels: dict[str, str] = {}
+        self.forecasts: dict[str, float | None] = {}
+        self._shed: dict[str, set[str]] = {}
+        self._stages: dict[str, int] = {}
+        self._requests: dict[str, str] = {}
+        self._last_action: dict[str, float] = {}
+        self._task = None
+
+    def _get_text(self, key: str) -> str:
+        return self.app.language_manager.language.get("recording_manager", {}).get(key, key)
+
+    def _get_minutes(self, key: str, default: int) -> float:
+        return self.app.settings_cache.get(key) or default
+
+    async def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.volume_manager.refresh, True)
+                self.evaluate()
+            except Exception as e:
+                logger.error(f"Disk space monitor failed: {e}")
+            await asyncio.sleep(self.CHECK_INTERVAL)
+
+    @staticmethod
+    def get_write_rate(volume: Volume) -> float:
+        """Aggregate write rate of a volume in bytes per second."""
+        return max(sum(volume.writers.values()), volume.write_rate_mb * 1024**2)
+
+    def forecast(self, volume: Volume) -> float | None:
+        """Seconds until the volume reaches the space threshold, None when nothing is filling it."""
+        rate = self.get_write_rate(volume)
+        if volume.free_gb is None or rate <= 0:
+            return None
+        return max(0.0, (volume.free_gb - self.volume_manager.space_threshold) * 1024**3 / rate)
+
+    def _get_level(self, volume: Volume, seconds_to_full: float | None) -> str:
+        if volume.free_gb is not None and volume.free_gb < self.volume_manager.space_threshold:
+            return DiskPressure.CRITICAL
+        if seconds_to_full is None:
+            return DiskPressure.NORMAL
+        minutes = seconds_to_full / 60
+        if minutes < self._get_minutes("disk_degrade_minutes", 30):
+            return DiskPressure.DEGRADING
+        if minutes < self._get_minutes("disk_warn_minutes", 60):
+            return DiskPressure.WARNING
+        return DiskPressure.NORMAL
+
+    def evaluate(self):
+        for volume in self.volume_manager.volumes:
+            seconds_to_full = self.forecast(volume)
+            level = self._get_level(volume, seconds_to_full)
+            previous = self.levels.get(volume.path, DiskPressure.NORMAL)
+            self.levels[volume.path] = level
+            self.forecasts[volume.path] = seconds_to_full
+
+            if level != previous:
+                self._on_level_change(volume, previous, level, seconds_to_full)
+            if level == DiskPressure.CRITICAL:
+                # Not blocked, the next live check places these rooms on a volume that still has space
+                self._stop_writers(volume, list(volume.writers), block=False)
+            elif level == DiskPressure.DEGRADING:
+                if time.monotonic() - self._last_action.get(volume.path, 0) >= self.ACTION_INTERVAL:
+                    self._degrade_next(volume)
+            else:
+                self._shed.pop(volume.path, None)
+
+    def _on_level_change(self, volume: Volume, previous: str, level: str, seconds_to_full: float | None):
+        forecast_text = f"{seconds_to_full / 60:.0f} min" if seconds_to_full is not None else "-"
+        message = f"Disk pressure on {volume.path}: {previous} -> {level}, full in {forecast_text}"
+        if DiskPressure.at_least(level, DiskPressure.WARNING) and DiskPressure.at_least(level, previous):
+            logger.warning(message)
+            self.app.page.run_task(
+                self.app.snack_bar.show_snack_bar,
+                f"{self._get_text('disk_space_forecast_tip')}: {volume.path} ({forecast_text})",
+                duration=5000,
+            )
+        else:
+            logger.info(message)
+
+    def _get_recordings(self, rec_ids: list[str]) -> list:
+        recordings = [self.app.record_manager.find_recording_by_id(rec_id) for rec_id in rec_ids]
+        return [recording for recording in recordings if recording and recording.recording]
+
+    def _stop_writers(self, volume: Volume, rec_ids: list[str], block: bool = True):
+        shed = self._shed.setdefault(volume.path, set())
+        for recording in self._get_recordings(rec_ids):
+            if block:
+                shed.add(recording.rec_id)
+            volume.writers.pop(recording.rec_id, None)
+            logger.warning(f"Stopping recording to save disk space on {volume.path}: {recording.url}")
+            self.app.record_manager.stop_recording(recording)
+
+    def _degrade_next(self, volume: Volume):
+        """Take the next degradation step of the recording that should give way first."""
+        steps = DegradationStep.parse(",".join(self.app.settings_cache.get("disk_degradation_steps", [])))
+        candidates = []
+        for recording in self._get_recordings(list(volume.writers)):
+            stage = self._stages.get(recording.rec_id, 0)
+            if stage < len(steps):
+                step = steps[stage]
+                order = (step == DegradationStep.STOP, int(recording.priority or 0), stage)
+                candidates.append((order, recording, step))
+        if not candidates:
+            return
+
+        _, recording, step = min(candidates, key=lambda candidate: candidate[0])
+        self._stages[recording.rec_id] = self._stages.get(recording.rec_id, 0) + 1
+        self._last_action[volume.path] = time.monotonic()
+        if step == DegradationStep.STOP:
+            self._stop_writers(volume, [recording.rec_id])
+        else:
+            logger.warning(f"Degrading recording to save disk space on {volume.path} ({step}): {recording.url}")
+            self._requests[recording.rec_id] = step
+
+    def take_degradation_request(self, rec_id: str) -> str | None:
+        """Return the DegradationStep the recording should restart with, the request is consumed."""
+        return self._requests.pop(rec_id, None)
+
+    def forget(self, rec_id: str):
+        """Reset the degradation of a recording once its session has ended."""
+        self._stages.pop(rec_id, None)
+        self._requests.pop(rec_id, None)
+
+    def should_downgrade(self, volume_path: str) -> bool:
+        """Whether new recordings on this volume should start at a lower quality."""
+        volume = self.volume_manager.find(volume_path)
+        level = self.levels.get(volume.path, DiskPressure.NORMAL) if volume else DiskPressure.NORMAL
+        return DiskPressure.at_least(level, DiskPressure.DEGRADING)
+
+    def is_shed(self, rec_id: str) -> bool:
+        """Whether the recording was stopped for disk space and must wait until its volume recovers."""
+        return any(rec_id in shed for shed in self._shed.values())
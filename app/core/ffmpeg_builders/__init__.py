@@ -30,3 +30,41 @@ def create_builder(format_type: str, *args: Any, **kwargs: Any) -> Any:
     if not builder_class:
         raise ValueError(f"Unsupported format: {format_type}")
     return builder_class(*args, **kwargs)
+
+
+def create_multi_output_command(outputs: list[tuple[str, str]], **kwargs: Any) -> list[str]:
+    """
+    Builds a single FFmpeg command that reads the input once and writes one output per entry,
+    so several containers or an extra audio-only file cost a single download.
+
+    :param outputs: List of (format_type, full_path) pairs, the first entry is the primary output.
+    :param kwargs: Keyword arguments shared by every CommandBuilder (record_url, proxy, segment options...),
+        except `segment_list` which only applies to the primary output.
+    :return: The FFmpeg command as a list of strings.
+    :raises ValueError: If no output is given or a format_type is not supported.
+    """
+    if not outputs:
+        raise ValueError("At least one output is required")
+
+    format_type, full_path = outputs[0]
+    command = create_builder(format_type, full_path=full_path, **kwargs).build_command()
+    kwargs.pop("segment_list", None)
+    for format_type, full_path in outputs[1:]:
+        command.extend(create_builder(format_type, full_path=full_path, **kwargs).build_output_options())
+    return command
+
+
+def get_audio_strategies(outputs: list[tuple[str, str]], **kwargs: Any) -> dict[str, str]:
+    """
+    Tells how each output of `create_multi_output_command` treats the source audio.
+
+    :param outputs: List of (format_type, full_path) pairs.
+    :param kwargs: Keyword arguments shared by every CommandBuilder.
+    :return: Mapping of format_type to 'copy' or the encoder the audio is re-encoded with.
+    """
+    strategies = {}
+    for format_type, full_path in outputs:
+        builder = create_builder(format_type, full_path=full_path, **kwargs)
+        builder.build_command()
+        strategies[format_type] = builder.audio_strategy
+    return strategies
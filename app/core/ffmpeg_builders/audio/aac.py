@@ -2,26 +2,27 @@ from ..base import FFmpegCommandBuilder
 
 
 class AACCommandBuilder(FFmpegCommandBuilder):
+    COPY_AUDIO_CODECS = ("aac",)
+
     def build_command(self) -> list[str]:
         command = self._get_basic_ffmpeg_command()
+        audio_codec = self._get_audio_codec_options("aac", "-ar", "44100", "-ac", "2")
 
         if self.segment_record:
             additional_commands = [
-                "-c:a", "aac",
-                "-ar", "44100",
-                "-ac", "2",
+                *audio_codec,
                 "-map", "0:a",
-                "-f", "adts",
+                "-f", "segment",
+                "-segment_format", "adts",
                 "-segment_time", str(self.segment_time),
                 "-reset_timestamps", "1",
+                *self._get_segment_options(),
                 self.full_path,
             ]
         else:
             additional_commands = [
                 "-map", "0:a",
-                "-c:a", "aac",
-                "-ar", "44100",
-                "-ac", "2",
+                *audio_codec,
                 "-f", "ipod",
                 self.full_path,
             ]
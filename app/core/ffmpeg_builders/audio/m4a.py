@@ -1,26 +1,31 @@
 from ..base import FFmpegCommandBuilder
+from ..video.mp4 import FRAGMENTED_MOVFLAGS
 
 
 class M4ACommandBuilder(FFmpegCommandBuilder):
+    COPY_AUDIO_CODECS = ("aac",)
+
     def build_command(self) -> list[str]:
         command = self._get_basic_ffmpeg_command()
+        audio_codec = self._get_audio_codec_options("aac", "-b:a", "320k")
 
         if self.segment_record:
             additional_commands = [
-                "-c:a", "aac",
-                "-b:a","320k",
+                *audio_codec,
                 "-map", "0:a",
                 "-f", "segment",
                 "-segment_time", str(self.segment_time),
                 "-reset_timestamps", "1",
+                *(["-segment_format_options", f"movflags={FRAGMENTED_MOVFLAGS}"] if self.fragmented else []),
+                *self._get_segment_options(),
                 self.full_path,
             ]
         else:
             additional_commands = [
                 "-map", "0:a",
-                "-c:a", "aac",
-                "-b:a", "320k",
+                *audio_codec,
                 "-f", "mp4",
+                *(["-movflags", FRAGMENTED_MOVFLAGS] if self.fragmented else []),
                 self.full_path,
             ]
 
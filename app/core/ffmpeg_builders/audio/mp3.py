@@ -2,24 +2,26 @@ from ..base import FFmpegCommandBuilder
 
 
 class MP3CommandBuilder(FFmpegCommandBuilder):
+    COPY_AUDIO_CODECS = ("mp3",)
+
     def build_command(self) -> list[str]:
         command = self._get_basic_ffmpeg_command()
+        audio_codec = self._get_audio_codec_options("libmp3lame", "-b:a", "320k")
 
         if self.segment_record:
             additional_commands = [
-                "-c:a", "libmp3lame",
-                "-b:a", "320k",
+                *audio_codec,
                 "-map", "0:a",
                 "-f", "segment",
                 "-segment_time", str(self.segment_time),
                 "-reset_timestamps", "1",
+                *self._get_segment_options(),
                 self.full_path,
             ]
         else:
             additional_commands = [
                 "-map", "0:a",
-                "-c:a", "libmp3lame",
-                "-b:a", "320k",
+                *audio_codec,
                 "-f", "mp3",
                 self.full_path,
             ]
@@ -2,26 +2,26 @@ from ..base import FFmpegCommandBuilder
 
 
 class WAVCommandBuilder(FFmpegCommandBuilder):
+    COPY_AUDIO_CODECS = ("pcm_s16le",)
+
     def build_command(self) -> list[str]:
         command = self._get_basic_ffmpeg_command()
+        audio_codec = self._get_audio_codec_options("pcm_s16le", "-ar", "44100", "-ac", "2")
 
         if self.segment_record:
             additional_commands = [
-                "-c:a", "pcm_s16le",
-                "-ar", "44100",
-                "-ac", "2",
+                *audio_codec,
                 "-map", "0:a",
                 "-f", "segment",
                 "-segment_time", str(self.segment_time),
                 "-reset_timestamps", "1",
+                *self._get_segment_options(),
                 self.full_path,
             ]
         else:
             additional_commands = [
                 "-map", "0:a",
-                "-c:a", "pcm_s16le",
-                "-ar", "44100",
-                "-ac", "2",
+                *audio_codec,
                 "-f", "wav",
                 self.full_path,
             ]
@@ -2,26 +2,26 @@ from ..base import FFmpegCommandBuilder
 
 
 class WMACommandBuilder(FFmpegCommandBuilder):
+    COPY_AUDIO_CODECS = ("wmav1", "wmav2")
+
     def build_command(self) -> list[str]:
         command = self._get_basic_ffmpeg_command()
+        audio_codec = self._get_audio_codec_options("wmav2", "-ar", "44100", "-ac", "2")
 
         if self.segment_record:
             additional_commands = [
-                "-c:a", "wmav2",
-                "-ar", "44100",
-                "-ac", "2",
+                *audio_codec,
                 "-map", "0:a",
                 "-f", "segment",
                 "-segment_time", str(self.segment_time),
                 "-reset_timestamps", "1",
+                *self._get_segment_options(),
                 self.full_path,
             ]
         else:
             additional_commands = [
                 "-map", "0:a",
-                "-c:a", "wmav2",
-                "-ar", "44100",
-                "-ac", "2",
+                *audio_codec,
                 "-f", "asf",
                 self.full_path,
             ]
@@ -33,6 +33,11 @@ class FFmpegCommandBuilder(abc.ABC):
         is_overseas: bool = False,
         segment_record: bool = False,
         segment_time: str | None = None,
+        segment_start_number: int = 0,
+        segment_list: str | None = None,
+        fragmented: bool = False,
+        copy_audio: bool = False,
+        audio_codec: str | None = None,
         full_path: str | None = None,
         headers: str | None = None,
         proxy: str | None = None,
@@ -44,6 +49,11 @@ class FFmpegCommandBuilder(abc.ABC):
         :param is_overseas: Boolean flag indicating if the connection is overseas.
         :param segment_record: Boolean flag indicating if segmented recording is needed.
         :param segment_time: Time duration for each segment (if applicable).
+        :param segment_start_number: Index of the first segment, used when a session is resumed.
+        :param segment_list: Path of a CSV file the segment muxer appends every finished segment to.
+        :param fragmented: Write crash-safe fragmented MP4/MOV/M4A that stays playable if recording is interrupted.
+        :param copy_audio: Keep the source audio stream as it is even when its codec is not known.
+        :param audio_codec: Codec of the source audio stream if known, e.g. from a probe of the stream.
         :param full_path: Full path where the output file will be saved.
         :param headers: Additional headers to include in the request.
         :param proxy: Proxy server URL to use for the connection.
@@ -52,19 +62,55 @@ class FFmpegCommandBuilder(abc.ABC):
         self.is_overseas = is_overseas
         self.segment_record = segment_record
         self.segment_time = segment_time
+        self.segment_start_number = segment_start_number
+        self.segment_list = segment_list
+        self.fragmented = fragmented
+        self.copy_audio = copy_audio
+        self.audio_codec = audio_codec
+        self.audio_strategy = "copy"
         self.full_path = full_path or ""
         self.proxy = proxy or ""
         self.headers = headers or ""
 
+    # Source audio codecs the container takes as they are, any other audio is re-encoded
+    COPY_AUDIO_CODECS: tuple[str, ...] = ()
+
     @abc.abstractmethod
     def build_command(self) -> list[str]:
         pass
 
-    def _get_basic_ffmpeg_command(self) -> list[str]:
+    def _get_segment_options(self) -> list[str]:
         """
-        Constructs the basic part of the FFmpeg command.
+        Constructs the options shared by all segment muxer outputs.
 
-        :return: List of strings representing the FFmpeg command components.
+        :return: List of strings to place right before the output path.
+        """
+        options = []
+        if self.segment_start_number:
+            options.extend(["-segment_start_number", str(self.segment_start_number)])
+        if self.segment_list:
+            options.extend(["-segment_list", self.segment_list, "-segment_list_type", "csv"])
+        return options
+
+    def _get_audio_codec_options(self, *encode_options: str) -> list[str]:
+        """
+        Chooses between stream copy and re-encoding of the audio, only re-encodes when the source
+        codec is unknown or does not fit the container. The choice is kept in `audio_strategy`.
+
+        :param encode_options: Encoder and its options, used when the audio has to be re-encoded.
+        :return: List of strings representing the audio codec options.
+        """
+        if self.copy_audio or self.audio_codec in self.COPY_AUDIO_CODECS:
+            self.audio_strategy = "copy"
+            return ["-c:a", "copy"]
+        self.audio_strategy = encode_options[0]
+        return ["-c:a", *encode_options]
+
+    def _get_input_options(self) -> list[str]:
+        """
+        Constructs the global and input part of the FFmpeg command, up to and including the input URL.
+
+        :return: List of strings representing the input command components.
         """
         config = OVERSEAS_CONFIG if self.is_overseas else DEFAULT_CONFIG
         command = [
@@ -82,6 +128,26 @@ class FFmpegCommandBuilder(abc.ABC):
             "-fflags", "+discardcorrupt",
             "-re",
             "-i", self.record_url,
+        ]
+
+        if self.headers:
+            command.insert(11, "-headers")
+            command.insert(12, self.headers)
+
+        if self.proxy:
+            command.insert(1, "-http_proxy")
+            command.insert(2, self.proxy)
+
+        return command
+
+    def _get_common_output_options(self) -> list[str]:
+        """
+        Constructs the options every output of the command starts with.
+
+        :return: List of strings representing the shared output components.
+        """
+        config = OVERSEAS_CONFIG if self.is_overseas else DEFAULT_CONFIG
+        return [
             "-bufsize", config["bufsize"],
             "-sn",
             "-dn",
@@ -93,12 +159,19 @@ class FFmpegCommandBuilder(abc.ABC):
             "-avoid_negative_ts", "1",
         ]
 
-        if self.headers:
-            command.insert(11, "-headers")
-            command.insert(12, self.headers)
+    def _get_basic_ffmpeg_command(self) -> list[str]:
+        """
+        Constructs the basic part of the FFmpeg command.
 
-        if self.proxy:
-            command.insert(1, "-http_proxy")
-            command.insert(2, self.proxy)
+        :return: List of strings representing the FFmpeg command components.
+        """
+        return self._get_input_options() + self._get_common_output_options()
 
-        return command
+    def build_output_options(self) -> list[str]:
+        """
+        Constructs only the output part of the command, so it can be appended to the command
+        of another builder reading the same input.
+
+        :return: List of strings representing one complete output of the FFmpeg command.
+        """
+        return self.build_command()[len(self._get_input_options()):]
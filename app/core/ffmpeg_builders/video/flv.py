@@ -4,11 +4,13 @@ from ..base import FFmpegCommandBuilder
 class FLVCommandBuilder(FFmpegCommandBuilder):
     def build_command(self) -> list[str]:
         command = self._get_basic_ffmpeg_command()
+        # The filter only applies to AAC, other audio would make ffmpeg fail
+        audio_filter = ["-bsf:a", "aac_adtstoasc"] if self.audio_codec in (None, "aac") else []
         additional_commands = [
             "-map", "0",
             "-c:v", "copy",
             "-c:a", "copy",
-            "-bsf:a", "aac_adtstoasc",
+            *audio_filter,
             "-f", "flv",
             self.full_path,
         ]
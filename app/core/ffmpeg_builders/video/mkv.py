@@ -2,18 +2,21 @@ from ..base import FFmpegCommandBuilder
 
 
 class MKVCommandBuilder(FFmpegCommandBuilder):
+    COPY_AUDIO_CODECS = ("aac", "mp3", "opus", "vorbis", "flac", "ac3", "eac3")
+
     def build_command(self) -> list[str]:
         command = self._get_basic_ffmpeg_command()
         if self.segment_record:
             additional_commands = [
                 "-flags", "global_header",
                 "-c:v", "copy",
-                "-c:a", "aac",
+                *self._get_audio_codec_options("aac"),
                 "-map", "0",
                 "-f", "segment",
                 "-segment_time", str(self.segment_time),
                 "-segment_format", "matroska",
                 "-reset_timestamps", "1",
+                *self._get_segment_options(),
                 self.full_path,
             ]
         else:
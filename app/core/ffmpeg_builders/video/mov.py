@@ -1,30 +1,39 @@
 from ..base import FFmpegCommandBuilder
+from .mp4 import FRAGMENTED_MOVFLAGS
 
 
 class MOVCommandBuilder(FFmpegCommandBuilder):
+    COPY_AUDIO_CODECS = ("aac", "mp3", "alac")
+
     def build_command(self) -> list[str]:
         command = self._get_basic_ffmpeg_command()
+        audio_codec = self._get_audio_codec_options("aac")
 
         if self.segment_record:
+            if self.fragmented:
+                movflags_options = ["-segment_format_options", f"movflags={FRAGMENTED_MOVFLAGS}"]
+            else:
+                movflags_options = ["-movflags", "+frag_keyframe+empty_moov+faststart"]
             additional_commands = [
                 "-c:v", "copy",
-                "-c:a", "aac",
+                *audio_codec,
                 "-map", "0",
                 "-f", "segment",
                 "-segment_time", str(self.segment_time),
                 "-segment_format", "mov",
                 "-reset_timestamps", "1",
-                "-movflags", "+frag_keyframe+empty_moov+faststart",
+                *movflags_options,
                 "-flags", "global_header",
+                *self._get_segment_options(),
                 self.full_path,
             ]
         else:
             additional_commands = [
                 "-map", "0",
                 "-c:v", "copy",
-                "-c:a", "aac",
+                *audio_codec,
                 "-f", "mov",
-                "-movflags", "+faststart",
+                "-movflags", FRAGMENTED_MOVFLAGS if self.fragmented else "+faststart",
                 self.full_path,
             ]
 
@@ -1,20 +1,29 @@
 from ..base import FFmpegCommandBuilder
 
+FRAGMENTED_MOVFLAGS = "+frag_keyframe+empty_moov+default_base_moof"
+
 
 class MP4CommandBuilder(FFmpegCommandBuilder):
+    COPY_AUDIO_CODECS = ("aac", "mp3")
+
     def build_command(self) -> list[str]:
         command = self._get_basic_ffmpeg_command()
         if self.segment_record:
+            if self.fragmented:
+                movflags_options = ["-segment_format_options", f"movflags={FRAGMENTED_MOVFLAGS}"]
+            else:
+                movflags_options = ["-movflags", "+frag_keyframe+empty_moov"]
             additional_commands = [
                 "-c:v", "copy",
-                "-c:a", "aac",
+                *self._get_audio_codec_options("aac"),
                 "-map", "0",
                 "-f", "segment",
                 "-segment_time", str(self.segment_time),
                 "-segment_format", "mp4",
                 "-reset_timestamps", "1",
-                "-movflags", "+frag_keyframe+empty_moov",
+                *movflags_options,
                 "-flags", "global_header",
+                *self._get_segment_options(),
                 self.full_path,
             ]
         else:
@@ -23,6 +32,7 @@ class MP4CommandBuilder(FFmpegCommandBuilder):
                 "-c:v", "copy",
                 "-c:a", "copy",
                 "-f", "mp4",
+                *(["-movflags", FRAGMENTED_MOVFLAGS] if self.fragmented else []),
                 self.full_path,
             ]
 
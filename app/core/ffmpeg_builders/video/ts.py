@@ -13,6 +13,7 @@ class TSCommandBuilder(FFmpegCommandBuilder):
                 "-segment_time", str(self.segment_time),
                 "-segment_format", "mpegts",
                 "-reset_timestamps", "1",
+                *self._get_segment_options(),
                 self.full_path,
             ]
         else:
@@ -0,0 +1,210 @@
+import asyncio
+import itertools
+import time
+from collections.abc import Awaitable, Callable
+
+from ..models.job_model import Job, JobStatus, JobType
+from ..utils.logger import logger
+from . import post_processing
+
+
+class JobQueue:
+    """
+    Persistent post-processing queue served by a bounded pool of async workers.
+
+    Jobs are ordered by priority (higher first) and submission order, failed jobs are retried
+    with a growing delay, and every unfinished job is written to `jobs.json` so it is picked
+    up again after a restart.
+    """
+
+    RETRY_BASE_DELAY = 10
+    PROGRESS_NOTIFY_INTERVAL = 1
+
+    def __init__(
+        self,
+        config_manager,
+        max_workers: int = 2,
+        subprocess_start_info=None,
+        on_change: Callable[[dict], None] | None = None,
+    ):
+        """
+        :param config_manager: ConfigManager used to persist unfinished jobs.
+        :param max_workers: Number of jobs processed at the same time.
+        :param subprocess_start_info: Startup info passed to every spawned process.
+        :param on_change: Callback receiving a snapshot whenever jobs are added, finish or progress.
+        """
+        self.config_manager = config_manager
+        self.max_workers = max(1, max_workers)
+        self.subprocess_start_info = subprocess_start_info
+        self.on_change = on_change
+        self.jobs: dict[str, Job] = {}
+        self.handlers: dict[str, Callable[[Job, JobQueue], Awaitable[str | None]]] = {
+            JobType.REMUX: post_processing.remux,
+            JobType.SCRIPT: post_processing.run_script,
+            JobType.CHECKSUM: post_processing.checksum,
+            JobType.UPLOAD: post_processing.upload,
+            JobType.FASTSTART: post_processing.faststart,
+            JobType.CONCAT: post_processing.concat,
+            JobType.REPAIR: post_processing.repair,
+            JobType.ARCHIVE: post_processing.archive,
+        }
+        self._queue: asyncio.PriorityQueue | None = None
+        self._counter = itertools.count()
+        self._workers: list[asyncio.Task] = []
+        self._last_notify = 0.0
+        self._persist_lock = asyncio.Lock()
+        self._completion_listeners: list[Callable[[Job], None]] = []
+
+    def register_handler(self, job_type: str, handler: Callable[[Job, "JobQueue"], Awaitable[str | None]]):
+        self.handlers[job_type] = handler
+
+    def add_completion_listener(self, listener: Callable[[Job], None]):
+        """Call `listener` with every job that completed successfully."""
+        self._completion_listeners.append(listener)
+
+    async def start(self):
+        """Restore unfinished jobs and start the worker pool."""
+        if self._workers:
+            return
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        for data in self.config_manager.load_jobs_config() or []:
+            job = Job.from_dict(data)
+            if job.job_id not in self.jobs and job.status in (JobStatus.PENDING, JobStatus.RUNNING):
+                job.status = JobStatus.PENDING
+                self._enqueue(job)
+        if self.jobs:
+            logger.info(f"Post-processing: Resumed {len(self.jobs)} unfinished jobs")
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+
+    async def stop(self):
+        """Cancel the workers, running jobs go back to pending and are resumed on the next start."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for job in self.jobs.values():
+            if job.status == JobStatus.RUNNING:
+                job.status = JobStatus.PENDING
+        await self.persist()
+
+    def _enqueue(self, job: Job):
+        self.jobs[job.job_id] = job
+        self._queue.put_nowait((-job.priority, next(self._counter), job.job_id))
+
+    async def submit(
+        self,
+        job_type: str,
+        params: dict,
+        priority: int = 0,
+        max_retries: int = 3,
+        followups: list[dict] | None = None,
+    ) -> Job:
+        """
+        Add a job to the queue and persist it before any worker touches it.
+
+        :param followups: Jobs submitted with the output path of this job once it succeeds,
+            as a list of {'job_type': ..., 'params': {...}} dictionaries.
+        """
+        job = Job(job_type, params, priority=priority, max_retries=max_retries, followups=followups)
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        self._enqueue(job)
+        logger.info(f"Post-processing job queued: {job.job_type} {params.get('path', '')}")
+        await self.persist()
+        self._notify_change(force=True)
+        return job
+
+    async def _worker(self):
+        while True:
+            _, _, job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            if job and job.status == JobStatus.PENDING:
+                await self._run(job)
+            self._queue.task_done()
+
+    async def _run(self, job: Job):
+        handler = self.handlers.get(job.job_type)
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        job.progress = 0.0
+        self._notify_change(force=True)
+        try:
+            if not handler:
+                raise ValueError(f"Unsupported job type: {job.job_type}")
+            job.result = await handler(job, self)
+        except asyncio.CancelledError:
+            job.status = JobStatus.PENDING
+            raise
+        except Exception as e:
+            job.error = str(e)
+            if job.attempts <= job.max_retries:
+                delay = self.RETRY_BASE_DELAY * (2 ** (job.attempts - 1))
+                logger.warning(f"Post-processing job failed, retrying in {delay}s: {job.job_type}, {e}")
+                job.status = JobStatus.PENDING
+                asyncio.get_running_loop().call_later(delay, self._enqueue, job)
+            else:
+                logger.error(f"Post-processing job failed after {job.attempts} attempts: {job.job_type}, {e}")
+                job.status = JobStatus.FAILED
+        else:
+            job.status = JobStatus.COMPLETED
+            job.progress = 1.0
+            logger.success(f"Post-processing job completed: {job.job_type} {job.params.get('path', '')}")
+            for listener in self._completion_listeners:
+                try:
+                    listener(job)
+                except Exception as e:
+                    logger.error(f"Job completion listener failed: {e}")
+            await self._submit_followups(job)
+        finally:
+            if job.status in (JobStatus.COMPLETED, JobStatus.FAILED):
+                self.jobs.pop(job.job_id, None)
+            await self.persist()
+            self._notify_change(force=True)
+
+    async def _submit_followups(self, job: Job):
+        path = job.result or job.params.get("path")
+        if not path:
+            return
+        for followup in job.followups:
+            params = {**followup.get("params", {}), "path": path}
+            await self.submit(
+                followup["job_type"], params, priority=job.priority, followups=followup.get("followups")
+            )
+
+    async def persist(self):
+        async with self._persist_lock:
+            data_to_save = [job.to_dict() for job in self.jobs.values()]
+            await self.config_manager.save_jobs_config(data_to_save)
+
+    def uses_path(self, path: str) -> bool:
+        """Whether an unfinished job still reads or writes the file."""
+        return any(
+            path == job.params.get("path") or path in (job.params.get("paths") or [])
+            for job in self.jobs.values()
+        )
+
+    def set_progress(self, job: Job, progress: float):
+        job.progress = min(max(progress, 0.0), 1.0)
+        self._notify_change()
+
+    def _notify_change(self, force: bool = False):
+        now = time.monotonic()
+        if not self.on_change or (not force and now - self._last_notify < self.PROGRESS_NOTIFY_INTERVAL):
+            return
+        self._last_notify = now
+        try:
+            self.on_change(self.snapshot())
+        except Exception as e:
+            logger.error(f"Job state callback failed: {e}")
+
+    def snapshot(self) -> dict:
+        running = [job for job in self.jobs.values() if job.status == JobStatus.RUNNING]
+        return {
+            "pending": sum(1 for job in self.jobs.values() if job.status == JobStatus.PENDING),
+            "running": len(running),
+            "progress": [
+                {"job_type": job.job_type, "path": job.params.get("path"), "progress": round(job.progress, 3)}
+                for job in running
+            ],
+        }
@@ -1,7 +1,6 @@
 import os
 
 from ..utils.logger import logger
-from .config_manager import ConfigManager
 
 
 class LanguageManager:
@@ -19,7 +18,7 @@ class LanguageManager:
         """
         Initialize the LanguageManager with settings and load the language configuration.
         """
-        config_manager = ConfigManager(self.app.run_path)
+        config_manager = self.app.config_manager
         logger.info(f"Language Code: {self.app.settings.language_code}")
         i18n_filename = f"{self.app.settings.language_code}.json"
         i18n_file_path = os.path.join(self.app.run_path, "locales", i18n_filename)
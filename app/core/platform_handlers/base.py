@@ -15,6 +15,13 @@ class PlatformHandler(abc.ABC):
     _instances: dict[InstanceKey, "PlatformHandler"] = {}
     _lock: threading.Lock = threading.Lock()
 
+    platform: str | None = None
+    # Regular expressions with a `room` group extracting the room id from a full room URL
+    room_id_patterns: tuple[str, ...] = ()
+    room_id_case_sensitive: bool = False
+    # Short or share links that redirect to the room URL
+    short_link_patterns: tuple[str, ...] = ()
+
     def __init__(
         self,
         proxy: str | None = None,
@@ -40,6 +47,27 @@ class PlatformHandler(abc.ABC):
         """
         pass
 
+    @classmethod
+    def is_short_link(cls, live_url: str) -> bool:
+        return any(re.search(pattern, live_url) for pattern in cls.short_link_patterns)
+
+    @classmethod
+    def get_room_key(cls, live_url: str) -> str | None:
+        """
+        Stable identity of the room a URL points to, e.g. 'douyin:745964462470', the same for every
+        variant of the room URL. Returns None when the URL does not contain a room id.
+        """
+        for pattern in cls.room_id_patterns:
+            match = re.search(pattern, live_url)
+            if match:
+                room_id = match.group("room")
+                return f"{cls.platform}:{room_id if cls.room_id_case_sensitive else room_id.lower()}"
+        return None
+
+    @classmethod
+    def get_handler_class(cls, live_url: str) -> type["PlatformHandler"] | None:
+        return cls._get_handler_class(live_url)
+
     @classmethod
     def register(cls: type[T], *patterns: str) -> type[T]:
         """
@@ -6,6 +6,8 @@ from .base import PlatformHandler, StreamData
 
 class DouyinHandler(PlatformHandler):
     platform = "douyin"
+    room_id_patterns = (r"live\.douyin\.com/(?P<room>\d+)",)
+    short_link_patterns = (r"v\.douyin\.com/",)
 
     def __init__(
         self,
@@ -34,6 +36,8 @@ class DouyinHandler(PlatformHandler):
 
 class TikTokHandler(PlatformHandler):
     platform = "tiktok"
+    room_id_patterns = (r"tiktok\.com/@(?P<room>[^/?#]+)",)
+    short_link_patterns = (r"(vm|vt)\.tiktok\.com/",)
 
     def __init__(
         self,
@@ -55,6 +59,8 @@ class TikTokHandler(PlatformHandler):
 
 class KuaishouHandler(PlatformHandler):
     platform = "kuaishou"
+    room_id_patterns = (r"live\.kuaishou\.com/u/(?P<room>[^/?#]+)",)
+    room_id_case_sensitive = True
 
     def __init__(
         self,
@@ -76,6 +82,7 @@ class KuaishouHandler(PlatformHandler):
 
 class HuyaHandler(PlatformHandler):
     platform = "huya"
+    room_id_patterns = (r"huya\.com/(?P<room>[^/?#]+)",)
 
     def __init__(
         self,
@@ -97,6 +104,7 @@ class HuyaHandler(PlatformHandler):
 
 class DouyuHandler(PlatformHandler):
     platform = "douyu"
+    room_id_patterns = (r"douyu\.com/.*[?&]rid=(?P<room>\d+)", r"douyu\.com/(?P<room>\d+)")
 
     def __init__(
         self,
@@ -139,6 +147,7 @@ class YYHandler(PlatformHandler):
 
 class BilibiliHandler(PlatformHandler):
     platform = "bilibili"
+    room_id_patterns = (r"live\.bilibili\.com/(?:h5/)?(?P<room>\d+)",)
 
     def __init__(
         self,
@@ -160,6 +169,7 @@ class BilibiliHandler(PlatformHandler):
 
 class RedNoteHandler(PlatformHandler):
     platform = "rednote"
+    short_link_patterns = (r"xhslink\.com/",)
 
     def __init__(
         self,
@@ -181,6 +191,8 @@ class RedNoteHandler(PlatformHandler):
 
 class BigoHandler(PlatformHandler):
     platform = "bigo"
+    room_id_patterns = (r"bigo\.tv/(?:[a-z]{2}/)?(?P<room>[^/?#]+)",)
+    short_link_patterns = (r"slink\.bigovideo\.tv/",)
 
     def __init__(
         self,
@@ -223,6 +235,7 @@ class BluedHandler(PlatformHandler):
 
 class SoopHandler(PlatformHandler):
     platform = "soop"
+    room_id_patterns = (r"sooplive\.co\.kr/(?P<room>[^/?#]+)",)
 
     def __init__(
         self,
@@ -248,6 +261,7 @@ class SoopHandler(PlatformHandler):
 
 class NeteaseHandler(PlatformHandler):
     platform = "netease"
+    room_id_patterns = (r"cc\.163\.com/(?P<room>\d+)",)
 
     def __init__(
         self,
@@ -424,6 +438,7 @@ class PopkonTVHandler(PlatformHandler):
 
 class TwitcastingHandler(PlatformHandler):
     platform = "twitcasting"
+    room_id_patterns = (r"twitcasting\.tv/(?P<room>[^/?#]+)",)
 
     def __init__(
         self,
@@ -512,6 +527,7 @@ class KugouHandler(PlatformHandler):
 
 class TwitchHandler(PlatformHandler):
     platform = "twitch"
+    room_id_patterns = (r"twitch\.tv/(?P<room>[^/?#]+)",)
 
     def __init__(
         self,
@@ -680,6 +696,7 @@ class ZhihuHandler(PlatformHandler):
 
 class ChzzkHandler(PlatformHandler):
     platform = "chzzk"
+    room_id_patterns = (r"chzzk\.naver\.com/(?:live/)?(?P<room>[0-9a-fA-F]{32})",)
 
     def __init__(
         self,
@@ -869,6 +886,7 @@ class HuamaoHandler(PlatformHandler):
 
 class ShopeeHandler(PlatformHandler):
     platform = "shopee"
+    short_link_patterns = (r"\.shp\.ee/",)
 
     def __init__(
         self,
@@ -890,6 +908,8 @@ class ShopeeHandler(PlatformHandler):
 
 class YoutubeHandler(PlatformHandler):
     platform = "youtube"
+    room_id_patterns = (r"youtube\.com/.*[?&]v=(?P<room>[\w-]+)", r"youtube\.com/(?P<room>@[^/?#]+|channel/[^/?#]+)")
+    room_id_case_sensitive = True
 
     def __init__(
         self,
@@ -911,6 +931,7 @@ class YoutubeHandler(PlatformHandler):
 
 class TaobaoHandler(PlatformHandler):
     platform = "taobao"
+    short_link_patterns = (r"\.tb\.cn/",)
 
     def __init__(
         self,
@@ -932,6 +953,7 @@ class TaobaoHandler(PlatformHandler):
 
 class JDHandler(PlatformHandler):
     platform = "jd"
+    short_link_patterns = (r"3\.cn/",)
 
     def __init__(
         self,
@@ -0,0 +1,365 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import time
+from urllib.parse import quote
+
+import httpx
+
+from ..models.job_model import Job
+from ..process_manager import AsyncProcessManager
+from ..utils.logger import logger
+
+CHUNK_SIZE = 1024 * 1024
+
+
+async def probe_duration(file_path: str, startup_info=None) -> float | None:
+    """Return the media duration in seconds, or None when ffprobe cannot tell."""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "ffprobe",
+            "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            file_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            startupinfo=startup_info,
+        )
+        stdout, _ = await process.communicate()
+        return float(stdout.decode().strip())
+    except (OSError, ValueError):
+        return None
+
+
+async def remux(job: Job, job_queue) -> str:
+    """Copy the streams of a recording into an MP4 container without re-encoding."""
+    file_path = job.params["path"].replace("\\", "/")
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        raise FileNotFoundError(f"Nothing to convert: {file_path}")
+
+    save_path = file_path.rsplit(".", maxsplit=1)[0] + ".mp4"
+    duration = await probe_duration(file_path, job_queue.subprocess_start_info)
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-y",
+        "-v", "error",
+        "-i", file_path,
+        "-c:v", "copy",
+        "-c:a", "copy",
+        "-f", "mp4",
+        "-progress", "pipe:1",
+        "-nostats",
+        save_path,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        startupinfo=job_queue.subprocess_start_info,
+    )
+
+    async def read_progress():
+        async for line in process.stdout:
+            key, _, value = line.decode(errors="ignore").strip().partition("=")
+            if key == "out_time_us" and duration and value.isdigit():
+                job_queue.set_progress(job, int(value) / 1_000_000 / duration)
+
+    try:
+        _, stderr = await asyncio.gather(read_progress(), process.stderr.read())
+        await process.wait()
+    except asyncio.CancelledError:
+        process.kill()
+        raise
+
+    if process.returncode != 0:
+        error = stderr.decode(errors="ignore").strip()
+        raise RuntimeError(error.splitlines()[0] if error else f"ffmpeg exited with code {process.returncode}")
+
+    logger.info(f"Video transcoding completed: {save_path}")
+    if job.params.get("delete_original", True):
+        os.remove(file_path)
+        logger.info(f"Delete Original File: {file_path}")
+    else:
+        converts_dir = f"{os.path.dirname(save_path)}/original"
+        os.makedirs(converts_dir, exist_ok=True)
+        shutil.move(file_path, converts_dir)
+        logger.info(f"Move Transcoding Files: {file_path}")
+    return save_path
+
+
+async def _run_ffmpeg(job_queue, *args: str) -> None:
+    """Run ffmpeg to completion, raising with its first error line when it fails."""
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-y",
+        "-v", "error",
+        *args,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+        startupinfo=job_queue.subprocess_start_info,
+    )
+    try:
+        _, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        process.kill()
+        raise
+
+    if process.returncode != 0:
+        error = stderr.decode(errors="ignore").strip()
+        raise RuntimeError(error.splitlines()[0] if error else f"ffmpeg exited with code {process.returncode}")
+
+
+async def _rewrite(
+    job_queue, file_path: str, suffix: str, output_args: list[str], input_args: list[str] | None = None
+) -> None:
+    """Rewrite a file through ffmpeg into a sibling temp file and swap it in on success."""
+    root, ext = os.path.splitext(file_path)
+    temp_path = f"{root}.{suffix}{ext}"
+    try:
+        await _run_ffmpeg(job_queue, *(input_args or []), "-i", file_path, *output_args, temp_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    os.replace(temp_path, file_path)
+
+
+async def faststart(job: Job, job_queue) -> str:
+    """Rewrite a fragmented MP4 with the index at the front, for players that cannot seek in fragments."""
+    file_path = job.params["path"]
+    await _rewrite(job_queue, file_path, "faststart", ["-map", "0", "-c", "copy", "-movflags", "+faststart"])
+    logger.info(f"Faststart completed: {file_path}")
+    return file_path
+
+
+async def repair(job: Job, job_queue) -> str:
+    """
+    Rewrite an output that was cut off by a crash, dropping the damaged tail and regenerating
+    timestamps. MP4-like files can only be read here when they were recorded fragmented.
+    """
+    file_path = job.params["path"]
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        raise FileNotFoundError(f"Nothing to repair: {file_path}")
+    await _rewrite(
+        job_queue,
+        file_path,
+        "repair",
+        ["-map", "0", "-c", "copy"],
+        input_args=["-err_detect", "ignore_err", "-fflags", "+genpts+discardcorrupt"],
+    )
+    logger.info(f"Interrupted recording repaired: {file_path}")
+    return file_path
+
+
+async def concat(job: Job, job_queue) -> str:
+    """
+    Join the segments of a session into one file without re-encoding, through ffmpeg's concat
+    demuxer. The parts are only deleted after the joined duration has been verified.
+    """
+    parts = [path for path in job.params["paths"] if os.path.exists(path) and os.path.getsize(path) > 0]
+    output_path = job.params["path"]
+    if len(parts) < 2:
+        raise FileNotFoundError(f"Not enough segments to concatenate: {output_path}")
+
+    durations = [await probe_duration(path, job_queue.subprocess_start_info) for path in parts]
+    if any(duration is None for duration in durations):
+        raise RuntimeError(f"Unreadable segment in session: {output_path}")
+    total_duration = sum(durations)
+
+    root, ext = os.path.splitext(output_path)
+    temp_path = f"{root}.part{ext}"
+    list_path = f"{output_path}.concat.txt"
+    with open(list_path, "w", encoding="utf-8") as file:
+        for path in parts:
+            escaped_path = os.path.abspath(path).replace("'", "'\\''")
+            file.write(f"file '{escaped_path}'\n")
+
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-y",
+        "-v", "error",
+        "-f", "concat",
+        "-safe", "0",
+        "-i", list_path,
+        "-map", "0",
+        "-c", "copy",
+        temp_path,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+        startupinfo=job_queue.subprocess_start_info,
+    )
+    await AsyncProcessManager.lower_priority(process)
+    try:
+        _, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        process.kill()
+        raise
+    finally:
+        os.remove(list_path)
+
+    if process.returncode != 0:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        error = stderr.decode(errors="ignore").strip()
+        raise RuntimeError(error.splitlines()[0] if error else f"ffmpeg exited with code {process.returncode}")
+
+    joined_duration = await probe_duration(temp_path, job_queue.subprocess_start_info)
+    tolerance = max(2.0, 0.5 * len(parts))
+    if joined_duration is None or abs(joined_duration - total_duration) > tolerance:
+        os.remove(temp_path)
+        raise RuntimeError(
+            f"Concatenated duration {joined_duration}s does not match the segments ({total_duration:.1f}s)"
+        )
+
+    os.replace(temp_path, output_path)
+    logger.info(f"Segments concatenated: {output_path} ({len(parts)} parts, {total_duration:.0f}s)")
+    if job.params.get("delete_parts"):
+        for path in parts:
+            os.remove(path)
+    return output_path
+
+
+async def run_script(job: Job, job_queue) -> str | None:
+    """Run a custom script command, its exit code decides whether the job failed."""
+    command = job.params["command"]
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *command.split(),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            startupinfo=job_queue.subprocess_start_info,
+        )
+    except PermissionError:
+        raise PermissionError(
+            "Script has no execution permission!, If it is a Linux environment, "
+            "please first execute: chmod+x your_script.sh to grant script executable permission"
+        ) from None
+
+    try:
+        stdout, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        process.kill()
+        raise
+
+    if stdout:
+        logger.info(stdout.decode(errors="ignore").splitlines()[0])
+    if process.returncode != 0:
+        error = stderr.decode(errors="ignore").strip() if stderr else ""
+        raise RuntimeError(error.splitlines()[0] if error else f"Script exited with code {process.returncode}")
+    return job.params.get("path")
+
+
+async def checksum(job: Job, job_queue) -> str:
+    """Write a `<file>.sha256` sidecar in the format understood by `sha256sum -c`."""
+    file_path = job.params["path"]
+
+    def compute():
+        digest = hashlib.sha256()
+        total = os.path.getsize(file_path) or 1
+        done = 0
+        with open(file_path, "rb") as file:
+            while chunk := file.read(CHUNK_SIZE):
+                digest.update(chunk)
+                done += len(chunk)
+                job.progress = done / total
+        return digest.hexdigest()
+
+    file_hash = await asyncio.to_thread(compute)
+    with open(f"{file_path}.sha256", "w", encoding="utf-8") as file:
+        file.write(f"{file_hash}  {os.path.basename(file_path)}\n")
+    job_queue.set_progress(job, 1.0)
+    return file_path
+
+
+async def upload(job: Job, job_queue) -> str:
+    """PUT the file to `<url>/<filename>` as a streamed request body."""
+    file_path = job.params["path"]
+    url = job.params["url"].rstrip("/") + "/" + quote(os.path.basename(file_path))
+    size = os.path.getsize(file_path)
+    total = size or 1
+
+    async def read_file():
+        sent = 0
+        with open(file_path, "rb") as file:
+            while chunk := await asyncio.to_thread(file.read, CHUNK_SIZE):
+                sent += len(chunk)
+                job_queue.set_progress(job, sent / total)
+                yield chunk
+
+    async with httpx.AsyncClient(timeout=httpx.Timeout(60.0, write=None)) as client:
+        response = await client.put(url, content=read_file(), headers={"Content-Length": str(size)})
+        response.raise_for_status()
+    logger.info(f"Upload completed: {file_path} -> {url}")
+    return file_path
+
+
+def _hash_file(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _archive_file(job: Job, file_path: str, target_path: str, rate_limit: float) -> None:
+    temp_path = f"{target_path}.part"
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    digest = hashlib.sha256()
+    total = os.path.getsize(file_path) or 1
+    done = 0
+    started = time.monotonic()
+    try:
+        with open(file_path, "rb") as source, open(temp_path, "wb") as target:
+            while chunk := source.read(CHUNK_SIZE):
+                target.write(chunk)
+                digest.update(chunk)
+                done += len(chunk)
+                job.progress = done / total
+                if rate_limit:
+                    ahead = done / rate_limit - (time.monotonic() - started)
+                    if ahead > 0:
+                        time.sleep(ahead)
+            target.flush()
+            os.fsync(target.fileno())
+        if _hash_file(temp_path) != digest.hexdigest():
+            raise OSError(f"Checksum mismatch after copying to archive: {target_path}")
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    os.replace(temp_path, target_path)
+    os.remove(file_path)
+
+    root = os.path.splitext(file_path)[0]
+    for sidecar_ext in (".srt", ".vtt"):
+        if os.path.exists(root + sidecar_ext):
+            shutil.move(root + sidecar_ext, os.path.splitext(target_path)[0] + sidecar_ext)
+
+
+async def archive(job: Job, job_queue) -> str:
+    """
+    Move finished files from the staging directory to the archive directory.
+
+    Copies are throttled to `bandwidth_limit` MB/s so they do not starve live recordings of
+    disk or network bandwidth, and a staged file is only deleted after its copy has been read
+    back and the checksum matched. Files outside the staging directory are left in place.
+    Archives `paths` when given, otherwise `path`, and returns the archived `path`.
+    """
+    staging_root = job.params["staging_root"].rstrip("/")
+    archive_root = job.params["archive_root"].rstrip("/")
+    rate_limit = float(job.params.get("bandwidth_limit") or 0) * 1024 * 1024
+    archived_path = None
+    for path in job.params.get("paths") or [job.params["path"]]:
+        file_path = os.path.abspath(path).replace("\\", "/")
+        if not file_path.startswith(staging_root + "/"):
+            archived_path = file_path
+            continue
+        target_path = archive_root + file_path[len(staging_root):]
+        archived_path = target_path
+        if not os.path.exists(file_path):
+            if os.path.exists(target_path):
+                continue
+            raise FileNotFoundError(f"Nothing to archive: {file_path}")
+
+        await asyncio.to_thread(_archive_file, job, file_path, target_path, rate_limit)
+        logger.info(f"Archived: {file_path} -> {target_path}")
+    return archived_path
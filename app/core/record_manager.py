@@ -1,19 +1,25 @@
 import asyncio
-import threading
+import glob
+import os
 from datetime import datetime, timedelta
 
 from ..messages.message_pusher import MessagePusher
+from ..models.exit_reason_model import ExitReason
+from ..models.job_model import JobType
 from ..models.recording_model import Recording
 from ..models.recording_status_model import RecordingStatus
 from ..utils import utils
 from ..utils.logger import logger
+from ..utils.write_behind import WriteBehindPersister
 from .platform_handlers import get_platform_info
+from .recording_index import find_media_files
+from .recording_registry import RecordingRegistry
+from .storage_tiering import StorageTiering
 from .stream_manager import LiveStreamRecorder
 
 
 class GlobalRecordingState:
-    recordings = []
-    lock = threading.Lock()
+    registry = RecordingRegistry()
 
 
 class RecordingManager:
@@ -22,15 +28,22 @@ class RecordingManager:
         self.settings = app.settings
         self.periodic_task_started = False
         self.loop_time_seconds = None
+        self.persister = WriteBehindPersister(self._save_recordings)
+        self.recorders: dict[str, LiveStreamRecorder] = {}
         self.app.language_manager.add_observer(self)
+        self.recordings.set_key_function(self.app.room_identity.get_room_key)
         self.load_recordings()
         self._ = {}
         self.load()
         self.initialize_dynamic_state()
+        self.configure_admission_control()
+        self.configure_volumes()
+        self.app.job_queue.add_completion_listener(self.on_job_completed)
+        self.app.settings_cache.subscribe(self.on_settings_changed)
 
     @property
-    def recordings(self):
-        return GlobalRecordingState.recordings
+    def recordings(self) -> RecordingRegistry:
+        return GlobalRecordingState.registry
 
     @recordings.setter
     def recordings(self, value):
@@ -44,56 +57,174 @@ class RecordingManager:
     def load_recordings(self):
         """Load recordings from a JSON file into objects."""
         recordings_data = self.app.config_manager.load_recordings_config()
-        if not GlobalRecordingState.recordings:
-            GlobalRecordingState.recordings = [Recording.from_dict(rec) for rec in recordings_data]
+        if not self.recordings:
+            self.recordings.add_many(Recording.from_dict(rec) for rec in recordings_data)
         logger.info(f"Live Recordings: Loaded {len(self.recordings)} items")
 
     def initialize_dynamic_state(self):
         """Initialize dynamic state for all recordings."""
-        loop_time_seconds = self.settings.user_config.get("loop_time_seconds")
-        self.loop_time_seconds = int(loop_time_seconds or 300)
+        self.loop_time_seconds = self.app.settings_cache.get("loop_time_seconds") or 300
         for recording in self.recordings:
             recording.loop_time_seconds = self.loop_time_seconds
             recording.update_title(self._[recording.quality])
 
+    def configure_admission_control(self):
+        """Apply the concurrency budget and resource headroom settings to the admission controller."""
+        settings_cache = self.app.settings_cache
+        self.app.admission_controller.configure(
+            max_concurrent=settings_cache.get("max_concurrent_recordings", 0),
+            max_cpu_percent=settings_cache.get("max_cpu_percent", 0),
+            min_free_memory_percent=settings_cache.get("min_free_memory_percent", 0),
+        )
+
+    def configure_volumes(self):
+        """Apply the output directories and the free space threshold to the volume manager."""
+        self.app.volume_manager.configure(
+            self.settings.get_video_save_paths(),
+            self.app.settings_cache.get("recording_space_threshold", 0),
+        )
+
+    def on_settings_changed(self, changed: set[str]):
+        """Apply changed settings to the components that were configured from them."""
+        if "loop_time_seconds" in changed:
+            self.initialize_dynamic_state()
+        if changed & {"max_concurrent_recordings", "max_cpu_percent", "min_free_memory_percent"}:
+            self.configure_admission_control()
+        if changed & {"live_save_path", "extra_save_paths", "recording_space_threshold"}:
+            self.configure_volumes()
+
     async def add_recording(self, recording):
-        with GlobalRecordingState.lock:
-            GlobalRecordingState.recordings.append(recording)
+        if self.recordings.add(recording):
+            await self.persist_recordings()
+
+    async def add_recordings(self, recordings: list[Recording]) -> list[Recording]:
+        """Add many recordings with a single save, returns those whose rec_id was not registered yet."""
+        added = self.recordings.add_many(recordings)
+        if added:
             await self.persist_recordings()
+        return added
+
+    async def resolve_short_links(self, urls: list[str]) -> int:
+        """Resolve the short links among `urls` once, through the proxy for the platforms configured to use it."""
+        user_config = self.settings.user_config
+        proxy_list = self.app.settings_cache.get("default_platform_with_proxy", [])
+        proxy = user_config.get("proxy_address") if user_config.get("enable_proxy") else None
+        by_proxy = {}
+        for url in urls:
+            use_proxy = proxy and get_platform_info(url)[1] in proxy_list
+            by_proxy.setdefault(proxy if use_proxy else None, []).append(url)
+        resolved = 0
+        for url_proxy, proxy_urls in by_proxy.items():
+            resolved += await self.app.room_identity.resolve_many(proxy_urls, url_proxy)
+        return resolved
+
+    async def canonicalize_recordings(self):
+        """Resolve the short links of the list and merge recordings that turn out to watch the same room."""
+        if await self.resolve_short_links([recording.url for recording in self.recordings]):
+            # Room keys of short links are known now
+            self.recordings.set_key_function(self.app.room_identity.get_room_key)
+        await self.merge_duplicate_recordings()
+
+    async def merge_duplicate_recordings(self) -> list[Recording]:
+        """
+        Keep one recording per room so it is polled and recorded once. The kept recording is the one
+        recording right now or else the oldest, it takes over the monitoring, priority and additional
+        output formats of the others, which are removed. Returns the removed recordings.
+        """
+        duplicates = []
+        for recordings in self.recordings.get_duplicates():
+            kept = next((recording for recording in recordings if recording.recording), recordings[0])
+            others = [recording for recording in recordings if recording is not kept]
+            for recording in others:
+                if recording.monitor_status and not kept.monitor_status:
+                    await self.start_monitor_recording(kept, auto_save=False)
+                kept.priority = max(kept.priority or 0, recording.priority or 0)
+                kept.output_profiles = list(dict.fromkeys(kept.output_profiles + recording.output_profiles))
+                self.stop_recording(recording)
+                logger.info(f"Merged duplicate room {recording.rec_id}-{recording.url} into {kept.rec_id}-{kept.url}")
+            duplicates.extend(others)
+
+        if duplicates:
+            await self.delete_recording_cards(duplicates)
+            logger.success(f"Merged {len(duplicates)} duplicate recordings")
+        return duplicates
 
     async def remove_recording(self, recording: Recording):
-        with GlobalRecordingState.lock:
-            GlobalRecordingState.recordings.remove(recording)
+        if self.recordings.remove(recording):
+            self.close_recorders([recording])
             await self.persist_recordings()
 
     async def clear_all_recordings(self):
-        with GlobalRecordingState.lock:
-            GlobalRecordingState.recordings.clear()
-            await self.persist_recordings()
+        recordings = list(self.recordings)
+        self.recordings.clear()
+        self.close_recorders(recordings)
+        await self.persist_recordings()
+
+    def get_recorder(self, recording: Recording) -> LiveStreamRecorder:
+        """The recorder of a recording, created on its first live check and reused afterwards."""
+        recorder = self.recorders.get(recording.rec_id)
+        if recorder is None or recorder.recording is not recording:
+            if recorder:
+                recorder.close()
+            recorder = self.recorders[recording.rec_id] = LiveStreamRecorder(self.app, recording)
+        return recorder
+
+    def close_recorders(self, recordings: list[Recording]):
+        for recording in recordings:
+            recorder = self.recorders.pop(recording.rec_id, None)
+            if recorder:
+                recorder.close()
 
     async def persist_recordings(self):
-        """Persist recordings to a JSON file."""
-        data_to_save = [rec.to_dict() for rec in self.recordings]
-        await self.app.config_manager.save_recordings_config(data_to_save)
+        """Schedule a save of the recordings, changes made in quick succession are written together."""
+        self.persister.request()
+
+    async def flush_recordings(self):
+        """Write pending recording changes right away, e.g. before the application exits."""
+        await self.persister.flush()
+        logger.info(f"Recordings persistence: {self.persister.get_stats()}")
+
+    async def _save_recordings(self):
+        data_to_save = []
+        rec_ids = []
+        saved_fields = {}
+        for rec in self.recordings:
+            rec_ids.append(rec.rec_id)
+            if not rec.is_dirty:
+                continue
+            data_to_save.append(rec.to_dict())
+            saved_fields[rec] = rec.dirty_fields
+            # Changes made while the save is running mark the recording dirty again
+            rec.clear_dirty()
+        try:
+            await self.app.config_manager.save_recordings_config(data_to_save, rec_ids)
+        except Exception:
+            # Nothing was written, keep the changes pending for the persister's retry
+            for rec, fields in saved_fields.items():
+                rec.mark_dirty(fields)
+            raise
 
     async def update_recording_card(self, recording: Recording, updated_info: dict):
         """Update an existing recording object and persist changes to a JSON file."""
         if recording:
-            recording.update(updated_info)
-            self.app.page.run_task(self.persist_recordings)
+            changed = recording.update(updated_info)
+            if "url" in changed:
+                self.recordings.reindex(recording)
+            if recording.is_dirty:
+                self.app.page.run_task(self.persist_recordings)
 
     @staticmethod
     async def _update_recording(
         recording: Recording, monitor_status: bool, display_title: str, status_info: str, selected: bool
     ):
-        attrs_update = {
-            "monitor_status": monitor_status,
-            "display_title": display_title,
-            "status_info": status_info,
-            "selected": selected,
-        }
-        for attr, value in attrs_update.items():
-            setattr(recording, attr, value)
+        recording.update(
+            {
+                "monitor_status": monitor_status,
+                "display_title": display_title,
+                "status_info": status_info,
+                "selected": selected,
+            }
+        )
 
     async def start_monitor_recording(self, recording: Recording, auto_save: bool = True):
         """
@@ -163,17 +294,110 @@ class RecordingManager:
 
     async def remove_recordings(self, recordings: list[Recording]):
         """Remove a recording from the list and update the JSON file."""
-        for recording in recordings:
-            if recording in self.recordings:
-                await self.remove_recording(recording)
-                logger.info(f"Delete Items: {recording.rec_id}-{recording.streamer_name}")
+        removed = self.recordings.remove_many(recordings)
+        self.close_recorders(removed)
+        for recording in removed:
+            logger.info(f"Delete Items: {recording.rec_id}-{recording.streamer_name}")
+        if removed:
+            await self.persist_recordings()
 
     def find_recording_by_id(self, rec_id: str):
         """Find a recording by its ID (hash of dict representation)."""
-        for rec in self.recordings:
-            if rec.rec_id == rec_id:
-                return rec
-        return None
+        return self.recordings.get(rec_id)
+
+    def on_job_completed(self, job):
+        """
+        Follow renamed and moved files in the recording index, and point `recording_dir` at the archive
+        once the files of a finished session have been moved there.
+        """
+        self.app.recording_index.apply_job(job)
+        if job.job_type != JobType.ARCHIVE or not job.result or not job.params.get("rec_id"):
+            return
+        recording = self.find_recording_by_id(job.params["rec_id"])
+        if not recording or recording.recording or not recording.recording_dir:
+            return
+        staged_dir = os.path.dirname(os.path.abspath(job.params["path"])).replace("\\", "/")
+        if os.path.abspath(recording.recording_dir).replace("\\", "/") == staged_dir:
+            recording.recording_dir = os.path.dirname(job.result)
+            self.app.page.run_task(self.persist_recordings)
+
+    async def index_untracked_files(self):
+        """Register recordings the index does not know yet, so retention covers files of older versions too."""
+        roots = self.settings.get_video_save_paths()
+        if self.settings.user_config.get("staging_save_path"):
+            roots.append(self.settings.user_config["staging_save_path"])
+        for root in roots:
+            paths = await asyncio.to_thread(find_media_files, root)
+            await asyncio.to_thread(self.app.recording_index.register_untracked, paths)
+
+    @staticmethod
+    def _get_interrupted_output(entry: dict) -> str | None:
+        """Return the file that was still open when the session was cut off."""
+        segment_pattern = entry.get("segment_pattern")
+        if segment_pattern:
+            prefix, suffix = segment_pattern.split("%03d", maxsplit=1)
+            segments = []
+            for path in glob.glob(glob.escape(prefix) + "*" + glob.escape(suffix)):
+                index = path[len(prefix):len(path) - len(suffix)]
+                if index.isdigit():
+                    segments.append((int(index), path))
+            return max(segments)[1] if segments else None
+
+        output_paths = [path for path in entry.get("output_paths", []) if os.path.exists(path)]
+        return output_paths[-1] if output_paths else None
+
+    @staticmethod
+    def _is_repairable(entry: dict, output_path: str) -> bool:
+        """An MP4-like file recorded without fragments has no moov atom after a crash and cannot be read."""
+        return bool(entry.get("fragmented")) or not output_path.lower().endswith((".mp4", ".mov", ".m4a"))
+
+    def _end_interrupted_session(self, session_id: str | None, output_path: str | None):
+        """Close the session history entry, the session ended when its last file was written to."""
+        if not session_id:
+            return
+        ended_at = None
+        if output_path and os.path.exists(output_path):
+            self.app.recording_index.add(output_path, session_id)
+            ended_at = os.path.getmtime(output_path)
+        self.app.recording_index.end_session(session_id, ExitReason.INTERRUPTED, ended_at=ended_at)
+
+    async def recover_interrupted_sessions(self):
+        """
+        Replay the recording journal after a crash: stop orphaned ffmpeg processes, queue a repair of
+        the file each session was writing and re-check the rooms that were live at that moment.
+        """
+        journal = self.app.recording_journal
+        interrupted = await journal.take_interrupted()
+        if not interrupted:
+            return
+
+        logger.warning(f"Recovering {len(interrupted)} recording sessions interrupted by the last shutdown")
+        user_config = self.settings.user_config
+        for entry in interrupted:
+            await asyncio.to_thread(journal.terminate_orphan, entry.get("pid"))
+            output_path = self._get_interrupted_output(entry)
+            self._end_interrupted_session(entry.get("session_id"), output_path)
+            if output_path and not self._is_repairable(entry, output_path):
+                logger.error(f"Interrupted recording has no index and cannot be repaired: {output_path}")
+            elif output_path:
+                archive_root = entry.get("archive_root") or self.settings.get_video_save_path()
+                tiering = StorageTiering.from_config(user_config, archive_root)
+                followups = []
+                if tiering.enabled:
+                    followups.append(tiering.get_archive_job(rec_id=entry["rec_id"]))
+                if output_path.endswith(".ts") and user_config.get("convert_to_mp4"):
+                    followups = [
+                        {
+                            "job_type": JobType.REMUX,
+                            "params": {"delete_original": user_config.get("delete_original")},
+                            "followups": followups,
+                        }
+                    ]
+                await self.app.job_queue.submit(JobType.REPAIR, {"path": output_path}, followups=followups)
+
+            recording = self.find_recording_by_id(entry["rec_id"])
+            if recording and recording.monitor_status and not recording.recording:
+                self.app.page.run_task(self.check_if_live, recording)
 
     async def check_all_live_status(self):
         """Check the live status of all recordings and update their display titles."""
@@ -200,6 +424,12 @@ class RecordingManager:
     async def check_if_live(self, recording: Recording):
         """Check if the live stream is available, fetch stream data and update is_live status."""
 
+        if recording.recording or recording not in self.recordings:
+            return
+
+        recorder = self.get_recorder(recording)
+        # The previous session may still be finishing, e.g. when it scheduled this check itself
+        await recorder.wait_until_idle()
         if recording.recording:
             return
 
@@ -226,9 +456,14 @@ class RecordingManager:
             if self.settings.user_config["language"] != "zh_CN":
                 platform = platform_key
 
-            output_dir = self.settings.get_video_save_path()
-            await self.check_free_space(output_dir)
-            if not self.app.recording_enabled:
+            if self.app.disk_monitor.is_shed(recording.rec_id):
+                recording.is_checking = False
+                recording.status_info = RecordingStatus.NOT_RECORDING_SPACE
+                return
+
+            await self.check_free_space()
+            output_dir = self.app.volume_manager.select()
+            if not self.app.recording_enabled or not output_dir:
                 recording.is_checking = False
                 recording.status_info = RecordingStatus.NOT_RECORDING_SPACE
                 return
@@ -241,10 +476,11 @@ class RecordingManager:
                 "segment_record": recording.segment_record,
                 "segment_time": recording.segment_time,
                 "save_format": recording.record_format,
+                "output_profiles": recording.output_profiles,
                 "quality": recording.quality,
             }
 
-            recorder = LiveStreamRecorder(self.app, recording, recording_info)
+            recorder.prepare(recording_info)
 
             stream_info = await recorder.fetch_stream()
             logger.info(f"Stream Data: {stream_info}")
@@ -311,7 +547,8 @@ class RecordingManager:
                     )
                     self.app.page.run_task(self.app.record_card_manager.update_card, recording)
                     self.app.page.pubsub.send_others_on_topic("update", recording)
-                    self.app.page.run_task(self.persist_recordings)
+                    if recording.is_dirty:
+                        self.app.page.run_task(self.persist_recordings)
 
     @staticmethod
     def start_update(recording: Recording):
@@ -328,16 +565,16 @@ class RecordingManager:
             )
             logger.info(f"Started recording for {recording.title}")
 
-    @staticmethod
-    def stop_recording(recording: Recording):
+    def stop_recording(self, recording: Recording):
         """Stop the recording process."""
         if recording.recording:
             if recording.start_time is not None:
                 elapsed = datetime.now() - recording.start_time
                 # Add the elapsed time to the cumulative duration.
                 recording.cumulative_duration += elapsed
-                # Update the last recorded duration.
+                # Update the last recorded duration, it is saved with the recording.
                 recording.last_duration = recording.cumulative_duration
+                self.app.page.run_task(self.persist_recordings)
             recording.start_time = None
             recording.recording = False
             logger.info(f"Stopped recording for {recording.title}")
@@ -359,13 +596,14 @@ class RecordingManager:
         self.app.page.pubsub.send_others_on_topic('delete', recordings)
         await self.remove_recordings(recordings)
 
-    async def check_free_space(self, output_dir: str | None = None):
-        disk_space_limit = float(self.settings.user_config.get("recording_space_threshold"))
-        output_dir = output_dir or self.settings.get_video_save_path()
-        if utils.check_disk_capacity(output_dir) < disk_space_limit:
+    async def check_free_space(self):
+        """Disable recording only when none of the output volumes has space left."""
+        volume_manager = self.app.volume_manager
+        if not volume_manager.has_space():
             self.app.recording_enabled = False
             logger.error(
-                f"Disk space remaining is below {disk_space_limit} GB. Recording function disabled"
+                f"Disk space remaining is below {volume_manager.space_threshold} GB on every output volume. "
+                f"Recording function disabled"
             )
             self.app.page.run_task(
                 self.app.snack_bar.show_snack_bar,
@@ -0,0 +1,372 @@
+import json
+import os
+import sqlite3
+import time
+
+from ..models.job_model import Job, JobType
+from ..utils.logger import logger
+
+MEDIA_EXTENSIONS = (".ts", ".flv", ".mkv", ".mov", ".mp4", ".mp3", ".m4a", ".wav", ".wma", ".aac")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    rec_id TEXT,
+    streamer TEXT,
+    platform TEXT,
+    started_at REAL NOT NULL,
+    codecs TEXT,
+    audio_strategies TEXT,
+    ended_at REAL,
+    bytes INTEGER,
+    segments INTEGER,
+    exit_reason TEXT,
+    reconnects INTEGER,
+    avg_bitrate REAL -- bits per second
+);
+CREATE INDEX IF NOT EXISTS sessions_streamer ON sessions (streamer, started_at);
+CREATE INDEX IF NOT EXISTS sessions_platform ON sessions (platform, started_at);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions (started_at);
+CREATE INDEX IF NOT EXISTS sessions_rec ON sessions (rec_id, started_at);
+
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    session_id TEXT,
+    streamer TEXT,
+    platform TEXT,
+    size INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_created ON files (created_at);
+CREATE INDEX IF NOT EXISTS files_streamer ON files (streamer, created_at);
+CREATE INDEX IF NOT EXISTS files_platform ON files (platform, created_at);
+CREATE INDEX IF NOT EXISTS files_session ON files (session_id);
+
+CREATE TABLE IF NOT EXISTS usage (
+    scope TEXT PRIMARY KEY,
+    bytes INTEGER NOT NULL DEFAULT 0
+);
+CREATE TRIGGER IF NOT EXISTS files_insert AFTER INSERT ON files BEGIN
+    INSERT INTO usage (scope, bytes) VALUES ('global', NEW.size),
+        ('platform:' || IFNULL(NEW.platform, ''), NEW.size), ('streamer:' || IFNULL(NEW.streamer, ''), NEW.size)
+    ON CONFLICT (scope) DO UPDATE SET bytes = bytes + excluded.bytes;
+END;
+CREATE TRIGGER IF NOT EXISTS files_delete AFTER DELETE ON files BEGIN
+    UPDATE usage SET bytes = bytes - OLD.size
+    WHERE scope IN ('global', 'platform:' || IFNULL(OLD.platform, ''), 'streamer:' || IFNULL(OLD.streamer, ''));
+END;
+CREATE TRIGGER IF NOT EXISTS files_update AFTER UPDATE OF size ON files BEGIN
+    UPDATE usage SET bytes = bytes - OLD.size + NEW.size
+    WHERE scope IN ('global', 'platform:' || IFNULL(NEW.platform, ''), 'streamer:' || IFNULL(NEW.streamer, ''));
+END;
+"""
+
+# Ended sessions are kept as history after their files are gone, up to this age
+SESSION_HISTORY_DAYS = 365
+
+SESSION_COLUMNS = (
+    "session_id",
+    "rec_id",
+    "streamer",
+    "platform",
+    "started_at",
+    "ended_at",
+    "bytes",
+    "segments",
+    "exit_reason",
+    "reconnects",
+    "avg_bitrate",
+)
+
+
+def _normalize(path: str) -> str:
+    return os.path.abspath(path).replace("\\", "/")
+
+
+def find_media_files(root: str) -> list[str]:
+    """Walk `root` for recorded media files, meant to run in a worker thread."""
+    return [
+        os.path.join(dir_path, file_name)
+        for dir_path, _, file_names in os.walk(root)
+        for file_name in file_names
+        if file_name.lower().endswith(MEDIA_EXTENSIONS)
+    ]
+
+
+class RecordingIndex:
+    """
+    SQLite index of recorded files, grouped into sessions.
+
+    Every lookup the retention engine needs is served from an index: the oldest files of a scope,
+    the sessions of a streamer or platform past the newest N, and the bytes used per scope, which
+    triggers keep up to date on every insert and delete.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def begin_session(
+        self,
+        session_id: str,
+        rec_id: str,
+        streamer: str | None,
+        platform: str | None,
+        codecs: dict | None = None,
+        audio_strategies: dict | None = None,
+    ):
+        """
+        :param codecs: Codecs of the source stream, e.g. {'video': 'h264', 'audio': 'aac'}.
+        :param audio_strategies: How each output format treated the audio, 'copy' or the encoder used.
+        """
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO sessions "
+                "(session_id, rec_id, streamer, platform, started_at, codecs, audio_strategies) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    session_id,
+                    rec_id,
+                    streamer,
+                    platform,
+                    time.time(),
+                    json.dumps(codecs or {}),
+                    json.dumps(audio_strategies or {}),
+                ),
+            )
+
+    def end_session(
+        self, session_id: str | None, exit_reason: str | None, reconnects: int = 0, ended_at: float | None = None
+    ):
+        """
+        Close a session, its bytes and segment count are summed from the files registered for it.
+
+        :param exit_reason: ExitReason of the last ffmpeg run.
+        :param reconnects: How often the session was resumed after an interruption.
+        :param ended_at: End time, defaults to now.
+        """
+        if not session_id:
+            return
+        ended_at = ended_at or time.time()
+        with self.connection:
+            row = self.connection.execute(
+                "SELECT sessions.started_at, COUNT(files.path), IFNULL(SUM(files.size), 0) FROM sessions "
+                "LEFT JOIN files ON files.session_id = sessions.session_id "
+                "WHERE sessions.session_id = ? GROUP BY sessions.session_id",
+                (session_id,),
+            ).fetchone()
+            if not row:
+                return
+            started_at, segments, size = row
+            duration = max(0.0, ended_at - started_at)
+            self.connection.execute(
+                "UPDATE sessions SET ended_at = ?, bytes = ?, segments = ?, exit_reason = ?, reconnects = ?, "
+                "avg_bitrate = ? WHERE session_id = ?",
+                (
+                    ended_at,
+                    size,
+                    segments,
+                    exit_reason,
+                    reconnects,
+                    size * 8 / duration if duration else 0.0,
+                    session_id,
+                ),
+            )
+
+    def add(self, path: str, session_id: str | None = None):
+        """Register a finished file, or refresh its size when it is already known."""
+        path = _normalize(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        session = None
+        if session_id:
+            session = self.connection.execute(
+                "SELECT streamer, platform FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        streamer, platform = session or (None, None)
+        with self.connection:
+            updated = self.connection.execute(
+                "UPDATE files SET size = ? WHERE path = ?", (stat.st_size, path)
+            ).rowcount
+            if not updated:
+                self.connection.execute(
+                    "INSERT INTO files (path, session_id, streamer, platform, size, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (path, session_id, streamer, platform, stat.st_size, stat.st_mtime),
+                )
+
+    def move(self, old_path: str, new_path: str):
+        """Follow a file that post-processing renamed or moved, keeping its session."""
+        old_path, new_path = _normalize(old_path), _normalize(new_path)
+        if old_path == new_path:
+            self.add(new_path)
+            return
+        row = self.connection.execute("SELECT session_id FROM files WHERE path = ?", (old_path,)).fetchone()
+        with self.connection:
+            self.connection.execute("DELETE FROM files WHERE path = ?", (old_path,))
+        self.add(new_path, row[0] if row else None)
+
+    def remove(self, path: str):
+        with self.connection:
+            self.connection.execute("DELETE FROM files WHERE path = ?", (_normalize(path),))
+
+    def get_session_id(self, path: str) -> str | None:
+        row = self.connection.execute("SELECT session_id FROM files WHERE path = ?", (_normalize(path),)).fetchone()
+        return row[0] if row else None
+
+    def apply_job(self, job: Job):
+        """Keep the index in sync with a completed post-processing job."""
+        params = job.params
+        if job.job_type == JobType.ARCHIVE:
+            staging_root = params["staging_root"].rstrip("/")
+            archive_root = params["archive_root"].rstrip("/")
+            for path in params.get("paths") or [params["path"]]:
+                path = _normalize(path)
+                if path.startswith(staging_root + "/"):
+                    self.move(path, archive_root + path[len(staging_root):])
+        elif job.job_type == JobType.CONCAT and job.result:
+            session_id = next(filter(None, (self.get_session_id(path) for path in params["paths"])), None)
+            for path in params["paths"]:
+                if not os.path.exists(path):
+                    self.remove(path)
+            self.add(job.result, session_id)
+        elif job.job_type in (JobType.REMUX, JobType.FASTSTART, JobType.REPAIR) and job.result:
+            self.move(params["path"], job.result)
+
+    def register_untracked(self, paths: list[str]) -> int:
+        """
+        Register files the index does not know yet, e.g. recordings of older versions, returns how many.
+        Meant to run in a worker thread: it uses its own connection and inserts all files in one transaction.
+        """
+        connection = sqlite3.connect(self.db_path)
+        try:
+            known = {row[0] for row in connection.execute("SELECT path FROM files")}
+            rows = []
+            for path in dict.fromkeys(map(_normalize, paths)):
+                if path in known:
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                rows.append((path, stat.st_size, stat.st_mtime))
+            with connection:
+                connection.executemany(
+                    "INSERT OR IGNORE INTO files (path, size, created_at) VALUES (?, ?, ?)", rows
+                )
+        finally:
+            connection.close()
+        if rows:
+            logger.info(f"Recording index: Registered {len(rows)} untracked files")
+        return len(rows)
+
+    @staticmethod
+    def _scope_filter(scope_type: str | None, scope: str | None, table: str = "files") -> tuple[str, tuple]:
+        if scope_type in ("streamer", "platform"):
+            return f"{table}.{scope_type} = ?", (scope,)
+        return "1 = 1", ()
+
+    def get_usage(self, scope_type: str | None = None, scope: str | None = None) -> int:
+        key = f"{scope_type}:{scope or ''}" if scope_type in ("streamer", "platform") else "global"
+        row = self.connection.execute("SELECT bytes FROM usage WHERE scope = ?", (key,)).fetchone()
+        return max(0, row[0]) if row else 0
+
+    def get_oldest(
+        self,
+        scope_type: str | None,
+        scope: str | None,
+        limit: int,
+        before: float | None = None,
+        offset: int = 0,
+    ) -> list:
+        """Return the (path, size) of the oldest files of a scope, optionally only those created before a time."""
+        condition, args = self._scope_filter(scope_type, scope)
+        if before is not None:
+            condition += " AND created_at < ?"
+            args += (before,)
+        return self.connection.execute(
+            f"SELECT path, size FROM files WHERE {condition} ORDER BY created_at, path LIMIT ? OFFSET ?",
+            (*args, limit, offset),
+        ).fetchall()
+
+    def get_files_of_old_sessions(
+        self, scope_type: str | None, scope: str | None, keep: int, limit: int, offset: int = 0
+    ) -> list:
+        """Return the (path, size) of files belonging to sessions older than the newest `keep` of a scope."""
+        condition, args = self._scope_filter(scope_type, scope, "sessions")
+        return self.connection.execute(
+            f"SELECT files.path, files.size FROM files JOIN ("
+            f"SELECT session_id FROM sessions WHERE {condition} ORDER BY started_at DESC LIMIT -1 OFFSET ?"
+            f") AS old_sessions ON files.session_id = old_sessions.session_id "
+            f"ORDER BY files.created_at, files.path LIMIT ? OFFSET ?",
+            (*args, keep, limit, offset),
+        ).fetchall()
+
+    def prune_sessions(self):
+        """Drop sessions whose files are all gone, ended ones once they are older than the history kept."""
+        now = time.time()
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM sessions WHERE started_at < ? AND (ended_at IS NULL OR started_at < ?) "
+                "AND session_id NOT IN (SELECT session_id FROM files WHERE session_id IS NOT NULL)",
+                (now - 86400, now - SESSION_HISTORY_DAYS * 86400),
+            )
+
+    @staticmethod
+    def _history_filter(rec_id: str | None, since: float | None, until: float | None) -> tuple[str, tuple]:
+        conditions, args = ["ended_at IS NOT NULL"], []
+        if rec_id:
+            conditions.append("rec_id = ?")
+            args.append(rec_id)
+        if since is not None:
+            conditions.append("started_at >= ?")
+            args.append(since)
+        if until is not None:
+            conditions.append("started_at < ?")
+            args.append(until)
+        return " AND ".join(conditions), tuple(args)
+
+    def get_session_history(
+        self, rec_id: str | None = None, since: float | None = None, until: float | None = None, limit: int = 100
+    ) -> list[dict]:
+        """Ended sessions, newest first, optionally of one room and started within a time range."""
+        condition, args = self._history_filter(rec_id, since, until)
+        rows = self.connection.execute(
+            f"SELECT {', '.join(SESSION_COLUMNS)} FROM sessions WHERE {condition} ORDER BY started_at DESC LIMIT ?",
+            (*args, limit),
+        ).fetchall()
+        return [dict(zip(SESSION_COLUMNS, row)) for row in rows]
+
+    def get_session_stats(
+        self, rec_id: str | None = None, since: float | None = None, until: float | None = None
+    ) -> dict:
+        """Duration, size and bitrate totals of the ended sessions of a room, or of all rooms."""
+        condition, args = self._history_filter(rec_id, since, until)
+        sessions, duration, size, max_duration, reconnects = self.connection.execute(
+            f"SELECT COUNT(*), IFNULL(SUM(ended_at - started_at), 0), IFNULL(SUM(bytes), 0), "
+            f"IFNULL(MAX(ended_at - started_at), 0), IFNULL(SUM(reconnects), 0) FROM sessions WHERE {condition}",
+            args,
+        ).fetchone()
+        return {
+            "sessions": sessions,
+            "total_duration": round(duration, 1),
+            "avg_duration": round(duration / sessions, 1) if sessions else 0.0,
+            "max_duration": round(max_duration, 1),
+            "bytes": size,
+            "avg_bitrate": round(size * 8 / duration) if duration else 0,
+            "reconnects": reconnects,
+        }
+
+    def get_stats(self) -> dict:
+        files, total = self.connection.execute("SELECT COUNT(*), IFNULL(SUM(size), 0) FROM files").fetchone()
+        sessions = self.connection.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        return {"files": files, "sessions": sessions, "bytes": total}
@@ -0,0 +1,80 @@
+import asyncio
+import copy
+import json
+import time
+
+from ..process_manager import psutil
+from ..utils.logger import logger
+from .config_manager import read_config_file, write_config_file
+
+
+class RecordingJournal:
+    """
+    Write-ahead journal of active recording sessions.
+
+    An entry is written before ffmpeg produces output and removed once the session has ended
+    cleanly, so any entry found at startup belongs to a session that was cut off by a crash.
+    """
+
+    def __init__(self, journal_path: str):
+        self.journal_path = journal_path
+        self.entries: dict[str, dict] = self._load()
+        self._write_lock = asyncio.Lock()
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            return read_config_file(self.journal_path)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to read recording journal: {e}")
+            return {}
+
+    async def _write(self):
+        """Replace the journal atomically off the event loop, writes are applied in the order requested."""
+        async with self._write_lock:
+            entries = copy.deepcopy(self.entries)
+            try:
+                await asyncio.to_thread(write_config_file, self.journal_path, entries)
+            except OSError as e:
+                logger.error(f"Failed to write recording journal: {e}")
+
+    async def begin(self, rec_id: str, **fields):
+        self.entries[rec_id] = {"start_time": time.time(), "output_paths": [], **fields}
+        await self._write()
+
+    async def update(self, rec_id: str, **fields):
+        entry = self.entries.get(rec_id)
+        if entry is None:
+            return
+        output_path = fields.pop("output_path", None)
+        if output_path and output_path not in entry["output_paths"]:
+            entry["output_paths"].append(output_path)
+        entry.update(fields)
+        await self._write()
+
+    async def end(self, rec_id: str):
+        if self.entries.pop(rec_id, None) is not None:
+            await self._write()
+
+    async def take_interrupted(self) -> list[dict]:
+        """Return the sessions left behind by the previous run and clear them from the journal."""
+        interrupted = [{"rec_id": rec_id, **entry} for rec_id, entry in self.entries.items()]
+        if interrupted:
+            self.entries = {}
+            await self._write()
+        return interrupted
+
+    @staticmethod
+    def terminate_orphan(pid: int | None):
+        """Stop an ffmpeg process that survived the crash of the app, so it does not keep writing."""
+        if not pid or not psutil:
+            return
+        try:
+            process = psutil.Process(pid)
+            if "ffmpeg" in process.name().lower():
+                process.terminate()
+                process.wait(timeout=5)
+                logger.info(f"Terminated orphaned ffmpeg process: pid={pid}")
+        except (psutil.Error, OSError):
+            pass
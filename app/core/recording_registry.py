@@ -0,0 +1,139 @@
+import threading
+from collections.abc import Callable, Iterable, Iterator
+
+from ..models.recording_model import Recording
+from .platform_handlers import get_platform_info
+
+
+def get_url_key(url: str | None) -> str:
+    """Key under which a room URL is indexed, insensitive to scheme, case and a trailing slash."""
+    url = (url or "").strip()
+    for prefix in ("https://", "http://"):
+        if url.lower().startswith(prefix):
+            url = url[len(prefix):]
+            break
+    return url.rstrip("/").lower()
+
+
+class RecordingRegistry:
+    """
+    The recordings list, in insertion order, indexed by rec_id, room key and platform.
+
+    The room key of a URL defaults to `get_url_key`, `set_key_function` installs a smarter one that
+    maps every URL variant of a room to the same key.
+
+    Lookups and removals are O(1). Every method runs synchronously under a short lock that is
+    never held across I/O, so batch operations are atomic for the event loop as well as for
+    worker threads, and persisting the list happens after the lock is released.
+    """
+
+    def __init__(self, recordings: Iterable[Recording] = (), key_function: Callable[[str], str] = get_url_key):
+        self.key_function = key_function
+        self._by_id: dict[str, Recording] = {}
+        self._by_url: dict[str, dict[str, None]] = {}
+        self._by_platform: dict[str, dict[str, None]] = {}
+        self._keys: dict[str, tuple[str, str]] = {}
+        self._lock = threading.RLock()
+        self.add_many(recordings)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __bool__(self) -> bool:
+        return bool(self._by_id)
+
+    def __iter__(self) -> Iterator[Recording]:
+        # A snapshot, so callers may add or remove recordings while iterating
+        with self._lock:
+            return iter(list(self._by_id.values()))
+
+    def __contains__(self, recording: Recording) -> bool:
+        return self._by_id.get(recording.rec_id) is recording
+
+    def _index(self, recording: Recording):
+        url_key = self.key_function(recording.url or "")
+        platform_key = get_platform_info(recording.url)[1] or ""
+        self._keys[recording.rec_id] = (url_key, platform_key)
+        self._by_url.setdefault(url_key, {})[recording.rec_id] = None
+        self._by_platform.setdefault(platform_key, {})[recording.rec_id] = None
+
+    def _unindex(self, rec_id: str):
+        url_key, platform_key = self._keys.pop(rec_id, ("", ""))
+        for index, key in ((self._by_url, url_key), (self._by_platform, platform_key)):
+            rec_ids = index.get(key)
+            if rec_ids is not None:
+                rec_ids.pop(rec_id, None)
+                if not rec_ids:
+                    del index[key]
+
+    def add(self, recording: Recording) -> bool:
+        """Add a recording, returns False when its rec_id is already registered."""
+        return bool(self.add_many([recording]))
+
+    def add_many(self, recordings: Iterable[Recording]) -> list[Recording]:
+        """Add several recordings at once, returns those that were not registered yet."""
+        added = []
+        with self._lock:
+            for recording in recordings:
+                if recording.rec_id in self._by_id:
+                    continue
+                self._by_id[recording.rec_id] = recording
+                self._index(recording)
+                added.append(recording)
+        return added
+
+    def remove(self, recording: Recording) -> bool:
+        return bool(self.remove_many([recording]))
+
+    def remove_many(self, recordings: Iterable[Recording]) -> list[Recording]:
+        """Remove several recordings at once, returns those that were registered."""
+        removed = []
+        with self._lock:
+            for recording in recordings:
+                if self._by_id.get(recording.rec_id) is not recording:
+                    continue
+                del self._by_id[recording.rec_id]
+                self._unindex(recording.rec_id)
+                removed.append(recording)
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._by_id.clear()
+            self._by_url.clear()
+            self._by_platform.clear()
+            self._keys.clear()
+
+    def set_key_function(self, key_function: Callable[[str], str]):
+        """Switch to another room key function and rebuild the URL index."""
+        with self._lock:
+            self.key_function = key_function
+            for rec_id, recording in self._by_id.items():
+                self._unindex(rec_id)
+                self._index(recording)
+
+    def reindex(self, recording: Recording):
+        """Update the indexes after the URL of a recording was edited."""
+        with self._lock:
+            if self._by_id.get(recording.rec_id) is recording:
+                self._unindex(recording.rec_id)
+                self._index(recording)
+
+    def get(self, rec_id: str) -> Recording | None:
+        return self._by_id.get(rec_id)
+
+    def find_by_url(self, url: str) -> Recording | None:
+        """The first recording of the room the URL points to."""
+        rec_ids = self._by_url.get(self.key_function(url))
+        return self._by_id[next(iter(rec_ids))] if rec_ids else None
+
+    def get_duplicates(self) -> list[list[Recording]]:
+        """Groups of recordings pointing to the same room, each in insertion order."""
+        with self._lock:
+            return [
+                [self._by_id[rec_id] for rec_id in rec_ids] for rec_ids in self._by_url.values() if len(rec_ids) > 1
+            ]
+
+    def get_by_platform(self, platform_key: str) -> list[Recording]:
+        with self._lock:
+            return [self._by_id[rec_id] for rec_id in self._by_platform.get(platform_key, {})]
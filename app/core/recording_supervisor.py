@@ -0,0 +1,182 @@
+import json
+import os
+import re
+import time
+from datetime import datetime
+
+from ..models.exit_reason_model import ExitReason
+from ..utils.logger import logger
+
+
+class RecordingSupervisor:
+    """
+    Watches a single recording session, classifies ffmpeg exits and output stalls,
+    and decides whether and when the session should be resumed.
+    """
+
+    SAFE_RETURN_CODES = (0, 255)
+    STALL_CHECK_INTERVAL = 5
+    WRITE_RATE_SMOOTHING = 0.3
+    RETRY_BASE_DELAY = 2
+    RETRY_MAX_DELAY = 60
+
+    URL_EXPIRED_PATTERN = re.compile(r"\b(401|403|404|410)\b|Forbidden|Not Found|Unauthorized", re.IGNORECASE)
+    NETWORK_ERROR_PATTERN = re.compile(
+        r"Connection (refused|reset|timed out)|timed out|Network is unreachable|I/O error|"
+        r"End of file|Broken pipe|Failed to resolve|Input/output error",
+        re.IGNORECASE,
+    )
+
+    def __init__(self, save_path: str, segment_record: bool, stall_timeout: int = 60, max_retries: int = 5):
+        """
+        Initialize a supervisor for one recording session.
+
+        :param save_path: Output path of the first ffmpeg run, may contain a `%03d` segment pattern.
+        :param segment_record: Whether the session writes numbered segments.
+        :param stall_timeout: Seconds without output growth before ffmpeg is considered stalled.
+        :param max_retries: Maximum consecutive reconnect attempts before the session is given up.
+        """
+        self.save_path = save_path
+        self.segment_record = segment_record and "%03d" in save_path
+        self.stall_timeout = stall_timeout
+        self.max_retries = max_retries
+        self.retry_count = 0
+        self.reconnect_count = 0
+        self.segment_index = 0
+        self.part_index = 0
+        self.current_path = save_path
+        self.gaps = []
+        self._gap_start = None
+        self._gap_reason = None
+        self._last_output_size = -1
+        self._last_growth_time = time.monotonic()
+        self._last_check_time = 0.0
+        self.write_rate = 0.0
+
+    def on_process_started(self, output_path: str):
+        """Reset stall tracking for a freshly spawned ffmpeg and close any pending gap."""
+        self.current_path = output_path
+        self._last_output_size = -1
+        self._last_growth_time = time.monotonic()
+        if self._gap_start is not None:
+            gap_end = datetime.now()
+            self.gaps.append(
+                {
+                    "start": self._gap_start.strftime("%Y-%m-%d %H:%M:%S"),
+                    "end": gap_end.strftime("%Y-%m-%d %H:%M:%S"),
+                    "duration": round((gap_end - self._gap_start).total_seconds(), 1),
+                    "reason": self._gap_reason,
+                    "resumed_path": output_path,
+                }
+            )
+            self._gap_start = None
+
+    def _current_output_file(self) -> str:
+        if not self.segment_record:
+            return self.current_path
+        while os.path.exists(self.current_path % (self.segment_index + 1)):
+            self.segment_index += 1
+        segment_path = self.current_path % self.segment_index
+        # A muxer that ignores the pattern writes a single file under the literal path
+        if not os.path.exists(segment_path) and os.path.exists(self.current_path):
+            return self.current_path
+        return segment_path
+
+    def is_stalled(self) -> bool:
+        """
+        Return True when the output has not grown for longer than the stall timeout.
+        Also updates `write_rate`, the smoothed output bitrate in bytes per second.
+        """
+        now = time.monotonic()
+        if now - self._last_check_time < self.STALL_CHECK_INTERVAL:
+            return False
+        elapsed = now - self._last_check_time
+        self._last_check_time = now
+
+        output_file = self._current_output_file()
+        try:
+            size = os.path.getsize(output_file)
+        except OSError:
+            size = 0
+
+        if self._last_output_size >= 0:
+            # A smaller size means ffmpeg moved on to a new segment
+            grown = size - self._last_output_size if size >= self._last_output_size else size
+            self.write_rate += self.WRITE_RATE_SMOOTHING * (grown / elapsed - self.write_rate)
+
+        if size != self._last_output_size:
+            if size > 0 and self._last_output_size >= 0:
+                self.retry_count = 0
+            self._last_output_size = size
+            self._last_growth_time = now
+            return False
+        return now - self._last_growth_time > self.stall_timeout
+
+    def classify_exit(self, return_code: int | None, stderr: str, stalled: bool, stop_requested: bool, enabled: bool):
+        """Map an ffmpeg exit to an ExitReason."""
+        if stop_requested:
+            return ExitReason.USER_STOPPED if enabled else ExitReason.RECORDING_DISABLED
+        if stalled:
+            return ExitReason.STALLED
+        if stderr and self.URL_EXPIRED_PATTERN.search(stderr):
+            return ExitReason.URL_EXPIRED
+        if stderr and self.NETWORK_ERROR_PATTERN.search(stderr):
+            return ExitReason.NETWORK_ERROR
+        if return_code in self.SAFE_RETURN_CODES:
+            return ExitReason.STREAM_ENDED
+        return ExitReason.FFMPEG_ERROR
+
+    @staticmethod
+    def should_reconnect(exit_reason: str) -> bool:
+        """Every exit that was not requested may be a blip, the handler decides whether the room is still live."""
+        return exit_reason not in (ExitReason.USER_STOPPED, ExitReason.RECORDING_DISABLED)
+
+    def next_retry_delay(self) -> int | None:
+        """Return the backoff before the next attempt, or None once the retry budget is spent."""
+        if self.retry_count >= self.max_retries:
+            return None
+        delay = min(self.RETRY_BASE_DELAY * (2 ** self.retry_count), self.RETRY_MAX_DELAY)
+        self.retry_count += 1
+        return delay
+
+    def begin_gap(self, exit_reason: str):
+        if self._gap_start is None:
+            self._gap_start = datetime.now()
+            self._gap_reason = exit_reason
+        self.reconnect_count += 1
+
+    def next_output(self) -> tuple[str, int]:
+        """
+        Return the output path and segment start number for the resumed ffmpeg run,
+        so the session continues after the last written file instead of overwriting it.
+        """
+        if self.segment_record:
+            self._current_output_file()
+            self.segment_index += 1
+            return self.save_path, self.segment_index
+
+        self.part_index += 1
+        root, ext = os.path.splitext(self.save_path)
+        return f"{root}_{self.part_index:03d}{ext}", 0
+
+    def change_format(self, save_format: str):
+        """Write the following outputs of the session in another container, e.g. audio only."""
+        root = os.path.splitext(self.save_path)[0]
+        self.save_path = f"{root}.{save_format}"
+
+    def write_gap_metadata(self):
+        """Write the gaps of this session to a JSON sidecar next to the recording."""
+        if not self.gaps:
+            return
+        root = os.path.splitext(self.save_path)[0]
+        if self.segment_record:
+            root = root.rsplit("_", maxsplit=1)[0]
+        metadata_path = f"{root}.gaps.json"
+        try:
+            with open(metadata_path, "w", encoding="utf-8") as file:
+                json.dump(
+                    {"reconnect_count": self.reconnect_count, "gaps": self.gaps}, file, ensure_ascii=False, indent=4
+                )
+            logger.info(f"Recording gaps written: {metadata_path}")
+        except OSError as e:
+            logger.error(f"Failed to write recording gap metadata: {e}")
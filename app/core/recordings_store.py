@@ -0,0 +1,101 @@
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+
+from ..utils.logger import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recordings (
+    rec_id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS recordings_position ON recordings (position);
+"""
+
+
+class RecordingsStore:
+    """
+    SQLite store of the recordings list, in WAL mode so a save never blocks readers.
+
+    `save` receives the recordings that changed along with the ids of the whole list, and only writes
+    the rows of recordings that were added, changed or removed since the previous save, in a single
+    transaction, so a bulk import of thousands of rooms is a single commit.
+    The store takes over the recordings of an existing JSON file the first time it is opened.
+    """
+
+    def __init__(self, db_path: str, legacy_json_path: str | None = None):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+        self._lock = threading.Lock()
+        self._saved: dict[str, str] = dict(self.connection.execute("SELECT rec_id, data FROM recordings"))
+        if legacy_json_path:
+            self._migrate(legacy_json_path)
+
+    def close(self):
+        self.connection.close()
+
+    def _migrate(self, legacy_json_path: str):
+        """Import the recordings of the JSON file once, it is kept renamed as a backup."""
+        if not os.path.exists(legacy_json_path):
+            return
+        try:
+            with open(legacy_json_path, encoding="utf-8") as file:
+                recordings = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to read recordings for migration: {legacy_json_path}, {e}")
+            return
+
+        if recordings and not self._saved:
+            self.save(recordings)
+            logger.success(f"Migrated {len(recordings)} recordings to {self.db_path}")
+        os.replace(legacy_json_path, f"{legacy_json_path}.migrated")
+
+    def load(self) -> list[dict]:
+        rows = self.connection.execute("SELECT data FROM recordings ORDER BY position").fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def save(self, recordings: list[dict], rec_ids: Iterable[str] | None = None) -> int:
+        """
+        Bring the store in line with the recordings list, returns the number of rows written.
+
+        :param recordings: Recordings to write, the whole list when `rec_ids` is not given.
+        :param rec_ids: Ids of every recording in the list, rows of other ids are deleted.
+        """
+        with self._lock:
+            serialized = {recording["rec_id"]: json.dumps(recording, ensure_ascii=False) for recording in recordings}
+            kept = serialized.keys() if rec_ids is None else set(rec_ids)
+            upserts = [(rec_id, data) for rec_id, data in serialized.items() if self._saved.get(rec_id) != data]
+            deletes = [(rec_id,) for rec_id in self._saved if rec_id not in kept]
+            if not upserts and not deletes:
+                return 0
+
+            with self.connection:
+                self.connection.executemany("DELETE FROM recordings WHERE rec_id = ?", deletes)
+                # New recordings go to the end of the list, existing ones keep their place
+                self.connection.executemany(
+                    "INSERT INTO recordings (rec_id, position, data) "
+                    "VALUES (?, (SELECT IFNULL(MAX(position), -1) + 1 FROM recordings), ?) "
+                    "ON CONFLICT (rec_id) DO UPDATE SET data = excluded.data",
+                    upserts,
+                )
+            for rec_id, data in upserts:
+                self._saved[rec_id] = data
+            for rec_id, in deletes:
+                del self._saved[rec_id]
+            return len(upserts) + len(deletes)
+
+    def iter_recordings(self) -> Iterator[dict]:
+        """Yield every recording in list order from a snapshot of the store, without loading them all at once."""
+        connection = sqlite3.connect(self.db_path)
+        try:
+            for data, in connection.execute("SELECT data FROM recordings ORDER BY position"):
+                yield json.loads(data)
+        finally:
+            connection.close()
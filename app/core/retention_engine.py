@@ -0,0 +1,213 @@
+import asyncio
+import itertools
+import os
+import time
+from collections.abc import Callable
+
+from ..utils.logger import logger
+from .recording_index import RecordingIndex
+
+POLICY_FIELDS = ("max_age_days", "max_size_gb", "keep_sessions")
+SIDECAR_SUFFIXES = (".sha256",)
+SIDECAR_EXTENSIONS = (".srt", ".vtt")
+
+
+def parse_retention_rules(text: str | None) -> dict:
+    """
+    Parse scoped retention rules, one per line:
+    `streamer:<name> max_age_days=7 max_size_gb=50 keep_sessions=10` or `platform:<key> ...`
+    """
+    rules = {"platform": {}, "streamer": {}}
+    for line in (text or "").splitlines():
+        parts = line.strip().split()
+        if not parts or ":" not in parts[0]:
+            continue
+        scope_type, _, scope = parts[0].partition(":")
+        if scope_type not in rules or not scope:
+            continue
+        policy = {}
+        for part in parts[1:]:
+            key, _, value = part.partition("=")
+            if key in POLICY_FIELDS:
+                try:
+                    policy[key] = float(value)
+                except ValueError:
+                    continue
+        rules[scope_type][scope] = policy
+    return rules
+
+
+def format_retention_rules(rules: dict) -> str:
+    lines = []
+    for scope_type in ("streamer", "platform"):
+        for scope, policy in (rules.get(scope_type) or {}).items():
+            values = [f"{key}={policy[key]:g}" for key in POLICY_FIELDS if policy.get(key)]
+            lines.append(" ".join([f"{scope_type}:{scope}", *values]))
+    return "\n".join(lines)
+
+
+def load_retention_policies(user_config: dict) -> dict:
+    """Return {'global': policy, 'platform': {key: policy}, 'streamer': {name: policy}} from the user settings."""
+    policies = parse_retention_rules(user_config.get("retention_rules"))
+    policies["global"] = {
+        "max_age_days": float(user_config.get("retention_max_age_days") or 0),
+        "max_size_gb": float(user_config.get("retention_max_size_gb") or 0),
+        "keep_sessions": float(user_config.get("retention_keep_sessions") or 0),
+    }
+    return policies
+
+
+def save_retention_policies(user_config: dict, policies: dict):
+    """Write policies in the format returned by `load_retention_policies` back into the user settings."""
+    global_policy = policies.get("global") or {}
+    for key in POLICY_FIELDS:
+        user_config[f"retention_{key}"] = f"{float(global_policy.get(key) or 0):g}"
+    user_config["retention_rules"] = format_retention_rules(policies)
+
+
+class RetentionEngine:
+    """
+    Deletes recorded files that fall outside the retention policies.
+
+    Policies limit the age of files, the bytes used and the number of sessions kept, globally and per
+    platform or streamer; a file is deleted as soon as any policy that covers it is exceeded. Each
+    run deletes at most `batch_size` files at `max_deletes_per_second`, so cleanup of a large
+    backlog is spread over several runs instead of stalling the disk.
+    """
+
+    RUN_INTERVAL = 600
+    BATCH_SIZE = 200
+    MAX_DELETES_PER_SECOND = 10
+    # Files changed recently may still be written or post-processed
+    MIN_FILE_AGE = 600
+
+    def __init__(
+        self,
+        index: RecordingIndex,
+        get_user_config: Callable[[], dict],
+        is_protected: Callable[[str], bool] | None = None,
+        batch_size: int = BATCH_SIZE,
+        max_deletes_per_second: float = MAX_DELETES_PER_SECOND,
+    ):
+        """
+        :param index: Index of recorded files.
+        :param get_user_config: Returns the user settings holding the retention policies, called on every run.
+        :param is_protected: Returns True for paths that must not be deleted, e.g. pending job inputs.
+        """
+        self.index = index
+        self.get_user_config = get_user_config
+        self.is_protected = is_protected
+        self.batch_size = batch_size
+        self.max_deletes_per_second = max_deletes_per_second
+        self._task = None
+        self._lock = asyncio.Lock()
+
+    async def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            if self.get_user_config().get("retention_enabled"):
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    logger.error(f"Retention run failed: {e}")
+            await asyncio.sleep(self.RUN_INTERVAL)
+
+    def _get_scoped_policies(self) -> list[tuple[str | None, str | None, dict]]:
+        policies = load_retention_policies(self.get_user_config())
+        scoped = [(None, None, policies["global"])]
+        for scope_type in ("platform", "streamer"):
+            scoped.extend((scope_type, scope, policy) for scope, policy in policies[scope_type].items())
+        return scoped
+
+    def _iter_deletable(self, fetch: Callable[[int, int], list], limit: int):
+        """
+        Yield the (path, size) rows returned by `fetch(limit, offset)` that may be deleted, paging past
+        protected and recently changed files so they cannot hide older files from every run.
+        """
+        offset = 0
+        while True:
+            rows = fetch(limit, offset)
+            for path, size in rows:
+                if self._can_delete(path):
+                    yield path, size
+            if len(rows) < limit:
+                return
+            offset += limit
+
+    def _collect(self, scope_type: str | None, scope: str | None, policy: dict, limit: int) -> list[str]:
+        """Pick up to `limit` deletable files per rule of one policy, oldest first."""
+        index = self.index
+        candidates = []
+        if policy.get("max_age_days"):
+            cutoff = time.time() - policy["max_age_days"] * 86400
+            rows = self._iter_deletable(
+                lambda page, offset: index.get_oldest(scope_type, scope, page, before=cutoff, offset=offset), limit
+            )
+            candidates.extend(path for path, _ in itertools.islice(rows, limit))
+        if policy.get("keep_sessions"):
+            keep = int(policy["keep_sessions"])
+            rows = self._iter_deletable(
+                lambda page, offset: index.get_files_of_old_sessions(scope_type, scope, keep, page, offset), limit
+            )
+            candidates.extend(path for path, _ in itertools.islice(rows, limit))
+        if policy.get("max_size_gb"):
+            excess = index.get_usage(scope_type, scope) - policy["max_size_gb"] * 1024**3
+            rows = self._iter_deletable(
+                lambda page, offset: index.get_oldest(scope_type, scope, page, offset=offset), limit
+            )
+            for path, size in itertools.islice(rows, limit) if excess > 0 else []:
+                candidates.append(path)
+                excess -= size
+                if excess <= 0:
+                    break
+        return candidates
+
+    def _can_delete(self, path: str) -> bool:
+        try:
+            if time.time() - os.path.getmtime(path) < self.MIN_FILE_AGE:
+                return False
+        except OSError:
+            return True
+        return not (self.is_protected and self.is_protected(path))
+
+    @staticmethod
+    def _delete_file(path: str):
+        root = os.path.splitext(path)[0]
+        sidecars = [path + suffix for suffix in SIDECAR_SUFFIXES] + [root + ext for ext in SIDECAR_EXTENSIONS]
+        for file_path in (path, *sidecars):
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                continue
+
+    async def run_once(self) -> int:
+        """Apply every policy once, returns the number of files deleted."""
+        async with self._lock:
+            deleted = 0
+            seen = set()
+            interval = 1 / self.max_deletes_per_second if self.max_deletes_per_second else 0
+            for scope_type, scope, policy in self._get_scoped_policies():
+                if deleted >= self.batch_size:
+                    break
+                for path in self._collect(scope_type, scope, policy, self.batch_size - deleted):
+                    if path in seen:
+                        continue
+                    seen.add(path)
+                    if not self._can_delete(path):
+                        continue
+                    try:
+                        await asyncio.to_thread(self._delete_file, path)
+                    except OSError as e:
+                        logger.error(f"Retention: Failed to delete {path}: {e}")
+                        continue
+                    self.index.remove(path)
+                    deleted += 1
+                    logger.info(f"Retention: Deleted {path} ({scope_type or 'global'} {scope or ''})")
+                    await asyncio.sleep(interval)
+            self.index.prune_sessions()
+            if deleted:
+                logger.success(f"Retention: Deleted {deleted} files")
+            return deleted
@@ -0,0 +1,128 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import httpx
+
+from ..utils.logger import logger
+from .platform_handlers import PlatformHandler
+from .recording_registry import get_url_key
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS short_links (
+    url TEXT PRIMARY KEY,
+    resolved_url TEXT NOT NULL,
+    resolved_at REAL NOT NULL
+);
+"""
+
+# Query parameters added by share buttons and campaigns, they do not select a different room
+TRACKING_PARAM_PREFIXES = ("utm_", "spm", "share", "enter_from", "u_code", "xsec_")
+RESOLVE_TIMEOUT = 10
+RESOLVE_CONCURRENCY = 8
+RESOLVE_USER_AGENT = (
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1"
+)
+
+
+def with_https_scheme(url: str) -> str:
+    url = url.strip()
+    if url.lower().startswith("http://"):
+        return "https://" + url[len("http://"):]
+    if not url.lower().startswith("https://"):
+        return "https://" + url
+    return url
+
+
+def strip_tracking_params(url: str) -> str:
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAM_PREFIXES)
+    ]
+    return parts._replace(query=urlencode(query), fragment="").geturl()
+
+
+class RoomIdentityResolver:
+    """
+    Maps every URL variant of a live room to one room key.
+
+    The platform handler extracts the room id from the URL, e.g. 'douyin:745964462470'. Short and
+    share links are followed once and the room URL they redirect to is kept in SQLite, so later
+    lookups, which run synchronously and never touch the network, know them too. URLs without a
+    recognizable room id fall back to the URL without scheme, tracking parameters and fragment.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+        self._lock = threading.Lock()
+        self._resolved: dict[str, str] = dict(self.connection.execute("SELECT url, resolved_url FROM short_links"))
+
+    def close(self):
+        self.connection.close()
+
+    @staticmethod
+    def is_short_link(url: str) -> bool:
+        url = with_https_scheme(url)
+        handler_class = PlatformHandler.get_handler_class(url)
+        return bool(handler_class and handler_class.is_short_link(url))
+
+    def get_room_key(self, url: str) -> str:
+        """Room key of a URL, short links are known only once they were resolved."""
+        url = with_https_scheme(url)
+        resolved_url = self._resolved.get(get_url_key(url), url)
+        handler_class = PlatformHandler.get_handler_class(resolved_url)
+        room_key = handler_class.get_room_key(resolved_url) if handler_class else None
+        return room_key or get_url_key(strip_tracking_params(resolved_url))
+
+    def needs_resolving(self, url: str) -> bool:
+        return self.is_short_link(url) and get_url_key(url) not in self._resolved
+
+    async def _resolve(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, url: str) -> str | None:
+        async with semaphore:
+            try:
+                response = await client.get(url)
+            except httpx.HTTPError as e:
+                logger.warning(f"Failed to resolve short link {url}: {e}")
+                return None
+        resolved_url = str(response.url)
+        if resolved_url == url or self.is_short_link(resolved_url):
+            return None
+        return resolved_url
+
+    async def resolve_many(self, urls: list[str], proxy: str | None = None) -> int:
+        """Follow the short links among `urls` that were not resolved before, returns how many were resolved."""
+        pending = list(dict.fromkeys(with_https_scheme(url) for url in urls if self.needs_resolving(url)))
+        if not pending:
+            return 0
+
+        semaphore = asyncio.Semaphore(RESOLVE_CONCURRENCY)
+        async with httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=RESOLVE_TIMEOUT,
+            headers={"User-Agent": RESOLVE_USER_AGENT},
+            proxy=proxy,
+        ) as client:
+            results = await asyncio.gather(*(self._resolve(client, semaphore, url) for url in pending))
+
+        resolved = {get_url_key(url): result for url, result in zip(pending, results) if result}
+        if resolved:
+            await asyncio.to_thread(self._save, resolved)
+        logger.info(f"Resolved {len(resolved)} of {len(pending)} short links")
+        return len(resolved)
+
+    def _save(self, resolved: dict[str, str]):
+        now = time.time()
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO short_links (url, resolved_url, resolved_at) VALUES (?, ?, ?)",
+                [(url_key, resolved_url, now) for url_key, resolved_url in resolved.items()],
+            )
+        self._resolved.update(resolved)
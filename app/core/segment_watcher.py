@@ -0,0 +1,95 @@
+import asyncio
+import csv
+import os
+from collections.abc import Awaitable, Callable
+
+from ..utils.logger import logger
+
+
+class SegmentWatcher:
+    """
+    Follows the CSV segment list written by ffmpeg's segment muxer and reports every
+    segment as soon as ffmpeg closes it, so post-processing can run while recording continues.
+    """
+
+    POLL_INTERVAL = 3
+
+    def __init__(self, segment_list_path: str, on_segment: Callable[[str, float | None], Awaitable[None]]):
+        """
+        :param segment_list_path: Path passed to ffmpeg's `-segment_list` option.
+        :param on_segment: Coroutine called with the absolute path and duration of each closed segment.
+        """
+        self.segment_list_path = segment_list_path
+        self.on_segment = on_segment
+        self.segment_dir = os.path.dirname(segment_list_path)
+        self.closed_segments = []
+        self._offset = 0
+        self._seen = set()
+        self._stopped = asyncio.Event()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        """Stop following the list after picking up the entries written when ffmpeg exited."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        if self._task:
+            await self._task
+        try:
+            os.remove(self.segment_list_path)
+        except OSError:
+            pass
+
+    async def _watch(self):
+        while True:
+            stopped = self._stopped.is_set()
+            await self.poll()
+            if stopped:
+                break
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=self.POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def _read_new_lines(self) -> list[str]:
+        try:
+            size = os.path.getsize(self.segment_list_path)
+        except OSError:
+            return []
+
+        # ffmpeg truncates the list when a resumed process opens it again
+        if size < self._offset:
+            self._offset = 0
+        if size == self._offset:
+            return []
+
+        with open(self.segment_list_path, "rb") as file:
+            file.seek(self._offset)
+            data = file.read()
+        end = data.rfind(b"\n")
+        if end < 0:
+            return []
+        self._offset += end + 1
+        return data[:end].decode("utf-8", errors="ignore").splitlines()
+
+    async def poll(self):
+        for row in csv.reader(self._read_new_lines()):
+            if not row or not row[0]:
+                continue
+            segment_path = os.path.join(self.segment_dir, os.path.basename(row[0])).replace("\\", "/")
+            if segment_path in self._seen:
+                continue
+            self._seen.add(segment_path)
+            self.closed_segments.append(segment_path)
+            logger.info(f"Segment closed: {segment_path}")
+            try:
+                segment_duration = float(row[2]) - float(row[1])
+            except (IndexError, ValueError):
+                segment_duration = None
+            try:
+                await self.on_segment(segment_path, segment_duration)
+            except Exception as e:
+                logger.error(f"Segment post-processing failed: {segment_path}, {e}")
@@ -0,0 +1,161 @@
+import asyncio
+import os
+from collections.abc import Callable
+from typing import Any
+
+from ..utils.logger import logger
+
+INT_FIELDS = (
+    "loop_time_seconds",
+    "max_concurrent_recordings",
+    "post_processing_workers",
+    "stall_timeout_seconds",
+    "reconnect_max_retries",
+    "time_subtitle_interval",
+)
+FLOAT_FIELDS = (
+    "recording_space_threshold",
+    "max_cpu_percent",
+    "min_free_memory_percent",
+    "staging_space_threshold",
+    "archive_bandwidth_limit",
+    "disk_warn_minutes",
+    "disk_degrade_minutes",
+    "retention_max_age_days",
+    "retention_max_size_gb",
+    "retention_keep_sessions",
+)
+LIST_FIELDS = (
+    "default_platform_with_proxy",
+    "extra_save_paths",
+    "disk_degradation_steps",
+)
+
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes", "on")
+    return bool(value)
+
+
+def _parse_list(value: Any) -> list[str]:
+    if isinstance(value, list):
+        return [str(i).strip() for i in value if str(i).strip()]
+    return [i.strip() for i in str(value or "").replace("，", ",").split(",") if i.strip()]
+
+
+class SettingsCache:
+    """
+    User settings merged over the defaults, loaded once and parsed into typed values.
+
+    Numeric settings, which are stored as strings, are parsed to int or float, comma separated
+    lists are split and booleans are normalized; invalid values fall back to the default. The
+    files are re-read only when their modification time changes, and subscribers are told which
+    keys changed, whether the change came from the settings page or from another process.
+    """
+
+    WATCH_INTERVAL = 2
+
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+        self.default_config: dict = {}
+        self.raw: dict = {}
+        self.values: dict = {}
+        self._mtimes = None
+        self._subscribers: list[Callable[[set[str]], None]] = []
+        self._task = None
+        self.reload()
+
+    def _get_mtimes(self) -> tuple:
+        mtimes = []
+        for path in (self.config_manager.user_config_path, self.config_manager.default_config_path):
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def _parse(self, key: str, value: Any) -> Any:
+        default = self.default_config.get(key)
+        try:
+            if key in INT_FIELDS:
+                return int(float(value if value not in (None, "") else default or 0))
+            if key in FLOAT_FIELDS:
+                return float(value if value not in (None, "") else default or 0)
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid value for setting {key}: {value!r}, using default {default!r}")
+            return self._parse(key, default) if value != default else 0
+        if key in LIST_FIELDS:
+            return _parse_list(value)
+        if isinstance(default, bool):
+            return _parse_bool(value)
+        return value
+
+    def _set(self, user_config: dict) -> set[str]:
+        raw = {**self.default_config, **user_config}
+        values = {key: self._parse(key, value) for key, value in raw.items()}
+        changed = {key for key in raw.keys() | self.raw.keys() if self.values.get(key) != values.get(key)}
+        self.raw, self.values = raw, values
+        return changed
+
+    def _notify(self, changed: set[str]):
+        for callback in list(self._subscribers):
+            try:
+                callback(changed)
+            except Exception as e:
+                logger.error(f"Settings subscriber failed: {e}")
+
+    def reload(self) -> set[str]:
+        """Re-read both settings files, returns the keys whose value changed."""
+        self._mtimes = self._get_mtimes()
+        self.default_config = self.config_manager.load_default_config()
+        return self._set(self.config_manager.load_user_config())
+
+    def apply(self, user_config: dict):
+        """Take over settings changed in memory, e.g. on the settings page, before they are saved."""
+        changed = self._set(user_config)
+        if changed:
+            self._notify(changed)
+
+    def check_files(self):
+        """Reload and notify subscribers if a settings file changed on disk."""
+        if self._get_mtimes() == self._mtimes:
+            return
+        changed = self.reload()
+        if changed:
+            logger.info(f"Settings changed on disk: {', '.join(sorted(changed))}")
+            self._notify(changed)
+
+    async def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.WATCH_INTERVAL)
+            try:
+                if await asyncio.to_thread(self._get_mtimes) != self._mtimes:
+                    self.check_files()
+            except Exception as e:
+                logger.error(f"Settings watch failed: {e}")
+
+    def subscribe(self, callback: Callable[[set[str]], None]):
+        """Call `callback` with the set of changed keys whenever settings change."""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[set[str]], None]):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Typed value of a setting."""
+        value = self.values.get(key)
+        return default if value is None else value
+
+    def get_raw(self, key: str, default: Any = None) -> Any:
+        """Value of a setting as stored in the file."""
+        return self.raw.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.values[key]
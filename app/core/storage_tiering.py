@@ -0,0 +1,93 @@
+import os
+
+from ..models.job_model import JobType
+from ..utils import utils
+from ..utils.logger import logger
+
+
+class StorageTiering:
+    """
+    Maps paths between a fast local staging directory that recorders write to and the archive
+    directory (`live_save_path`) that finished files are moved to.
+    """
+
+    def __init__(
+        self,
+        staging_root: str | None,
+        archive_root: str,
+        staging_space_threshold: float = 0,
+        bandwidth_limit: float = 0,
+    ):
+        """
+        :param staging_root: Staging directory, tiering is disabled when empty.
+        :param archive_root: Archive directory, the regular recording save path.
+        :param staging_space_threshold: Free space in GB below which new recordings bypass staging.
+        :param bandwidth_limit: Maximum archive copy rate in MB/s, 0 for unlimited.
+        """
+        self.staging_root = self._normalize(staging_root) if staging_root else None
+        self.archive_root = self._normalize(archive_root)
+        self.staging_space_threshold = staging_space_threshold
+        self.bandwidth_limit = bandwidth_limit
+
+    @classmethod
+    def from_config(cls, user_config: dict, archive_root: str) -> "StorageTiering":
+        return cls(
+            user_config.get("staging_save_path"),
+            archive_root,
+            float(user_config.get("staging_space_threshold") or 0),
+            float(user_config.get("archive_bandwidth_limit") or 0),
+        )
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return os.path.abspath(path).replace("\\", "/").rstrip("/")
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.staging_root) and self.staging_root != self.archive_root
+
+    @staticmethod
+    def _relocate(path: str, source_root: str, target_root: str) -> str | None:
+        path = os.path.abspath(path).replace("\\", "/")
+        if path != source_root and not path.startswith(source_root + "/"):
+            return None
+        return target_root + path[len(source_root):]
+
+    def to_staging(self, path: str) -> str:
+        """Return the staging equivalent of an archive path, other paths are returned unchanged."""
+        if not self.enabled:
+            return path
+        return self._relocate(path, self.archive_root, self.staging_root) or path
+
+    def to_archive(self, path: str) -> str | None:
+        """Return the archive equivalent of a staging path, or None when the path is not staged."""
+        if not self.enabled:
+            return None
+        return self._relocate(path, self.staging_root, self.archive_root)
+
+    def get_archive_job(self, **params) -> dict:
+        """Return the follow-up job that moves a staged file to the archive."""
+        return {
+            "job_type": JobType.ARCHIVE,
+            "params": {
+                "staging_root": self.staging_root,
+                "archive_root": self.archive_root,
+                "bandwidth_limit": self.bandwidth_limit,
+                **params,
+            },
+        }
+
+    def has_staging_space(self) -> bool:
+        """Whether a new recording may start in staging, so a full staging disk never stalls ffmpeg."""
+        if not self.enabled:
+            return False
+        try:
+            os.makedirs(self.staging_root, exist_ok=True)
+            free_space = utils.check_disk_capacity(self.staging_root)
+        except OSError as e:
+            logger.error(f"Staging directory is not usable: {self.staging_root}, {e}")
+            return False
+        if free_space < self.staging_space_threshold:
+            logger.warning(f"Staging space below {self.staging_space_threshold} GB, recording to the archive directly")
+            return False
+        return True
@@ -1,31 +1,55 @@
 import asyncio
+import functools
+import glob
 import os
-import shutil
-import subprocess
 import time
 from datetime import datetime
 from typing import Any
 
+from ..models.audio_format_model import AudioFormat
+from ..models.exit_reason_model import ExitReason
+from ..models.job_model import JobType
 from ..models.recording_status_model import RecordingStatus
 from ..models.video_quality_model import VideoQuality
 from ..utils import utils
 from ..utils.logger import logger
 from . import ffmpeg_builders, platform_handlers
+from .admission_controller import AdmissionDecision
+from .disk_space_monitor import DegradationStep
 from .platform_handlers import StreamData
+from .recording_supervisor import RecordingSupervisor
+from .segment_watcher import SegmentWatcher
+from .storage_tiering import StorageTiering
+from .stream_probe import probe_stream_codecs
+from .subtitle_writer import TimestampSubtitleWriter
 
 
 class LiveStreamRecorder:
     DEFAULT_SEGMENT_TIME = "1800"
     DEFAULT_SAVE_FORMAT = "mp4"
     DEFAULT_QUALITY = VideoQuality.OD
+    CONCAT_JOB_PRIORITY = -10
 
-    def __init__(self, app, recording, recording_info):
+    def __init__(self, app, recording):
+        """
+        A recorder lives as long as its recording: the record manager reuses it for every live check
+        and closes it when the recording is removed. `prepare` readies it for the next check.
+        """
         self.app = app
         self.settings = app.settings
         self.recording = recording
-        self.recording_info = recording_info
+        self.recording_info = {}
         self.subprocess_start_info = app.subprocess_start_up_info
+        self._created_dirs = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.app.language_manager.add_observer(self)
+        self._ = {}
+        self.load()
 
+    def prepare(self, recording_info: dict):
+        """Take over the settings of a live check and start from a clean session state."""
+        self.recording_info = recording_info
         self.user_config = self.settings.user_config
         self.account_config = self.settings.accounts_config
         self.platform_key = self._get_info("platform_key")
@@ -38,11 +62,35 @@ class LiveStreamRecorder:
         self.segment_time = self._get_info("segment_time", default=self.DEFAULT_SEGMENT_TIME)
         self.quality = self._get_info("quality", default=self.DEFAULT_QUALITY)
         self.save_format = self._get_info("save_format", default=self.DEFAULT_SAVE_FORMAT).lower()
+        self.fragmented_mp4 = bool(self.user_config.get("fragmented_mp4_recording"))
+        if self.fragmented_mp4 and self.save_format == "ts" and self.user_config.get("convert_to_mp4"):
+            # Record straight into fragmented MP4 instead of writing TS and remuxing it afterwards
+            self.save_format = "mp4"
+        self.output_profiles = [
+            i.lower() for i in self._get_info("output_profiles", default=[]) if i.lower() != self.save_format
+        ]
+        self.audio_only = False
+        self.stream_codecs = {}
+        self.audio_strategies = {}
         self.proxy = self.is_use_proxy()
-        os.makedirs(self.output_dir, exist_ok=True)
-        self.app.language_manager.add_observer(self)
-        self._ = {}
-        self.load()
+        self.subtitle_writer = None
+        self.session_id = None
+        self.tiering = StorageTiering.from_config(self.user_config, self.output_dir)
+        self.use_staging = False
+        if self.output_dir not in self._created_dirs:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self._created_dirs.add(self.output_dir)
+
+    def close(self):
+        self.app.language_manager.remove_observer(self)
+
+    @property
+    def is_busy(self) -> bool:
+        """Whether a session is being started, recorded or finished."""
+        return not self._idle.is_set()
+
+    async def wait_until_idle(self):
+        await self._idle.wait()
 
     def load(self):
         language = self.app.language_manager.language
@@ -53,8 +101,7 @@ class LiveStreamRecorder:
         return self.recording_info.get(key, default) or default
 
     def is_use_proxy(self):
-        default_proxy_platform = self.user_config.get("default_platform_with_proxy", "")
-        proxy_list = default_proxy_platform.replace("，", ",").replace(" ", "").split(",")
+        proxy_list = self.app.settings_cache.get("default_platform_with_proxy", [])
         if self.user_config.get("enable_proxy") and self.platform_key in proxy_list:
             self.proxy = self.user_config.get("proxy_address")
             return self.proxy
@@ -75,9 +122,16 @@ class LiveStreamRecorder:
         full_filename = "_".join([i for i in (stream_info.anchor_name, live_title, now) if i])
         return full_filename
 
+    def _place_on_tier(self, path: str) -> str:
+        """Move an output directory to the staging or archive tier chosen for this session."""
+        if self.use_staging:
+            return self.tiering.to_staging(path)
+        return self.tiering.to_archive(path) or path
+
     def _get_output_dir(self, stream_info: StreamData) -> str:
         if self.recording.recording_dir:
-            return self.recording.recording_dir
+            recording_dir = self.app.volume_manager.relocate(self.recording.recording_dir, self.tiering.archive_root)
+            return self._place_on_tier(recording_dir)
 
         now = datetime.today().strftime("%Y-%m-%d_%H-%M-%S")
         output_dir = self.output_dir.rstrip("/").rstrip("\\")
@@ -93,6 +147,7 @@ class LiveStreamRecorder:
                 output_dir = os.path.join(output_dir, f"{live_title}_{stream_info.anchor_name}")
             else:
                 output_dir = os.path.join(output_dir, f"{now[:10]}_{live_title}")
+        output_dir = self._place_on_tier(output_dir)
         os.makedirs(output_dir, exist_ok=True)
         self.recording.recording_dir = output_dir
         self.app.page.run_task(self.app.record_manager.persist_recordings)
@@ -137,39 +192,212 @@ class LiveStreamRecorder:
         self.recording.is_checking = False
         return stream_info
 
+    def _get_extra_output_paths(self, save_path: str) -> list[tuple[str, str]]:
+        """Derive the (format, path) pairs of the additional output profiles from the primary output path."""
+        root = os.path.splitext(save_path)[0].replace("_%03d", "")
+        extra_outputs = []
+        for save_format in self.output_profiles:
+            suffix = "_%03d." + save_format if self.segment_record and save_format != "flv" else "." + save_format
+            extra_outputs.append((save_format, root + suffix))
+        return extra_outputs
+
+    def _get_segment_list_path(self, save_path: str) -> str | None:
+        """Return the CSV list ffmpeg reports closed segments to, or None for unsegmented output."""
+        if "_%03d" not in save_path:
+            return None
+        return save_path.rsplit("_%03d", maxsplit=1)[0] + ".segments.csv"
+
+    def _get_outputs(self, save_path: str) -> list[tuple[str, str]]:
+        outputs = [(self.save_format, save_path)]
+        if not self.audio_only:
+            outputs.extend(self._get_extra_output_paths(save_path))
+        return outputs
+
+    def _get_builder_options(self, record_url: str, save_path: str, segment_start_number: int = 0) -> dict:
+        return {
+            "record_url": record_url,
+            "proxy": self.proxy,
+            "segment_record": self.segment_record,
+            "segment_time": self.segment_time,
+            "segment_start_number": segment_start_number,
+            "segment_list": self._get_segment_list_path(save_path),
+            "fragmented": self.fragmented_mp4,
+            # Live streams carry AAC, an audio-only fallback copies it when the probe could not tell
+            "copy_audio": self.audio_only and "audio" not in self.stream_codecs,
+            "audio_codec": self.stream_codecs.get("audio"),
+            "headers": self.get_headers_params(record_url, self.platform_key),
+        }
+
+    def _build_ffmpeg_command(self, record_url: str, save_path: str, segment_start_number: int = 0) -> list:
+        """
+        Build the ffmpeg command for the primary output and every additional output profile,
+        all outputs share a single input connection.
+        """
+        return ffmpeg_builders.create_multi_output_command(
+            self._get_outputs(save_path), **self._get_builder_options(record_url, save_path, segment_start_number)
+        )
+
+    async def _choose_audio_strategies(self, record_url: str, save_path: str):
+        """
+        Decide per output whether the audio is stream copied or re-encoded. The stream is only probed
+        when an output would re-encode audio that it might be able to copy.
+        """
+        outputs = self._get_outputs(save_path)
+        strategies = ffmpeg_builders.get_audio_strategies(outputs, **self._get_builder_options(record_url, save_path))
+        if self.user_config.get("probe_stream_codecs") and any(i != "copy" for i in strategies.values()):
+            self.stream_codecs = await probe_stream_codecs(
+                record_url,
+                headers=self.get_headers_params(record_url, self.platform_key),
+                proxy=self.proxy,
+                startup_info=self.subprocess_start_info,
+            )
+            strategies = ffmpeg_builders.get_audio_strategies(
+                outputs, **self._get_builder_options(record_url, save_path)
+            )
+        self.audio_strategies = strategies
+        logger.info(f"Stream codecs: {self.stream_codecs or 'not probed'}, audio: {strategies}, {self.live_url}")
+
     async def start_recording(self, stream_info: StreamData):
         """
         Construct ffmpeg recording parameters and start recording
         """
-
-        filename = self._get_filename(stream_info)
-        self.output_dir = self._get_output_dir(stream_info)
-        save_path = self._get_save_path(filename)
-        logger.info(f"Save Path: {save_path}")
-        self.recording.recording_dir = os.path.dirname(save_path)
-        os.makedirs(self.recording.recording_dir, exist_ok=True)
-        record_url = self._get_record_url(stream_info.record_url)
-
-        ffmpeg_builder = ffmpeg_builders.create_builder(
-            self.save_format,
-            record_url=record_url,
-            proxy=self.proxy,
-            segment_record=self.segment_record,
-            segment_time=self.segment_time,
-            full_path=save_path,
-            headers=self.get_headers_params(record_url, self.platform_key)
+        self._idle.clear()
+        started = False
+        try:
+            started = await self._start_recording(stream_info)
+        finally:
+            # Once ffmpeg runs, the session is finished at the end of start_ffmpeg
+            if not started:
+                self._idle.set()
+
+    async def _start_recording(self, stream_info: StreamData) -> bool:
+        admission_controller = self.app.admission_controller
+        rec_id = self.recording.rec_id
+        if not admission_controller.has_capacity():
+            self.recording.status_info = RecordingStatus.QUEUED
+            self.app.page.run_task(self.app.record_card_manager.update_card, self.recording)
+
+        decision = await admission_controller.acquire(
+            rec_id,
+            priority=int(self.recording.priority or 0),
+            is_wanted=lambda: self.recording.recording and self.app.recording_enabled,
         )
-        ffmpeg_command = ffmpeg_builder.build_command()
-        self.app.page.run_task(
-            self.start_ffmpeg,
-            stream_info.anchor_name,
-            self.live_url,
-            stream_info.record_url,
-            ffmpeg_command,
-            self.save_format,
-            self.user_config.get("custom_script_command")
+        if decision == AdmissionDecision.CANCELLED:
+            logger.info(f"Recording left the admission queue: {self.live_url}")
+            if self.recording.monitor_status:
+                self.recording.status_info = RecordingStatus.MONITORING
+            return False
+
+        disk_downgrade = self.app.disk_monitor.should_downgrade(self.tiering.archive_root)
+        if (
+            self.recording.status_info == RecordingStatus.QUEUED
+            or decision == AdmissionDecision.DOWNGRADED
+            or disk_downgrade
+        ):
+            if decision == AdmissionDecision.DOWNGRADED:
+                self.quality = VideoQuality.get_lower_quality(self.quality)
+                logger.warning(f"Host resources are low, recording at {self.quality}: {self.live_url}")
+            if disk_downgrade:
+                self.quality = VideoQuality.get_lower_quality(self.quality)
+                logger.warning(f"Output volume is filling up, recording at {self.quality}: {self.live_url}")
+            stream_info = await self.fetch_stream()
+            if not stream_info or not stream_info.is_live:
+                await admission_controller.release(rec_id)
+                self.app.record_manager.stop_recording(self.recording)
+                self.recording.status_info = RecordingStatus.MONITORING
+                self.app.page.run_task(self.app.record_card_manager.update_card, self.recording)
+                return False
+            self.recording.start_time = datetime.now()
+
+        try:
+            filename = self._get_filename(stream_info)
+            self.use_staging = self.tiering.has_staging_space()
+            self.output_dir = self._get_output_dir(stream_info)
+            save_path = self._get_save_path(filename)
+            logger.info(f"Save Path: {save_path}")
+            self.recording.recording_dir = os.path.dirname(save_path)
+            os.makedirs(self.recording.recording_dir, exist_ok=True)
+            record_url = self._get_record_url(stream_info.record_url)
+            await self._choose_audio_strategies(record_url, save_path)
+
+            ffmpeg_command = self._build_ffmpeg_command(record_url, save_path)
+            self.app.volume_manager.add_writer(self.tiering.archive_root, rec_id)
+            self.app.page.run_task(
+                self.start_ffmpeg,
+                stream_info.anchor_name,
+                self.live_url,
+                stream_info.record_url,
+                ffmpeg_command,
+                self.save_format,
+                self.user_config.get("custom_script_command"),
+                save_path,
+            )
+            return True
+        except Exception:
+            self.app.volume_manager.remove_writer(rec_id)
+            await admission_controller.release(rec_id)
+            raise
+
+    def _take_degradation(self) -> str | None:
+        """Return the degradation step the disk space monitor asked for, if this session can still take it."""
+        step = self.app.disk_monitor.take_degradation_request(self.recording.rec_id)
+        if step == DegradationStep.DOWNGRADE and self.quality == VideoQuality.get_lower_quality(self.quality):
+            return None
+        if step == DegradationStep.AUDIO_ONLY and self.save_format.upper() in AudioFormat.get_formats():
+            return None
+        return step
+
+    async def _apply_degradation(self, step: str, supervisor: RecordingSupervisor):
+        if step == DegradationStep.AUDIO_ONLY:
+            # The source audio is kept as it is, live streams carry AAC which fits an M4A container
+            self.audio_only = True
+            self.save_format = AudioFormat.M4A.lower()
+            supervisor.change_format(self.save_format)
+            if supervisor.segment_record:
+                await self.app.recording_journal.update(self.recording.rec_id, segment_pattern=supervisor.save_path)
+            logger.warning(f"Output volume is filling up, continuing audio only: {self.live_url}")
+        else:
+            self.quality = VideoQuality.get_lower_quality(self.quality)
+            logger.warning(f"Output volume is filling up, continuing at {self.quality}: {self.live_url}")
+
+    def _create_supervisor(self, save_path: str) -> RecordingSupervisor:
+        return RecordingSupervisor(
+            save_path,
+            self.segment_record,
+            stall_timeout=int(self.user_config.get("stall_timeout_seconds") or 60),
+            max_retries=int(self.user_config.get("reconnect_max_retries") or 5),
         )
 
+    @staticmethod
+    async def _terminate_ffmpeg(process: asyncio.subprocess.Process):
+        if process.returncode is not None:
+            return
+
+        if os.name == "nt":
+            if process.stdin:
+                process.stdin.write(b"q")
+                await process.stdin.drain()
+        else:
+            # import signal
+            # process.send_signal(signal.SIGINT)
+            process.terminate()
+
+        if process.stdin:
+            process.stdin.close()
+
+        try:
+            await asyncio.wait_for(process.wait(), timeout=10.0)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+    async def _refresh_record_url(self) -> str | None:
+        """Re-resolve the stream through the platform handler, returns None when the room is no longer live."""
+        stream_info = await self.fetch_stream()
+        if not stream_info or not stream_info.is_live or not stream_info.record_url:
+            return None
+        return stream_info.record_url
+
     async def start_ffmpeg(
         self,
         record_name: str,
@@ -177,61 +405,156 @@ class LiveStreamRecorder:
         record_url: str,
         ffmpeg_command: list,
         save_type: str,
-        script_command: str | None = None
+        script_command: str | None = None,
+        save_file_path: str | None = None,
     ) -> bool:
         """
-        The child process executes ffmpeg for recording
+        The child process executes ffmpeg for recording, and resumes the session into the next
+        segment when ffmpeg exits or stalls while the room is still live
         """
 
+        segment_watcher = supervisor = None
+        exit_reason = None
         try:
-            save_file_path = ffmpeg_command[-1]
-
-            process = await asyncio.create_subprocess_exec(
-                *ffmpeg_command,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                startupinfo=self.subprocess_start_info
+            save_file_path = save_file_path or ffmpeg_command[-1]
+            output_paths = [save_file_path]
+            supervisor = self._create_supervisor(save_file_path)
+            auto_reconnect = self.user_config.get("auto_reconnect_enabled", True)
+            output_path = save_file_path
+            segment_start_number = 0
+            if self.user_config.get("generate_time_subtitle_file"):
+                self.subtitle_writer = TimestampSubtitleWriter(
+                    self.user_config.get("time_subtitle_format", "srt"),
+                    int(self.user_config.get("time_subtitle_interval") or 1),
+                )
+            self.session_id = f"{self.recording.rec_id}-{int(time.time())}"
+            self.app.recording_index.begin_session(
+                self.session_id,
+                self.recording.rec_id,
+                self.recording.streamer_name,
+                self.platform_key,
+                codecs=self.stream_codecs,
+                audio_strategies=self.audio_strategies,
+            )
+            await self.app.recording_journal.begin(
+                self.recording.rec_id,
+                live_url=live_url,
+                save_format=self.save_format,
+                archive_root=self.tiering.archive_root,
+                segment_pattern=save_file_path if "%03d" in save_file_path else None,
+                session_id=self.session_id,
+                fragmented=self.fragmented_mp4,
             )
+            segment_list_path = self._get_segment_list_path(save_file_path)
+            if segment_list_path:
+                segment_watcher = SegmentWatcher(
+                    segment_list_path,
+                    functools.partial(self._on_segment_closed, record_name, save_type, script_command),
+                )
+                segment_watcher.start()
 
-            self.app.add_ffmpeg_process(process)
-            self.recording.status_info = RecordingStatus.RECORDING
-            self.recording.record_url = record_url
-            logger.info(f"Recording in Progress: {live_url}")
-            logger.log("STREAM", f"Recording Stream URL: {record_url}")
             while True:
+                process = await asyncio.create_subprocess_exec(
+                    *ffmpeg_command,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    startupinfo=self.subprocess_start_info
+                )
+
+                self.app.add_ffmpeg_process(process)
+                if self.user_config.get("ffmpeg_low_priority"):
+                    await self.app.process_manager.lower_priority(process)
+                supervisor.on_process_started(output_path)
+                await self.app.recording_journal.update(self.recording.rec_id, pid=process.pid, output_path=output_path)
+                if self.subtitle_writer:
+                    self.subtitle_writer.start(output_path, segment_start_number)
+                self.recording.status_info = RecordingStatus.RECORDING
+                self.recording.record_url = record_url
+                logger.info(f"Recording in Progress: {live_url}")
+                logger.log("STREAM", f"Recording Stream URL: {record_url}")
+                stop_requested = stalled = False
+                degradation = None
+                while True:
+                    stop_requested = not self.recording.recording or not self.app.recording_enabled
+                    if not stop_requested and supervisor.is_stalled() and auto_reconnect:
+                        logger.warning(f"Recording output stalled for {supervisor.stall_timeout}s: {live_url}")
+                        stalled = True
+                    self.app.volume_manager.update_writer_rate(self.recording.rec_id, supervisor.write_rate)
+                    if not degradation:
+                        degradation = self._take_degradation()
+
+                    if stop_requested or stalled or degradation:
+                        if stop_requested:
+                            logger.info(f"Preparing to End Recording: {live_url}")
+                        await self._terminate_ffmpeg(process)
+
+                    if self.subtitle_writer and process.returncode is None:
+                        self.subtitle_writer.tick()
+
+                    if process.returncode is not None:
+                        logger.info(
+                            f"Exit loop recording (normal 0 | abnormal 1): code={process.returncode}, {live_url}"
+                        )
+                        break
+
+                    await asyncio.sleep(1)
+
+                return_code = process.returncode
+                stdout, stderr = await process.communicate()
+                stderr_text = stderr.decode(errors="ignore") if stderr else ""
+                exit_reason = supervisor.classify_exit(
+                    return_code, stderr_text, stalled, stop_requested, self.app.recording_enabled
+                )
+                if degradation and not stop_requested:
+                    exit_reason = ExitReason.DISK_PRESSURE
+                logger.info(f"Recording exit reason: {exit_reason}, {live_url}")
+                # A degraded restart was asked for by the disk space monitor, it does not depend on reconnecting
+                if exit_reason == ExitReason.DISK_PRESSURE:
+                    await self._apply_degradation(degradation, supervisor)
+                    delay = 0
+                elif not auto_reconnect or not supervisor.should_reconnect(exit_reason):
+                    break
+                else:
+                    delay = supervisor.next_retry_delay()
+                if delay is None:
+                    logger.error(f"Reconnect attempts exhausted ({supervisor.max_retries}): {live_url}")
+                    break
+
+                supervisor.begin_gap(exit_reason)
+                self.recording.status_info = RecordingStatus.RECONNECTING
+                logger.warning(f"Recording interrupted ({exit_reason}), reconnecting in {delay}s: {live_url}")
+                await asyncio.sleep(delay)
                 if not self.recording.recording or not self.app.recording_enabled:
-                    logger.info(f"Preparing to End Recording: {live_url}")
-
-                    if os.name == "nt":
-                        if process.stdin:
-                            process.stdin.write(b"q")
-                            await process.stdin.drain()
-                    else:
-                        # import signal
-                        # process.send_signal(signal.SIGINT)
-                        process.terminate()
-
-                    if process.stdin:
-                        process.stdin.close()
-
-                    try:
-                        await asyncio.wait_for(process.wait(), timeout=10.0)
-                    except asyncio.TimeoutError:
-                        process.kill()
-                        await process.wait()
-
-                if process.returncode is not None:
-                    logger.info(f"Exit loop recording (normal 0 | abnormal 1): code={process.returncode}, {live_url}")
                     break
 
-                await asyncio.sleep(1)
+                new_record_url = await self._refresh_record_url()
+                if not new_record_url:
+                    exit_reason = ExitReason.STREAM_ENDED
+                    logger.info(f"Live room is no longer streaming, session finished: {live_url}")
+                    break
 
-            return_code = process.returncode
-            safe_return_code = [0, 255]
-            stdout, stderr = await process.communicate()
-            if return_code not in safe_return_code and stderr:
-                logger.error(f"FFmpeg Stderr Output: {str(stderr.decode()).splitlines()[0]}")
+                record_url = new_record_url
+                next_path, segment_start_number = supervisor.next_output()
+                output_path = next_path
+                if next_path not in output_paths:
+                    output_paths.append(next_path)
+                ffmpeg_command = self._build_ffmpeg_command(
+                    self._get_record_url(record_url), next_path, segment_start_number
+                )
+                logger.info(f"Resuming recording into: {next_path} (segment {segment_start_number})")
+
+            supervisor.write_gap_metadata()
+            self._index_session_files(output_paths, segmented=bool(segment_watcher))
+            if self.subtitle_writer:
+                self.subtitle_writer.close()
+            if segment_watcher:
+                await segment_watcher.stop()
+            safe_return_code = list(RecordingSupervisor.SAFE_RETURN_CODES)
+            is_failed = return_code not in safe_return_code and exit_reason != ExitReason.STREAM_ENDED
+            if is_failed:
+                if stderr_text:
+                    logger.error(f"FFmpeg Stderr Output: {stderr_text.splitlines()[0]}")
                 self.recording.status_info = RecordingStatus.RECORDING_ERROR
                 self.app.record_manager.stop_recording(self.recording)
                 await self.app.record_card_manager.update_card(self.recording)
@@ -240,7 +563,7 @@ class LiveStreamRecorder:
                     record_name + " " + self._["record_stream_error"], duration=2000
                 )
 
-            if return_code in safe_return_code:
+            else:
                 if self.recording.monitor_status:
                     self.recording.status_info = RecordingStatus.MONITORING
                     display_title = self.recording.title
@@ -263,80 +586,178 @@ class LiveStreamRecorder:
                 else:
                     self.recording.status_info = RecordingStatus.NOT_RECORDING_SPACE
 
-                if self.user_config.get("convert_to_mp4") and self.save_format == "ts":
-                    if self.segment_record:
-                        file_paths = utils.get_file_paths(os.path.dirname(save_file_path))
-                        prefix = os.path.basename(save_file_path).rsplit("_", maxsplit=1)[0]
-                        for path in file_paths:
-                            if prefix in path:
-                                self.app.page.run_task(self.converts_mp4, path, self.user_config["delete_original"])
-                    else:
-                        self.app.page.run_task(self.converts_mp4, save_file_path, self.user_config["delete_original"])
-
-                if self.user_config.get("execute_custom_script") and script_command:
-                    logger.info("Prepare a direct script in the background")
-                    self.app.page.run_task(
-                        self.custom_script_execute,
-                        script_command,
-                        record_name,
-                        save_file_path,
-                        save_type,
-                        self.segment_record,
-                        self.user_config.get("convert_to_mp4")
-                    )
-                    logger.success("Successfully added script execution")
+                # Segmented sessions are post-processed segment by segment while recording
+                if segment_watcher and self.user_config.get("concat_segments_after_recording"):
+                    session_root = segment_watcher.segment_list_path.rsplit(".segments.csv", maxsplit=1)[0]
+                    # A session that went audio only mid-way is joined into one file per container
+                    segments_by_format = {}
+                    for path in segment_watcher.closed_segments:
+                        segments_by_format.setdefault(os.path.splitext(path)[1], []).append(path)
+                    for ext, segment_paths in segments_by_format.items():
+                        self.app.page.run_task(self.queue_segment_concat, segment_paths, session_root + ext)
+                elif not segment_watcher:
+                    for path in output_paths:
+                        self.app.page.run_task(self.queue_post_processing, path)
+
+                    if self.user_config.get("execute_custom_script") and script_command:
+                        logger.info("Prepare a direct script in the background")
+                        self.app.page.run_task(
+                            self.custom_script_execute,
+                            script_command,
+                            record_name,
+                            save_file_path,
+                            save_type,
+                            self.segment_record,
+                            self.user_config.get("convert_to_mp4")
+                        )
+                        logger.success("Successfully added script execution")
+                if self.use_staging and self.output_profiles:
+                    self.app.page.run_task(self.queue_extra_outputs_archive, output_paths)
 
         except Exception as e:
             logger.error(f"An error occurred during the subprocess execution: {e}")
             return False
         finally:
             self.recording.record_url = None
+            await self.app.recording_journal.end(self.recording.rec_id)
+            self.app.volume_manager.remove_writer(self.recording.rec_id)
+            self.app.disk_monitor.forget(self.recording.rec_id)
+            await self.app.admission_controller.release(self.recording.rec_id)
+            if self.subtitle_writer:
+                self.subtitle_writer.close()
+            if segment_watcher:
+                await segment_watcher.stop()
+            try:
+                self.app.recording_index.end_session(
+                    self.session_id, exit_reason, supervisor.reconnect_count if supervisor else 0
+                )
+            finally:
+                self._idle.set()
 
         return True
 
-    async def converts_mp4(self, converts_file_path: str, is_original_delete: bool = True) -> None:
-        converts_success = False
-        save_path = None
-        try:
-            converts_file_path = converts_file_path.replace("\\", "/")
-            if os.path.exists(converts_file_path) and os.path.getsize(converts_file_path) > 0:
-                save_path = converts_file_path.rsplit(".", maxsplit=1)[0] + ".mp4"
-                _output = subprocess.check_output(
-                    [
-                        "ffmpeg",
-                        "-i", converts_file_path,
-                        "-c:v", "copy",
-                        "-c:a", "copy",
-                        "-f", "mp4",
-                        save_path
-                    ],
-                    stderr=subprocess.STDOUT,
-                    startupinfo=self.subprocess_start_info,
-                )
-
-                converts_success = True
-                logger.info(f"Video transcoding completed: {save_path}")
+    async def _on_segment_closed(
+        self,
+        record_name: str,
+        save_type: str,
+        script_command: str | None,
+        segment_path: str,
+        segment_duration: float | None = None,
+    ):
+        """Post-process a finished segment while the recording continues."""
+        if self.subtitle_writer:
+            self.subtitle_writer.next_segment(segment_path, segment_duration)
+        self.app.recording_index.add(segment_path, self.session_id)
+
+        if not self.user_config.get("concat_segments_after_recording"):
+            await self.queue_post_processing(segment_path)
+
+        if self.user_config.get("execute_custom_script") and script_command:
+            self.app.page.run_task(
+                self.custom_script_execute,
+                script_command,
+                record_name,
+                segment_path,
+                save_type,
+                self.segment_record,
+                self.user_config.get("convert_to_mp4")
+            )
 
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Video transcoding failed! Error message: {e.output.decode()}")
+    def _get_archive_followups(self, save_format: str) -> list[dict]:
+        """
+        Jobs that run on every finished recording file once it has its final name,
+        chained so that each job only starts after the previous one rewrote the file.
+        """
+        followups = []
+        if (
+            self.fragmented_mp4
+            and save_format in ("mp4", "mov", "m4a")
+            and self.user_config.get("faststart_after_recording")
+        ):
+            followups.append({"job_type": JobType.FASTSTART, "params": {}})
+        if self.tiering.enabled:
+            followups.append(self.tiering.get_archive_job(rec_id=self.recording.rec_id))
+        if self.user_config.get("generate_checksum"):
+            followups.append({"job_type": JobType.CHECKSUM, "params": {}})
+        if self.user_config.get("upload_enabled") and self.user_config.get("upload_url"):
+            followups.append({"job_type": JobType.UPLOAD, "params": {"url": self.user_config["upload_url"]}})
+
+        chain = []
+        for followup in reversed(followups):
+            followup["followups"] = chain
+            chain = [followup]
+        return chain
+
+    def _get_post_processing_chain(self, file_path: str) -> list[dict]:
+        """Jobs that turn a finished TS/segment/session file into its final archived form."""
+        save_format = os.path.splitext(file_path)[1][1:].lower()
+        if self.user_config.get("convert_to_mp4") and save_format == "ts":
+            return [
+                {
+                    "job_type": JobType.REMUX,
+                    "params": {"delete_original": self.user_config["delete_original"]},
+                    "followups": self._get_archive_followups(save_format),
+                }
+            ]
+        return self._get_archive_followups(save_format)
+
+    async def queue_post_processing(self, file_path: str) -> None:
+        """Hand a finished recording file to the post-processing job queue."""
+        for job in self._get_post_processing_chain(file_path):
+            await self.app.job_queue.submit(
+                job["job_type"],
+                {**job["params"], "path": file_path.replace("\\", "/")},
+                priority=int(self.recording.priority or 0),
+                followups=job["followups"],
+            )
 
-        try:
-            if converts_success:
-                if is_original_delete:
-                    time.sleep(1)
-                    if os.path.exists(converts_file_path):
-                        os.remove(converts_file_path)
-                    logger.info(f"Delete Original File: {converts_file_path}")
-                else:
-                    converts_dir = f"{os.path.dirname(save_path)}/original"
-                    os.makedirs(converts_dir, exist_ok=True)
-                    shutil.move(converts_file_path, converts_dir)
-                    logger.info(f"Move Transcoding Files: {converts_file_path}")
+    async def queue_segment_concat(self, segment_paths: list[str], session_path: str) -> None:
+        """
+        Join the segments of a finished session into one file, then post-process that file.
+        Runs below every other job so it never competes with per-segment work of live rooms.
+        """
+        if len(segment_paths) < 2:
+            for path in segment_paths:
+                await self.queue_post_processing(path)
+            return
+
+        delete_parts = bool(self.user_config.get("delete_segments_after_concat"))
+        followups = self._get_post_processing_chain(session_path)
+        if self.tiering.enabled and not delete_parts:
+            # Kept segments must leave staging as well, but only once the join has read them
+            followups.append(self.tiering.get_archive_job(paths=segment_paths))
+
+        await self.app.job_queue.submit(
+            JobType.CONCAT,
+            {"paths": segment_paths, "path": session_path, "delete_parts": delete_parts},
+            priority=self.CONCAT_JOB_PRIORITY,
+            followups=followups,
+        )
 
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error occurred during conversion: {e}")
-        except Exception as e:
-            logger.error(f"An unknown error occurred: {e}")
+    def _get_extra_output_files(self, output_paths: list[str]) -> list[str]:
+        """Files written by the additional output profiles of a session."""
+        extra_files = []
+        for path in output_paths:
+            for _, extra_path in self._get_extra_output_paths(path):
+                if "%03d" in extra_path:
+                    prefix, suffix = extra_path.split("%03d", maxsplit=1)
+                    extra_files.extend(sorted(glob.glob(glob.escape(prefix) + "*" + glob.escape(suffix))))
+                elif os.path.exists(extra_path):
+                    extra_files.append(extra_path)
+        return extra_files
+
+    def _index_session_files(self, output_paths: list[str], segmented: bool):
+        """Register the files of a finished session, segments are registered as they are closed."""
+        files = [] if segmented else list(output_paths)
+        for path in files + self._get_extra_output_files(output_paths):
+            self.app.recording_index.add(path, self.session_id)
+
+    async def queue_extra_outputs_archive(self, output_paths: list[str]) -> None:
+        """Move the files of the additional output profiles out of staging once the session has ended."""
+        extra_files = self._get_extra_output_files(output_paths)
+        if extra_files:
+            job = self.tiering.get_archive_job(paths=extra_files)
+            await self.app.job_queue.submit(job["job_type"], {**job["params"], "path": extra_files[-1]})
 
     async def custom_script_execute(
         self,
@@ -363,38 +784,11 @@ class LiveStreamRecorder:
                 f"converts_to_mp4: {converts_to_mp4}"
             ]
         script_command = script_command.strip() + " " + " ".join(params)
-        self.app.page.run_task(self.run_script_async, script_command)
-        logger.success("Script command execution completed!")
-
-    async def run_script_async(self, command: str) -> None:
-        try:
-            process = await asyncio.create_subprocess_exec(
-                *command.split(),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                startupinfo=self.subprocess_start_info,
-                text=True
-            )
-
-            stdout, stderr = await process.communicate()
-
-            if stdout:
-                logger.info(stdout.splitlines()[0])
-            if stderr:
-                logger.error(stderr.splitlines()[0])
-
-            if process.returncode != 0:
-                logger.info(f"Custom Script process exited with return code {process.returncode}")
-
-        except PermissionError:
-            logger.error(
-                "Script has no execution permission!, If it is a Linux environment, "
-                "please first execute: chmod+x your_script.sh to grant script executable permission"
-            )
-        except OSError:
-            logger.error("Please add `#!/bin/bash` at the beginning of your bash script file.")
-        except Exception as e:
-            logger.error(f"An error occurred: {e}")
+        # Scripts may have side effects, so a failed run is reported instead of repeated
+        await self.app.job_queue.submit(
+            JobType.SCRIPT, {"command": script_command, "path": save_file_path}, max_retries=0
+        )
+        logger.success("Successfully added script execution")
 
     @staticmethod
     def get_headers_params(live_url, platform_key):
@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+from ..utils.logger import logger
+from .ffmpeg_builders.base import FFMPEG_USER_AGENT
+
+PROBE_TIMEOUT = 15
+# Enough for the stream headers of a live stream, far below what the recording ffmpeg analyzes
+PROBE_SIZE = "1000000"
+PROBE_DURATION = "2000000"
+
+
+async def probe_stream_codecs(
+    record_url: str,
+    headers: str | None = None,
+    proxy: str | None = None,
+    startup_info=None,
+    timeout: float = PROBE_TIMEOUT,
+) -> dict[str, str]:
+    """
+    Read the first bytes of a live stream and return the codec of its first video and audio stream,
+    e.g. {'video': 'h264', 'audio': 'aac'}. Streams ffprobe cannot identify in time are left out.
+    """
+    command = [
+        "ffprobe",
+        "-v", "error",
+        "-user_agent", FFMPEG_USER_AGENT,
+        "-probesize", PROBE_SIZE,
+        "-analyzeduration", PROBE_DURATION,
+        "-show_entries", "stream=codec_type,codec_name",
+        "-of", "json",
+    ]
+    if headers:
+        command.extend(["-headers", headers])
+    if proxy:
+        command.extend(["-http_proxy", proxy])
+    command.append(record_url)
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            startupinfo=startup_info,
+        )
+    except OSError as e:
+        logger.warning(f"Stream probe unavailable: {e}")
+        return {}
+
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        logger.warning(f"Stream probe timed out after {timeout}s")
+        return {}
+
+    try:
+        streams = json.loads(stdout.decode(errors="ignore") or "{}").get("streams", [])
+    except json.JSONDecodeError:
+        return {}
+
+    codecs = {}
+    for stream in streams:
+        codec_type, codec_name = stream.get("codec_type"), stream.get("codec_name")
+        if codec_type in ("video", "audio") and codec_name and codec_type not in codecs:
+            codecs[codec_type] = codec_name
+    return codecs
@@ -0,0 +1,133 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+from ..utils.logger import logger
+
+
+class TimestampSubtitleWriter:
+    """
+    Appends wall-clock timestamp cues to a subtitle sidecar while a recording is running.
+
+    Each call to `tick` writes at most one small cue, so the cost does not depend on the length
+    of the stream. Segmented recordings get one sidecar per segment, with cue times relative
+    to the start of that segment.
+    """
+
+    SUBTITLE_FORMATS = ("srt", "vtt")
+
+    def __init__(self, subtitle_format: str = "srt", interval: int = 1):
+        """
+        :param subtitle_format: Either 'srt' or 'vtt'.
+        :param interval: Seconds covered by each cue.
+        """
+        self.subtitle_format = subtitle_format if subtitle_format in self.SUBTITLE_FORMATS else "srt"
+        self.interval = max(1, interval)
+        self.subtitle_path = None
+        self._file = None
+        self._segment_pattern = None
+        self._segment_index = 0
+        self._cue_index = 0
+        self._base_time = 0.0
+        self._cue_start = 0.0
+
+    def _get_subtitle_path(self, video_path: str) -> str:
+        return os.path.splitext(video_path)[0] + "." + self.subtitle_format
+
+    def _open(self, video_path: str, offset: float = 0.0):
+        self.close()
+        self.subtitle_path = self._get_subtitle_path(video_path)
+        self._cue_index = 0
+        self._base_time = time.monotonic() - offset
+        self._cue_start = 0.0
+        try:
+            self._file = open(self.subtitle_path, "w", encoding="utf-8")  # noqa: SIM115
+            if self.subtitle_format == "vtt":
+                self._file.write("WEBVTT\n\n")
+        except OSError as e:
+            self._file = None
+            logger.error(f"Failed to create timestamp subtitle: {self.subtitle_path}, {e}")
+
+    def start(self, video_path: str, segment_start_number: int = 0):
+        """
+        Start writing for a new ffmpeg output.
+
+        :param video_path: Output path of ffmpeg, may contain a `%03d` segment pattern.
+        :param segment_start_number: Index of the first segment written by this ffmpeg run.
+        """
+        if "%03d" in video_path:
+            self._segment_pattern = video_path
+            self._segment_index = segment_start_number
+            self._open(video_path % segment_start_number)
+        else:
+            self._segment_pattern = None
+            self._open(video_path)
+
+    def _get_segment_number(self, segment_path: str) -> int | None:
+        prefix, _, suffix = os.path.basename(self._segment_pattern).partition("%03d")
+        name = os.path.basename(segment_path)
+        number = name[len(prefix):len(name) - len(suffix)]
+        if name.startswith(prefix) and name.endswith(suffix) and number.isdigit():
+            return int(number)
+        return None
+
+    def next_segment(self, segment_path: str, segment_duration: float | None = None):
+        """
+        Switch to the sidecar of the segment following the one ffmpeg has closed.
+
+        :param segment_path: Path of the closed segment, as listed in ffmpeg's segment list.
+        :param segment_duration: Real duration of the closed segment, used to correct the delay
+            between the segment boundary and the moment it was reported.
+        """
+        if not self._segment_pattern or not self._file:
+            return
+        closed_number = self._get_segment_number(segment_path)
+        # Segments closed before a restart can be reported after the new run has started
+        if closed_number is None or closed_number < self._segment_index:
+            return
+        elapsed = time.monotonic() - self._base_time
+        offset = max(0.0, elapsed - segment_duration) if segment_duration else 0.0
+        self._segment_index = closed_number + 1
+        self._open(self._segment_pattern % self._segment_index, offset)
+
+    def _format_time(self, seconds: float) -> str:
+        hours, remainder = divmod(int(seconds * 1000), 3_600_000)
+        minutes, remainder = divmod(remainder, 60_000)
+        secs, millis = divmod(remainder, 1000)
+        separator = "," if self.subtitle_format == "srt" else "."
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+    def tick(self):
+        """Append the cue for the elapsed interval, does nothing until the interval has passed."""
+        if not self._file:
+            return
+        now = time.monotonic()
+        cue_end = now - self._base_time
+        if cue_end - self._cue_start < self.interval:
+            return
+
+        wall_clock = datetime.now() - timedelta(seconds=cue_end - self._cue_start)
+        self._cue_index += 1
+        lines = [
+            f"{self._format_time(self._cue_start)} --> {self._format_time(cue_end)}",
+            wall_clock.strftime("%Y-%m-%d %H:%M:%S"),
+            "",
+            "",
+        ]
+        if self.subtitle_format == "srt":
+            lines.insert(0, str(self._cue_index))
+        try:
+            self._file.write("\n".join(lines))
+            self._file.flush()
+        except OSError as e:
+            logger.error(f"Failed to write timestamp subtitle: {self.subtitle_path}, {e}")
+            self.close()
+        self._cue_start = cue_end
+
+    def close(self):
+        if self._file:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
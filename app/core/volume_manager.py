@@ -0,0 +1,132 @@
+import os
+import shutil
+import time
+from collections import deque
+
+from ..utils.logger import logger
+
+
+class Volume:
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path).replace("\\", "/").rstrip("/")
+        self.writers: dict[str, float] = {}
+        self.free_gb: float | None = None
+        self.samples: deque[tuple[float, int]] = deque()
+
+    @property
+    def write_rate_mb(self) -> float:
+        """Recent write throughput in MB/s, estimated from the shrinking free space of the volume."""
+        if len(self.samples) < 2:
+            return 0.0
+        (first_time, first_free), (last_time, last_free) = self.samples[0], self.samples[-1]
+        if last_time <= first_time:
+            return 0.0
+        return max(0, first_free - last_free) / (last_time - first_time) / 1024**2
+
+    def contains(self, path: str) -> bool:
+        path = os.path.abspath(path).replace("\\", "/")
+        return path == self.path or path.startswith(self.path + "/")
+
+
+class VolumeManager:
+    """
+    Places new recordings on one of several output volumes.
+
+    Free space is tracked per volume, so a full disk only takes itself out of the rotation.
+    Among the volumes with enough space, the one with the fewest active writers and the lowest
+    recent write throughput is preferred, with free space breaking the remaining ties.
+    """
+
+    REFRESH_INTERVAL = 10
+    THROUGHPUT_WINDOW = 120
+    # A writer or 10 MB/s of throughput weighs as much as halving the free space of a volume
+    WRITE_RATE_WEIGHT_MB = 10
+
+    def __init__(self, paths: list[str] | None = None, space_threshold: float = 0):
+        """
+        :param paths: Output directories, the first one is the primary volume.
+        :param space_threshold: Free space in GB a volume needs to receive new recordings.
+        """
+        self.volumes: list[Volume] = []
+        self.space_threshold = space_threshold
+        self._refresh_time = 0.0
+        self.configure(paths or [], space_threshold)
+
+    def configure(self, paths: list[str], space_threshold: float):
+        """Replace the volume list, keeping the writers and samples of volumes that stay configured."""
+        existing = {volume.path: volume for volume in self.volumes}
+        volumes = []
+        for path in paths:
+            volume = Volume(path)
+            if volume.path not in {i.path for i in volumes}:
+                volumes.append(existing.get(volume.path, volume))
+        self.volumes = volumes
+        self.space_threshold = space_threshold
+        self._refresh_time = 0.0
+
+    def refresh(self, force: bool = False):
+        """Sample the free space of every volume, at most once per REFRESH_INTERVAL unless forced."""
+        now = time.monotonic()
+        if not force and now - self._refresh_time < self.REFRESH_INTERVAL:
+            return
+        self._refresh_time = now
+        for volume in self.volumes:
+            try:
+                os.makedirs(volume.path, exist_ok=True)
+                free = shutil.disk_usage(volume.path).free
+            except OSError as e:
+                logger.error(f"Output volume is not usable: {volume.path}, {e}")
+                volume.free_gb = None
+                volume.samples.clear()
+                continue
+            volume.free_gb = free / 1024**3
+            volume.samples.append((now, free))
+            while volume.samples and now - volume.samples[0][0] > self.THROUGHPUT_WINDOW:
+                volume.samples.popleft()
+
+    def available_volumes(self) -> list[Volume]:
+        """Volumes with enough space, from the samples taken by the disk space monitor."""
+        if not self._refresh_time:
+            self.refresh(force=True)
+        return [
+            volume for volume in self.volumes if volume.free_gb is not None and volume.free_gb >= self.space_threshold
+        ]
+
+    def has_space(self) -> bool:
+        return bool(self.available_volumes())
+
+    def _score(self, volume: Volume) -> float:
+        load = 1 + len(volume.writers) + volume.write_rate_mb / self.WRITE_RATE_WEIGHT_MB
+        return (volume.free_gb - self.space_threshold) / load
+
+    def select(self) -> str | None:
+        """Return the volume a new recording should be written to, or None when every volume is full."""
+        volumes = self.available_volumes()
+        if not volumes:
+            return None
+        return max(volumes, key=self._score).path
+
+    def find(self, path: str) -> Volume | None:
+        return next((volume for volume in self.volumes if volume.contains(path)), None)
+
+    def relocate(self, path: str, volume_path: str) -> str:
+        """Move a directory below one volume to the same relative location on another volume."""
+        source = self.find(path)
+        target = self.find(volume_path)
+        if not source or not target or source is target:
+            return path
+        return target.path + os.path.abspath(path).replace("\\", "/")[len(source.path):]
+
+    def add_writer(self, volume_path: str, rec_id: str):
+        if volume := self.find(volume_path):
+            volume.writers[rec_id] = 0.0
+
+    def update_writer_rate(self, rec_id: str, bytes_per_second: float):
+        """Report the measured output bitrate of an active recording."""
+        for volume in self.volumes:
+            if rec_id in volume.writers:
+                volume.writers[rec_id] = bytes_per_second
+
+    def remove_writer(self, rec_id: str):
+        for volume in self.volumes:
+            volume.writers.pop(rec_id, None)
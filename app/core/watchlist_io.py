@@ -0,0 +1,105 @@
+import json
+import os
+from collections.abc import Callable, Iterable, Iterator
+
+from ..utils.logger import logger
+from .platform_handlers import get_platform_info
+from .recording_registry import get_url_key
+
+QUALITY_CODES = {"0": "OD", "1": "UHD", "2": "HD", "3": "SD", "4": "LD"}
+QUALITIES = ("OD", "UHD", "HD", "SD", "LD")
+WATCHLIST_EXTENSIONS = ("json", "jsonl", "txt", "csv")
+
+
+def parse_watchlist_line(line: str) -> dict | None:
+    """
+    Parse one line of a watchlist, either a recording saved as a JSON object or the batch input
+    format `url`, `quality,url`, `url,name` or `quality,url,name`. Returns None for other lines.
+    """
+    line = line.strip().lstrip("﻿")
+    if line.startswith("{"):
+        try:
+            entry = json.loads(line.rstrip(","))
+        except json.JSONDecodeError:
+            return None
+        return entry if isinstance(entry, dict) and entry.get("url") else None
+
+    if "http" not in line:
+        return None
+    fields = [i.strip() for i in line.replace("，", ",").split(",") if i.strip()]
+    quality = streamer_name = None
+    if len(fields) >= 3:
+        quality, url, streamer_name = fields[:3]
+    elif len(fields) == 2 and fields[1].startswith("http"):
+        quality, url = fields
+    elif len(fields) == 2:
+        url, streamer_name = fields
+    else:
+        url = fields[0]
+    quality = QUALITY_CODES.get(quality, quality if quality in QUALITIES else "OD")
+    return {"url": url, "quality": quality, "streamer_name": streamer_name}
+
+
+def iter_watchlist_lines(lines: Iterable[str]) -> Iterator[dict]:
+    for line in lines:
+        entry = parse_watchlist_line(line)
+        if entry:
+            yield entry
+
+
+def iter_watchlist_file(path: str) -> Iterator[dict]:
+    """Read a watchlist line by line, a JSON array of recordings such as a list backup is loaded whole."""
+    with open(path, encoding="utf-8-sig") as file:
+        first_char = file.read(1)
+        while first_char.isspace():
+            first_char = file.read(1)
+        if first_char == "[":
+            file.seek(0)
+            try:
+                entries = json.load(file)
+            except json.JSONDecodeError as e:
+                logger.error(f"Invalid watchlist file: {path}, {e}")
+                return
+            yield from (entry for entry in entries if isinstance(entry, dict) and entry.get("url"))
+            return
+        file.seek(0)
+        yield from iter_watchlist_lines(file)
+
+
+def select_new_entries(
+    entries: Iterable[dict], is_known: Callable[[str], bool], get_key: Callable[[str], str] = get_url_key
+) -> tuple[list[dict], dict]:
+    """
+    Drop entries of unsupported platforms, rooms that `is_known` reports as already watched and
+    repeated rooms, comparing URLs by their room key. Returns the entries to add and the counts.
+    """
+    selected, seen = [], set()
+    counts = {"added": 0, "duplicates": 0, "unsupported": 0}
+    for entry in entries:
+        url = str(entry["url"]).strip()
+        if not get_platform_info(url)[0]:
+            counts["unsupported"] += 1
+            continue
+        url_key = get_key(url)
+        if url_key in seen or is_known(url):
+            counts["duplicates"] += 1
+            continue
+        seen.add(url_key)
+        selected.append({**entry, "url": url})
+    counts["added"] = len(selected)
+    return selected, counts
+
+
+def write_watchlist(entries: Iterable[dict], path: str) -> int:
+    """Write recordings as JSON lines without building the whole file in memory, returns how many."""
+    count = 0
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        for entry in entries:
+            file.write(json.dumps(entry, ensure_ascii=False))
+            file.write("\n")
+            count += 1
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    return count
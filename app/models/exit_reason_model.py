@@ -0,0 +1,17 @@
+class ExitReason:
+    USER_STOPPED = "USER_STOPPED"
+    RECORDING_DISABLED = "RECORDING_DISABLED"
+    STREAM_ENDED = "STREAM_ENDED"
+    NETWORK_ERROR = "NETWORK_ERROR"
+    URL_EXPIRED = "URL_EXPIRED"
+    STALLED = "STALLED"
+    FFMPEG_ERROR = "FFMPEG_ERROR"
+    DISK_PRESSURE = "DISK_PRESSURE"
+    INTERRUPTED = "INTERRUPTED"  # The application exited while recording
+
+    @classmethod
+    def get_reasons(cls):
+        """Get all properties of the ExitReason class"""
+        attributes = cls.__dict__
+        exit_reasons = [value for name, value in attributes.items() if name.isupper()]
+        return exit_reasons
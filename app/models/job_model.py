@@ -0,0 +1,93 @@
+import time
+import uuid
+
+
+class JobType:
+    REMUX = "REMUX"
+    SCRIPT = "SCRIPT"
+    CHECKSUM = "CHECKSUM"
+    UPLOAD = "UPLOAD"
+    FASTSTART = "FASTSTART"
+    CONCAT = "CONCAT"
+    REPAIR = "REPAIR"
+    ARCHIVE = "ARCHIVE"
+
+    @classmethod
+    def get_types(cls):
+        """Get all properties of the JobType class"""
+        attributes = cls.__dict__
+        job_types = [value for name, value in attributes.items() if name.isupper()]
+        return job_types
+
+
+class JobStatus:
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class Job:
+    def __init__(
+        self,
+        job_type,
+        params,
+        priority=0,
+        max_retries=3,
+        job_id=None,
+        status=JobStatus.PENDING,
+        attempts=0,
+        followups=None,
+        created_at=None,
+        error=None,
+    ):
+        """
+        Initialize a post-processing job.
+
+        :param job_type: One of the JobType values.
+        :param params: Handler specific parameters, e.g. {'path': '/videos/a.ts'}.
+        :param priority: Jobs with higher values are picked up first.
+        :param max_retries: Number of retries after the first failed attempt.
+        :param followups: Jobs submitted with the output path of this job once it succeeds.
+        """
+        self.job_id = job_id or str(uuid.uuid4())
+        self.job_type = job_type
+        self.params = params
+        self.priority = priority
+        self.max_retries = max_retries
+        self.status = status
+        self.attempts = attempts
+        self.followups = followups or []
+        self.created_at = created_at or time.time()
+        self.error = error
+        self.progress = 0.0
+        self.result = None
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "job_type": self.job_type,
+            "params": self.params,
+            "priority": self.priority,
+            "max_retries": self.max_retries,
+            "status": self.status,
+            "attempts": self.attempts,
+            "followups": self.followups,
+            "created_at": self.created_at,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["job_type"],
+            data.get("params", {}),
+            data.get("priority", 0),
+            data.get("max_retries", 3),
+            data.get("job_id"),
+            data.get("status", JobStatus.PENDING),
+            data.get("attempts", 0),
+            data.get("followups"),
+            data.get("created_at"),
+            data.get("error"),
+        )
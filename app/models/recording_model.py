@@ -1,7 +1,168 @@
 from datetime import timedelta
 
+PERSISTENT_FIELDS = (
+    "rec_id",
+    "url",
+    "streamer_name",
+    "record_format",
+    "quality",
+    "segment_record",
+    "segment_time",
+    "monitor_status",
+    "scheduled_recording",
+    "scheduled_start_time",
+    "monitor_hours",
+    "recording_dir",
+    "priority",
+    "output_profiles",
+)
+
+
+class RecordingState:
+    """Runtime state of a recording, shown in the UI; only `last_duration` is saved."""
+
+    __slots__ = (
+        "title",
+        "display_title",
+        "speed",
+        "is_live",
+        "recording",
+        "start_time",
+        "cumulative_duration",
+        "last_duration",
+        "last_duration_str",
+        "selected",
+        "is_checking",
+        "status_info",
+        "live_title",
+        "detection_time",
+        "loop_time_seconds",
+        "use_proxy",
+        "record_url",
+        "scheduled_time_range",
+    )
+
+    def __init__(self, title: str):
+        self.title = title
+        self.display_title = title
+        self.speed = "X KB/s"
+        self.is_live = False
+        self.recording = False  # Record status
+        self.start_time = None
+        self.cumulative_duration = timedelta()  # Accumulated recording time
+        self.last_duration = timedelta()  # Save the total time of the last recording
+        self.last_duration_str = None
+        self.selected = False
+        self.is_checking = False
+        self.status_info = None
+        self.live_title = None
+        self.detection_time = None
+        self.loop_time_seconds = None
+        self.use_proxy = None
+        self.record_url = None
+        self.scheduled_time_range = None
+
+
+_UNSET = object()
+
+
+class _PersistentField:
+    """A saved attribute of a recording, assigning a different value marks it dirty."""
+
+    __slots__ = ("name", "slot")
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.slot = f"_{name}"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(instance, self.slot)
+
+    def __set__(self, instance, value):
+        if getattr(instance, self.slot, _UNSET) != value:
+            object.__setattr__(instance, self.slot, value)
+            instance._dirty.add(self.name)
+
+
+class _StateField:
+    """A runtime attribute of a recording, stored on its `state`."""
+
+    __slots__ = ("name",)
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(instance.state, self.name)
+
+    def __set__(self, instance, value):
+        setattr(instance.state, self.name, value)
+
+
+class _SavedStateField(_StateField):
+    """A runtime attribute that is also saved, assigning a different value marks it dirty."""
+
+    __slots__ = ()
+
+    def __set__(self, instance, value):
+        if getattr(instance.state, self.name) != value:
+            setattr(instance.state, self.name, value)
+            instance._dirty.add(self.name)
+
 
 class Recording:
+    """
+    A monitored live room.
+
+    The saved settings live in slots of the recording itself, the runtime state in a separate
+    `RecordingState`; both are reachable as plain attributes. Assignments that change a saved
+    setting, or the saved `last_duration`, are tracked in `dirty_fields` until the recording list is saved.
+    """
+
+    __slots__ = tuple(f"_{name}" for name in PERSISTENT_FIELDS) + ("state", "_dirty")
+
+    PERSISTENT_KEYS = frozenset(PERSISTENT_FIELDS)
+    STATE_KEYS = frozenset(RecordingState.__slots__)
+    SAVED_STATE_KEYS = frozenset({"last_duration"})
+
+    rec_id = _PersistentField()
+    url = _PersistentField()
+    streamer_name = _PersistentField()
+    record_format = _PersistentField()
+    quality = _PersistentField()
+    segment_record = _PersistentField()
+    segment_time = _PersistentField()
+    monitor_status = _PersistentField()
+    scheduled_recording = _PersistentField()
+    scheduled_start_time = _PersistentField()
+    monitor_hours = _PersistentField()
+    recording_dir = _PersistentField()
+    priority = _PersistentField()
+    output_profiles = _PersistentField()
+
+    title = _StateField()
+    display_title = _StateField()
+    speed = _StateField()
+    is_live = _StateField()
+    recording = _StateField()
+    start_time = _StateField()
+    cumulative_duration = _StateField()
+    last_duration = _SavedStateField()
+    last_duration_str = _StateField()
+    selected = _StateField()
+    is_checking = _StateField()
+    status_info = _StateField()
+    live_title = _StateField()
+    detection_time = _StateField()
+    loop_time_seconds = _StateField()
+    use_proxy = _StateField()
+    record_url = _StateField()
+    scheduled_time_range = _StateField()
+
     def __init__(
         self,
         rec_id,
@@ -16,6 +177,8 @@ class Recording:
         scheduled_start_time,
         monitor_hours,
         recording_dir,
+        priority=0,
+        output_profiles=None,
     ):
         """
         Initialize a recording object.
@@ -32,8 +195,11 @@ class Recording:
         :param scheduled_start_time: Scheduled start time for recording (string format like '18:30:00').
         :param monitor_hours: Number of hours to monitor from the scheduled recording start time, e.g., 3.
         :param recording_dir: Directory path where the recorded files will be saved.
+        :param priority: Admission priority, rooms with higher values are recorded first when slots are scarce.
+        :param output_profiles: Additional formats written from the same input connection, e.g. ['M4A'].
         """
 
+        self._dirty = set()
         self.rec_id = rec_id
         self.url = url
         self.quality = quality
@@ -45,41 +211,31 @@ class Recording:
         self.scheduled_recording = scheduled_recording
         self.scheduled_start_time = scheduled_start_time
         self.monitor_hours = monitor_hours
-        self.scheduled_time_range = None
-        self.title = f"{streamer_name} - {self.quality}"
-        self.speed = "X KB/s"
-        self.is_live = False
-        self.recording = False  # Record status
-        self.start_time = None
         self.recording_dir = recording_dir
-        self.cumulative_duration = timedelta()  # Accumulated recording time
-        self.last_duration = timedelta()  # Save the total time of the last recording
-        self.display_title = self.title
-        self.selected = False
-        self.is_checking = False
-        self.status_info = None
-        self.live_title = None
-        self.detection_time = None
-        self.loop_time_seconds = None
-        self.use_proxy = None
-        self.record_url = None
+        self.priority = priority
+        self.output_profiles = output_profiles or []
+        self.state = RecordingState(f"{streamer_name} - {quality}")
+
+    @property
+    def dirty_fields(self) -> frozenset[str]:
+        """Saved settings changed since the recording was created or last saved."""
+        return frozenset(self._dirty)
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def clear_dirty(self):
+        self._dirty.clear()
+
+    def mark_dirty(self, fields):
+        self._dirty.update(fields)
 
     def to_dict(self):
         """Convert the Recording instance to a dictionary for saving."""
-        return {
-            "rec_id": self.rec_id,
-            "url": self.url,
-            "streamer_name": self.streamer_name,
-            "record_format": self.record_format,
-            "quality": self.quality,
-            "segment_record": self.segment_record,
-            "segment_time": self.segment_time,
-            "monitor_status": self.monitor_status,
-            "scheduled_recording": self.scheduled_recording,
-            "scheduled_start_time": self.scheduled_start_time,
-            "monitor_hours": self.monitor_hours,
-            "recording_dir": self.recording_dir,
-        }
+        data = {name: getattr(self, name) for name in PERSISTENT_FIELDS}
+        data["last_duration"] = self.last_duration.total_seconds()
+        return data
 
     @classmethod
     def from_dict(cls, data):
@@ -97,12 +253,15 @@ class Recording:
             data.get("scheduled_start_time"),
             data.get("monitor_hours"),
             data.get("recording_dir"),
+            data.get("priority") or 0,
+            data.get("output_profiles"),
         )
         recording.title = data.get("title", recording.title)
         recording.display_title = data.get("display_title", recording.title)
         recording.last_duration_str = data.get("last_duration")
         if recording.last_duration_str is not None:
             recording.last_duration = timedelta(seconds=float(recording.last_duration_str))
+        recording.clear_dirty()
         return recording
 
     def update_title(self, quality_info, prefix=None):
@@ -110,8 +269,17 @@ class Recording:
         self.title = f"{self.streamer_name} - {quality_info}"
         self.display_title = f"{prefix or ''}{self.title}"
 
-    def update(self, updated_info: dict):
-        """Update the recording object with new information."""
+    def update(self, updated_info: dict) -> set[str]:
+        """Update the recording object with new information, returns the names of the attributes that changed."""
+        changed = set()
         for attr, value in updated_info.items():
-            if hasattr(self, attr):
-                setattr(self, attr, value)
+            if attr in self.PERSISTENT_KEYS or attr in self.SAVED_STATE_KEYS:
+                target = self
+            elif attr in self.STATE_KEYS:
+                target = self.state
+            else:
+                continue
+            if getattr(target, attr) != value:
+                setattr(target, attr, value)
+                changed.add(attr)
+        return changed
@@ -2,10 +2,12 @@ class RecordingStatus:
     STOPPED_MONITORING = "STOPPED_MONITORING"
     MONITORING = "MONITORING"
     RECORDING = "RECORDING"
+    RECONNECTING = "RECONNECTING"
     NOT_RECORDING = "NOT_RECORDING"
     STATUS_CHECKING = "STATUS_CHECKING"
     NOT_IN_SCHEDULED_CHECK = "NOT_IN_SCHEDULED_CHECK"
     PREPARING_RECORDING = "PREPARING_RECORDING"
+    QUEUED = "QUEUED"
     RECORDING_ERROR = "RECORDING_ERROR"
     NOT_RECORDING_SPACE = "NOT_RECORDING_SPACE"
     LIVE_STATUS_CHECK_ERROR = "LIVE_STATUS_CHECK_ERROR"
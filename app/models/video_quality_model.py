@@ -11,3 +11,11 @@ class VideoQuality:
         attributes = cls.__dict__
         video_qualities = [value for name, value in attributes.items() if name.isupper()]
         return video_qualities
+
+    @classmethod
+    def get_lower_quality(cls, quality: str, steps: int = 1) -> str:
+        """Get the quality `steps` levels below the given one, bounded by the lowest quality"""
+        qualities = cls.get_qualities()
+        if quality not in qualities:
+            return quality
+        return qualities[min(qualities.index(quality) + steps, len(qualities) - 1)]
@@ -1,8 +1,18 @@
 import asyncio
 import os
+import shutil
 
 from .utils.logger import logger
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+    logger.warning(
+        "psutil is not installed: CPU/memory admission checks fall back to /proc or are skipped, ffmpeg "
+        "priority is not lowered on Windows and orphaned ffmpeg processes are not stopped after a crash"
+    )
+
 
 class AsyncProcessManager:
     def __init__(self):
@@ -12,6 +22,34 @@ class AsyncProcessManager:
         """Add an asynchronous process to the management list"""
         self.ffmpeg_processes.append(process)
 
+    @staticmethod
+    async def lower_priority(process: asyncio.subprocess.Process, nice_level: int = 10):
+        """Lower the CPU and I/O scheduling priority of a child process so recordings cannot starve the host"""
+        try:
+            if psutil:
+                child = psutil.Process(process.pid)
+                if os.name == "nt":
+                    child.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+                    child.ionice(psutil.IOPRIO_LOW)
+                else:
+                    child.nice(nice_level)
+                    if hasattr(child, "ionice"):
+                        child.ionice(psutil.IOPRIO_CLASS_BE, 7)
+                return
+
+            if hasattr(os, "setpriority"):
+                os.setpriority(os.PRIO_PROCESS, process.pid, nice_level)
+            ionice = shutil.which("ionice")
+            if ionice:
+                ionice_process = await asyncio.create_subprocess_exec(
+                    ionice, "-c", "2", "-n", "7", "-p", str(process.pid),
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                await ionice_process.wait()
+        except Exception as e:
+            logger.warning(f"Failed to lower process priority: pid={process.pid}, {e}")
+
     async def cleanup(self):
         """Asynchronously clean up all processes"""
         cleanup_tasks = []
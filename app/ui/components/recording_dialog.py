@@ -1,6 +1,7 @@
 import flet as ft
 
 from ...core.platform_handlers import get_platform_info
+from ...core.watchlist_io import iter_watchlist_lines
 from ...models.audio_format_model import AudioFormat
 from ...models.video_format_model import VideoFormat
 from ...models.video_quality_model import VideoQuality
@@ -199,6 +200,23 @@ class RecordingDialog:
             keyboard_type=ft.KeyboardType.NUMBER,
             visible=scheduled_recording,
         )
+        output_profiles_input = ft.TextField(
+            label=self._["output_profiles"],
+            hint_text=self._["input_output_profiles"],
+            border_radius=5,
+            filled=False,
+            value=", ".join(initial_values.get("output_profiles") or []),
+        )
+
+        priority_input = ft.TextField(
+            label=self._["recording_priority"],
+            hint_text=self._["input_recording_priority"],
+            border_radius=5,
+            filled=False,
+            value=str(initial_values.get("priority") or 0),
+            keyboard_type=ft.KeyboardType.NUMBER,
+        )
+
         hint_text_dict = {
             "en": "Example:\n0，https://v.douyin.com/AbcdE，nickname1\n0，https://v.douyin.com/EfghI，nickname2\n\nPS: "
             "0=original image or Blu ray, 1=ultra clear, 2=high-definition, 3=standard definition, 4=smooth\n",
@@ -241,11 +259,13 @@ class RecordingDialog:
                                 format_row,
                                 quality_dropdown,
                                 recording_dir_field,
+                                output_profiles_input,
                                 segment_setting_dropdown,
                                 segment_input,
                                 scheduled_setting_dropdown,
                                 schedule_and_monitor_row,
                                 monitor_hours_input,
+                                priority_input,
                             ],
                             tight=True,
                             spacing=10,
@@ -283,6 +303,18 @@ class RecordingDialog:
                     await close_dialog(e)
                     return
 
+                try:
+                    priority = int(priority_input.value)
+                except (TypeError, ValueError):
+                    priority = 0
+
+                supported_formats = VideoFormat.get_formats() + AudioFormat.get_formats()
+                output_profiles = []
+                for output_format in (output_profiles_input.value or "").replace("，", ",").split(","):
+                    output_format = output_format.strip().upper()
+                    if output_format in supported_formats and output_format not in output_profiles:
+                        output_profiles.append(output_format)
+
                 recordings_info = [
                     {
                         "rec_id": rec_id,
@@ -301,52 +333,15 @@ class RecordingDialog:
                         "scheduled_start_time": str(scheduled_start_time_input.value),
                         "monitor_hours": monitor_hours_input.value,
                         "recording_dir": recording_dir_field.value,
+                        "priority": priority,
+                        "output_profiles": output_profiles,
                     }
                 ]
                 await self.on_confirm_callback(recordings_info)
 
             elif tabs.selected_index == 1:  # Batch entry
-                lines = batch_input.value.splitlines()
-                recordings_info = []
-                streamer_name = ""
-                quality = "OD"
-                quality_dict = {"0": "OD", "1": "UHD", "2": "HD", "3": "SD", "4": "LD"}
-                for line in lines:
-                    if "http" not in line:
-                        continue
-                    res = [i for i in line.strip().replace("，", ",").split(",") if i]
-                    if len(res) == 3:
-                        quality, url, streamer_name = res
-                    elif len(res) == 2:
-                        if res[1].startswith("http"):
-                            quality, url = res
-                        else:
-                            url, streamer_name = res
-                    else:
-                        url = res[0]
-
-                    platform, platform_key = get_platform_info(url)
-                    if not platform:
-                        await not_supported(url)
-                        continue
-
-                    quality = quality_dict.get(quality, "OD")
-                    title = f"{streamer_name} - {self._[quality]}"
-                    display_title = title
-                    if not streamer_name:
-                        streamer_name = self._["live_room"]
-                        display_title = streamer_name + url.split("?")[0] + "... - " + self._[quality]
-
-                    recording_info = {
-                        "url": url.strip(),
-                        "streamer_name": streamer_name,
-                        "quality": quality,
-                        "quality_info": self._[VideoQuality.OD],
-                        "title": title,
-                        "display_title": display_title,
-                    }
-                    recordings_info.append(recording_info)
-
+                # Unsupported and already added rooms are skipped and reported once by the callback
+                recordings_info = list(iter_watchlist_lines(batch_input.value.splitlines()))
                 await self.on_confirm_callback(recordings_info)
 
             await close_dialog(e)
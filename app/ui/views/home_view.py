@@ -1,8 +1,12 @@
+import asyncio
 import uuid
+from collections.abc import Iterable
 
 import flet as ft
 
+from ...core.watchlist_io import select_new_entries
 from ...models.recording_model import Recording
+from ...models.video_quality_model import VideoQuality
 from ...utils.logger import logger
 from ..base_page import PageBase
 from ..components.help_dialog import HelpDialog
@@ -15,6 +19,8 @@ class HomePage(PageBase):
         super().__init__(app)
         self.page_name = "home"
         self.recording_card_area = None
+        self.admission_status_text = None
+        self.job_status_text = None
         self.add_recording_dialog = None
         self.is_grid_view = False
         self.app.language_manager.add_observer(self)
@@ -31,6 +37,8 @@ class HomePage(PageBase):
             content=ft.Column(controls=[], spacing=10, expand=True),
             expand=True
         )
+        self.admission_status_text = ft.Text("", size=12, color=ft.Colors.GREY_600)
+        self.job_status_text = ft.Text("", size=12, color=ft.Colors.GREY_600)
         self.add_recording_dialog = RecordingDialog(self.app, self.add_recording)
         self.pubsub_subscribe()
 
@@ -46,6 +54,8 @@ class HomePage(PageBase):
     def pubsub_subscribe(self):
         self.app.page.pubsub.subscribe_topic('add', self.subscribe_add_cards)
         self.app.page.pubsub.subscribe_topic('delete_all', self.subscribe_del_all_cards)
+        self.app.page.pubsub.subscribe_topic('admission', self.subscribe_admission_status)
+        self.app.page.pubsub.subscribe_topic('jobs', self.subscribe_job_status)
 
     async def toggle_view_mode(self, _):
         self.is_grid_view = not self.is_grid_view
@@ -80,6 +90,8 @@ class HomePage(PageBase):
         return ft.Row(
             [
                 ft.Text(self._["recording_list"], theme_style=ft.TextThemeStyle.TITLE_MEDIUM),
+                self.admission_status_text,
+                self.job_status_text,
                 ft.Container(expand=True),
                 ft.IconButton(
                     icon=ft.Icons.GRID_VIEW if self.is_grid_view else ft.Icons.LIST,
@@ -155,6 +167,14 @@ class HomePage(PageBase):
             if update:
                 self.recording_card_area.update()
 
+    async def add_new_record_cards(self, recordings: list[Recording]):
+        """Render the cards of added recordings with a single update, once the home page is shown."""
+        if not self.recording_card_area.page:
+            return
+        for recording in recordings:
+            await self.add_record_card(recording, update=False)
+        self.recording_card_area.update()
+
     async def add_record_cards(self):
         for recording in self.app.record_manager.recordings:
             await self.add_record_card(recording, update=False)
@@ -170,48 +190,80 @@ class HomePage(PageBase):
             card["card"].visible = True
         self.recording_card_area.update()
 
-    async def add_recording(self, recordings_info):
+    def create_recording(self, recording_info: dict, user_config: dict) -> Recording:
+        rec_id = recording_info.get("rec_id")
+        if not rec_id or self.app.record_manager.find_recording_by_id(rec_id):
+            rec_id = str(uuid.uuid4())
+        if recording_info.get("record_format"):
+            recording = Recording(
+                rec_id=rec_id,
+                url=recording_info["url"],
+                streamer_name=recording_info["streamer_name"],
+                quality=recording_info["quality"],
+                record_format=recording_info["record_format"],
+                segment_record=recording_info["segment_record"],
+                segment_time=recording_info["segment_time"],
+                monitor_status=recording_info["monitor_status"],
+                scheduled_recording=recording_info["scheduled_recording"],
+                scheduled_start_time=recording_info["scheduled_start_time"],
+                monitor_hours=recording_info["monitor_hours"],
+                recording_dir=recording_info["recording_dir"],
+                priority=recording_info.get("priority", 0),
+                output_profiles=recording_info.get("output_profiles"),
+            )
+        else:
+            recording = Recording(
+                rec_id=rec_id,
+                url=recording_info["url"],
+                streamer_name=recording_info.get("streamer_name") or self._["live_room"],
+                quality=recording_info.get("quality") or VideoQuality.OD,
+                record_format=user_config.get("video_format", "TS"),
+                segment_record=user_config.get("segmented_recording_enabled", False),
+                segment_time=user_config.get("video_segment_time", "1800"),
+                monitor_status=True,
+                scheduled_recording=user_config.get("scheduled_recording", False),
+                scheduled_start_time=user_config.get("scheduled_start_time"),
+                monitor_hours=user_config.get("monitor_hours"),
+                recording_dir=None,
+            )
+
+        recording.loop_time_seconds = self.app.settings_cache.get("loop_time_seconds") or 300
+        recording.update_title(self._[recording.quality])
+        return recording
+
+    async def add_recording(self, recordings_info: Iterable[dict]):
+        """
+        Add rooms from the add dialog or an imported watchlist. Parsing and deduplication by room key
+        run in a worker thread, once short links are resolved, the rooms are saved together and their
+        cards are rendered in one update.
+        """
+        registry = self.app.record_manager.recordings
+        entries = await asyncio.to_thread(list, recordings_info)
+        await self.app.record_manager.resolve_short_links([str(entry["url"]) for entry in entries])
+        entries, counts = await asyncio.to_thread(
+            select_new_entries, entries, lambda url: registry.find_by_url(url) is not None, registry.key_function
+        )
         user_config = self.app.settings.user_config
-        logger.info(f"Add items: {len(recordings_info)}")
-        for recording_info in recordings_info:
-            if recording_info.get("record_format"):
-                recording = Recording(
-                    rec_id=str(uuid.uuid4()),
-                    url=recording_info["url"],
-                    streamer_name=recording_info["streamer_name"],
-                    quality=recording_info["quality"],
-                    record_format=recording_info["record_format"],
-                    segment_record=recording_info["segment_record"],
-                    segment_time=recording_info["segment_time"],
-                    monitor_status=recording_info["monitor_status"],
-                    scheduled_recording=recording_info["scheduled_recording"],
-                    scheduled_start_time=recording_info["scheduled_start_time"],
-                    monitor_hours=recording_info["monitor_hours"],
-                    recording_dir=recording_info["recording_dir"],
-                )
-            else:
-                recording = Recording(
-                    rec_id=str(uuid.uuid4()),
-                    url=recording_info["url"],
-                    streamer_name=recording_info["streamer_name"],
-                    quality=recording_info["quality"],
-                    record_format=user_config.get("video_format", "TS"),
-                    segment_record=user_config.get("segmented_recording_enabled", False),
-                    segment_time=user_config.get("video_segment_time", "1800"),
-                    monitor_status=True,
-                    scheduled_recording=user_config.get("scheduled_recording", False),
-                    scheduled_start_time=user_config.get("scheduled_start_time"),
-                    monitor_hours=user_config.get("monitor_hours"),
-                    recording_dir=None,
-                )
-
-            recording.loop_time_seconds = int(user_config.get("loop_time_seconds", 300))
-            recording.update_title(self._[recording.quality])
-            await self.app.record_manager.add_recording(recording)
-            self.page.run_task(self.add_record_card, recording, True)
-            self.app.page.pubsub.send_others_on_topic("add", recording)
-
-        await self.app.snack_bar.show_snack_bar(self._["add_recording_success_tip"], bgcolor=ft.Colors.GREEN)
+        recordings = [self.create_recording(entry, user_config) for entry in entries]
+        added = await self.app.record_manager.add_recordings(recordings)
+        logger.info(
+            f"Add items: {len(added)}, duplicates skipped: {counts['duplicates']}, "
+            f"unsupported skipped: {counts['unsupported']}"
+        )
+        if added:
+            await self.add_new_record_cards(added)
+            self.app.page.pubsub.send_others_on_topic("add", added)
+
+        if counts["duplicates"] or counts["unsupported"]:
+            await self.app.snack_bar.show_snack_bar(
+                self._["add_recordings_result_tip"].format(
+                    added=len(added), duplicates=counts["duplicates"], unsupported=counts["unsupported"]
+                ),
+                bgcolor=ft.Colors.GREEN if added else None,
+                duration=3000,
+            )
+        else:
+            await self.app.snack_bar.show_snack_bar(self._["add_recording_success_tip"], bgcolor=ft.Colors.GREEN)
 
     async def search_on_click(self, _e):
         """Open the search dialog when the search button is clicked."""
@@ -303,8 +355,31 @@ class HomePage(PageBase):
     async def subscribe_del_all_cards(self, *_):
         await self.delete_all_recording_cards()
 
-    async def subscribe_add_cards(self, _, recording):
-        await self.add_record_card(recording, True)
+    async def subscribe_add_cards(self, _, recordings: list[Recording]):
+        await self.add_new_record_cards(recordings)
+
+    async def subscribe_admission_status(self, _, snapshot: dict):
+        if snapshot["queued"]:
+            limit = snapshot["max_concurrent"] or "∞"
+            self.admission_status_text.value = self._["admission_status"].format(
+                active=snapshot["active"], limit=limit, queued=snapshot["queued"]
+            )
+        else:
+            self.admission_status_text.value = ""
+        if self.admission_status_text.page:
+            self.admission_status_text.update()
+
+    async def subscribe_job_status(self, _, snapshot: dict):
+        if snapshot["pending"] or snapshot["running"]:
+            progress = [item["progress"] for item in snapshot["progress"]]
+            average = sum(progress) / len(progress) if progress else 0
+            self.job_status_text.value = self._["job_status"].format(
+                running=snapshot["running"], pending=snapshot["pending"], progress=f"{average:.0%}"
+            )
+        else:
+            self.job_status_text.value = ""
+        if self.job_status_text.page:
+            self.job_status_text.update()
 
     async def update_grid_layout(self, _):
         self.page.run_task(self.recalculate_grid_columns)
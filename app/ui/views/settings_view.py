@@ -1,8 +1,10 @@
 import asyncio
 import os
+from datetime import datetime
 
 import flet as ft
 
+from ...core.watchlist_io import WATCHLIST_EXTENSIONS, iter_watchlist_file
 from ...models.video_format_model import VideoFormat
 from ...models.video_quality_model import VideoQuality
 from ...utils.delay import DelayedTaskExecutor
@@ -32,6 +34,7 @@ class SettingsPage(PageBase):
         self.tab_accounts = None
         self.has_unsaved_changes = {}
         self.delay_handler = DelayedTaskExecutor(self.app, self)
+        self.config_manager.settings_cache.subscribe(self.on_settings_changed)
         self.load_language()
         self.init_unsaved_changes()
         self.page.on_keyboard_event = self.on_keyboard
@@ -103,6 +106,55 @@ class SettingsPage(PageBase):
         k1, k2 = key.split("_", maxsplit=1)
         return self.accounts_config.get(k1, {}).get(k2, default)
 
+    async def export_recordings(self, _):
+        """Export the recording list to a JSON lines backup in the config directory, it can be imported again."""
+        filename = f"recordings_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        export_path = os.path.join(self.config_manager.config_path, filename)
+        try:
+            await self.config_manager.export_recordings_config(export_path)
+        except OSError as e:
+            logger.error(f"Failed to export recordings: {e}")
+            return
+        await self.app.snack_bar.show_snack_bar(
+            f"{self._['export_recordings_success_tip']} {export_path}", bgcolor=ft.Colors.GREEN
+        )
+
+    def create_import_recordings_row(self):
+        def picked_files(e: ft.FilePickerResultEvent):
+            if e.files:
+                self.page.run_task(self.import_recordings, e.files[0].path)
+
+        async def pick_file(_):
+            if self.app.page.web:
+                await self.app.snack_bar.show_snack_bar(self._["unsupported_select_path"])
+                return
+            file_picker.pick_files(allowed_extensions=list(WATCHLIST_EXTENSIONS))
+
+        file_picker = ft.FilePicker(on_result=picked_files)
+        self.page.overlay.append(file_picker)
+        self.page.update()
+
+        return self.create_setting_row(
+            self._["import_recordings"],
+            ft.IconButton(
+                icon=ft.Icons.UPLOAD_FILE_OUTLINED,
+                icon_size=32,
+                tooltip=self._["import_recordings_tip"],
+                on_click=pick_file,
+            ),
+        )
+
+    async def import_recordings(self, path: str | None):
+        """Add the rooms of a watchlist file, a recording list backup or a text file with one URL per line."""
+        if not path:
+            return
+        logger.info(f"Importing recordings: {path}")
+        try:
+            await self.app.home.add_recording(iter_watchlist_file(path))
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to import recordings: {e}")
+            await self.app.snack_bar.show_snack_bar(self._["import_recordings_failed_tip"], duration=3000)
+
     async def restore_default_config(self, _):
         """Restore settings to their default values."""
 
@@ -110,6 +162,7 @@ class SettingsPage(PageBase):
             ui_language = self.user_config["language"]
             self.user_config = self.default_config.copy()
             self.user_config["language"] = ui_language
+            self.config_manager.settings_cache.apply(self.user_config)
             self.app.language_manager.notify_observers()
             self.page.run_task(self.load)
             await self.config_manager.save_user_config(self.user_config)
@@ -149,11 +202,19 @@ class SettingsPage(PageBase):
             self.app.language_manager.notify_observers()
             self.page.run_task(self.load)
 
-        if key == "loop_time_seconds":
-            self.app.record_manager.initialize_dynamic_state()
+        self.config_manager.settings_cache.apply(self.user_config)
         self.page.run_task(self.delay_handler.start_task_timer, self.save_user_config_after_delay, None)
         self.has_unsaved_changes['user_config'] = True
 
+    def on_settings_changed(self, changed: set[str]):
+        """Take over settings another process changed in the file, unless edits here are still unsaved."""
+        if self.has_unsaved_changes.get("user_config"):
+            return
+        settings_cache = self.config_manager.settings_cache
+        for key in changed:
+            if key in settings_cache.raw:
+                self.user_config[key] = settings_cache.get_raw(key)
+
     def on_cookies_change(self, e):
         """Handle changes in any input field and trigger auto-save."""
         key = e.control.data
@@ -193,6 +254,12 @@ class SettingsPage(PageBase):
             live_save_path = os.path.join(self.app.run_path, 'downloads')
         return live_save_path
 
+    def get_video_save_paths(self):
+        """The primary save path followed by the additional output volumes."""
+        extra_save_paths = self.get_config_value("extra_save_paths") or ""
+        extra_paths = [i.strip() for i in extra_save_paths.replace("，", ",").split(",") if i.strip()]
+        return [self.get_video_save_path(), *extra_paths]
+
     def create_recording_settings_tab(self):
         """Create UI elements for recording settings."""
         return ft.Column(
@@ -210,6 +277,16 @@ class SettingsPage(PageBase):
                                 on_click=self.restore_default_config,
                             ),
                         ),
+                        self.create_setting_row(
+                            self._["export_recordings"],
+                            ft.IconButton(
+                                icon=ft.Icons.SAVE_ALT_OUTLINED,
+                                icon_size=32,
+                                tooltip=self._["export_recordings"],
+                                on_click=self.export_recordings,
+                            ),
+                        ),
+                        self.create_import_recordings_row(),
                         self.create_setting_row(
                             self._["program_language"],
                             ft.Dropdown(
@@ -240,6 +317,43 @@ class SettingsPage(PageBase):
                                 data="live_save_path",
                             ),
                         ),
+                        self.create_setting_row(
+                            self._["extra_save_paths"],
+                            ft.TextField(
+                                value=self.get_config_value("extra_save_paths"),
+                                width=300,
+                                on_change=self.on_change,
+                                data="extra_save_paths",
+                                tooltip=self._["extra_save_paths_tip"],
+                            ),
+                        ),
+                        self.pick_folder(
+                            self._["staging_save_path"],
+                            ft.TextField(
+                                value=self.get_config_value("staging_save_path"),
+                                width=300,
+                                on_change=self.on_change,
+                                data="staging_save_path",
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["staging_space_threshold"],
+                            ft.TextField(
+                                value=self.get_config_value("staging_space_threshold"),
+                                width=100,
+                                on_change=self.on_change,
+                                data="staging_space_threshold",
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["archive_bandwidth_limit"],
+                            ft.TextField(
+                                value=self.get_config_value("archive_bandwidth_limit"),
+                                width=100,
+                                on_change=self.on_change,
+                                data="archive_bandwidth_limit",
+                            ),
+                        ),
                         self.create_setting_row(
                             self._["remove_emojis"],
                             ft.Switch(
@@ -251,6 +365,61 @@ class SettingsPage(PageBase):
                         self.create_folder_setting_row(self._["name_rules"]),
                     ],
                 ),
+                self.create_setting_group(
+                    self._["retention_settings"],
+                    self._["retention_settings_tip"],
+                    [
+                        self.create_setting_row(
+                            self._["retention_enabled"],
+                            ft.Switch(
+                                value=self.get_config_value("retention_enabled"),
+                                on_change=self.on_change,
+                                data="retention_enabled",
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["retention_max_age_days"],
+                            ft.TextField(
+                                value=self.get_config_value("retention_max_age_days"),
+                                width=100,
+                                on_change=self.on_change,
+                                data="retention_max_age_days",
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["retention_max_size_gb"],
+                            ft.TextField(
+                                value=self.get_config_value("retention_max_size_gb"),
+                                width=100,
+                                on_change=self.on_change,
+                                data="retention_max_size_gb",
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["retention_keep_sessions"],
+                            ft.TextField(
+                                value=self.get_config_value("retention_keep_sessions"),
+                                width=100,
+                                on_change=self.on_change,
+                                data="retention_keep_sessions",
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["retention_rules"],
+                            ft.TextField(
+                                value=self.get_config_value("retention_rules"),
+                                width=500,
+                                multiline=True,
+                                min_lines=2,
+                                max_lines=6,
+                                hint_text="streamer:name max_age_days=7 max_size_gb=50 keep_sessions=10",
+                                tooltip=self._["retention_rules_tip"],
+                                on_change=self.on_change,
+                                data="retention_rules",
+                            ),
+                        ),
+                    ],
+                ),
                 self.create_setting_group(
                     self._["proxy_settings"],
                     self._["is_proxy_enabled"],
@@ -334,6 +503,34 @@ class SettingsPage(PageBase):
                                 on_change=self.on_change,
                             ),
                         ),
+                        self.create_setting_row(
+                            self._["disk_warn_minutes"],
+                            ft.TextField(
+                                value=self.get_config_value("disk_warn_minutes"),
+                                width=100,
+                                data="disk_warn_minutes",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["disk_degrade_minutes"],
+                            ft.TextField(
+                                value=self.get_config_value("disk_degrade_minutes"),
+                                width=100,
+                                data="disk_degrade_minutes",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["disk_degradation_steps"],
+                            ft.TextField(
+                                value=self.get_config_value("disk_degradation_steps"),
+                                width=300,
+                                data="disk_degradation_steps",
+                                on_change=self.on_change,
+                                tooltip=self._["disk_degradation_steps_tip"],
+                            ),
+                        ),
                         self.create_setting_row(
                             self._["segment_time"],
                             ft.TextField(
@@ -359,6 +556,141 @@ class SettingsPage(PageBase):
                                 on_change=self.on_change,
                             ),
                         ),
+                        self.create_setting_row(
+                            self._["fragmented_mp4_recording"],
+                            ft.Switch(
+                                value=self.get_config_value("fragmented_mp4_recording"),
+                                data="fragmented_mp4_recording",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["probe_stream_codecs"],
+                            ft.Switch(
+                                value=self.get_config_value("probe_stream_codecs"),
+                                data="probe_stream_codecs",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["faststart_after_recording"],
+                            ft.Switch(
+                                value=self.get_config_value("faststart_after_recording"),
+                                data="faststart_after_recording",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["concat_segments_after_recording"],
+                            ft.Switch(
+                                value=self.get_config_value("concat_segments_after_recording"),
+                                data="concat_segments_after_recording",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["delete_segments_after_concat"],
+                            ft.Switch(
+                                value=self.get_config_value("delete_segments_after_concat"),
+                                data="delete_segments_after_concat",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["post_processing_workers"],
+                            ft.TextField(
+                                value=self.get_config_value("post_processing_workers"),
+                                width=100,
+                                data="post_processing_workers",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["generate_checksum"],
+                            ft.Switch(
+                                value=self.get_config_value("generate_checksum"),
+                                data="generate_checksum",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["upload_enabled"],
+                            ft.Switch(
+                                value=self.get_config_value("upload_enabled"),
+                                data="upload_enabled",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["upload_url"],
+                            ft.TextField(
+                                value=self.get_config_value("upload_url"),
+                                width=300,
+                                data="upload_url",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["auto_reconnect"],
+                            ft.Switch(
+                                value=self.get_config_value("auto_reconnect_enabled"),
+                                data="auto_reconnect_enabled",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["reconnect_max_retries"],
+                            ft.TextField(
+                                value=self.get_config_value("reconnect_max_retries"),
+                                width=100,
+                                data="reconnect_max_retries",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["stall_timeout"],
+                            ft.TextField(
+                                value=self.get_config_value("stall_timeout_seconds"),
+                                width=100,
+                                data="stall_timeout_seconds",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["max_concurrent_recordings"],
+                            ft.TextField(
+                                value=self.get_config_value("max_concurrent_recordings"),
+                                width=100,
+                                data="max_concurrent_recordings",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["max_cpu_percent"],
+                            ft.TextField(
+                                value=self.get_config_value("max_cpu_percent"),
+                                width=100,
+                                data="max_cpu_percent",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["min_free_memory_percent"],
+                            ft.TextField(
+                                value=self.get_config_value("min_free_memory_percent"),
+                                width=100,
+                                data="min_free_memory_percent",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["ffmpeg_low_priority"],
+                            ft.Switch(
+                                value=self.get_config_value("ffmpeg_low_priority"),
+                                data="ffmpeg_low_priority",
+                                on_change=self.on_change,
+                            ),
+                        ),
                         self.create_setting_row(
                             self._["generate_timestamps_subtitle"],
                             ft.Switch(
@@ -367,6 +699,25 @@ class SettingsPage(PageBase):
                                 on_change=self.on_change,
                             ),
                         ),
+                        self.create_setting_row(
+                            self._["time_subtitle_format"],
+                            ft.Dropdown(
+                                options=[ft.dropdown.Option(i, text=i.upper()) for i in ("srt", "vtt")],
+                                value=self.get_config_value("time_subtitle_format", "srt"),
+                                width=200,
+                                data="time_subtitle_format",
+                                on_change=self.on_change,
+                            ),
+                        ),
+                        self.create_setting_row(
+                            self._["time_subtitle_interval"],
+                            ft.TextField(
+                                value=self.get_config_value("time_subtitle_interval"),
+                                width=100,
+                                data="time_subtitle_interval",
+                                on_change=self.on_change,
+                            ),
+                        ),
                         self.create_setting_row(
                             self._["custom_script"],
                             ft.Switch(
@@ -16,6 +16,7 @@ class StoragePage(BasePage):
         super().__init__(app)
         self.page_name = "storage"
         self.root_path = None
+        self.storage_roots = []
         self.current_path = None
         self.path_display = None
         self.content = None
@@ -26,6 +27,12 @@ class StoragePage(BasePage):
 
     async def load(self):
         self.root_path = self.app.settings.get_video_save_path()
+        self.storage_roots = [
+            (ft.Icons.ARCHIVE, path) for path in self.app.settings.get_video_save_paths()
+        ]
+        staging_path = self.app.settings.get_config_value("staging_save_path")
+        if staging_path:
+            self.storage_roots.append((ft.Icons.DOWNLOADING, staging_path))
         self.current_path = self.root_path
         self.setup_ui()
         await self.update_file_list()
@@ -37,7 +44,22 @@ class StoragePage(BasePage):
             color=ft.colors.GREY_600
         )
         self.file_list = ft.ListView(expand=True)
-        self.content = ft.Column(controls=[self.path_display, self.file_list])
+        controls = [self.path_display, self.file_list]
+        if len(self.storage_roots) > 1:
+            root_buttons = ft.Row(
+                controls=[
+                    ft.ElevatedButton(
+                        path,
+                        icon=icon,
+                        tooltip=self._["staging_storage" if icon == ft.Icons.DOWNLOADING else "archive_storage"],
+                        on_click=lambda e, path=path: self.app.page.run_task(self.switch_root, path),
+                    )
+                    for icon, path in self.storage_roots
+                ],
+                wrap=True,
+            )
+            controls.insert(0, root_buttons)
+        self.content = ft.Column(controls=controls)
         self.app.content_area.controls = [self.content]
         self.app.content_area.update()
 
@@ -106,6 +128,11 @@ class StoragePage(BasePage):
             )
         )
 
+    async def switch_root(self, root_path):
+        """Browse another output volume or the staging directory."""
+        self.root_path = root_path
+        await self.navigate_to(root_path)
+
     async def navigate_to(self, path):
         self.current_path = path
         self.path_display.value = self._["current_path"] + ":" + self.current_path
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from .logger import logger
+
+
+class WriteBehindPersister:
+    """
+    Coalesces save requests into as few writes as possible.
+
+    A request only marks the state dirty; the write happens once no further request arrived for
+    `delay` seconds, or at the latest `max_delay` seconds after the first pending request, so a
+    burst of changes costs a single write. Writes never overlap, and `flush` writes any pending
+    change right away, e.g. on shutdown.
+    """
+
+    DELAY = 1.0
+    MAX_DELAY = 5.0
+
+    def __init__(self, save: Callable[[], Awaitable[None]], delay: float = DELAY, max_delay: float = MAX_DELAY):
+        """
+        :param save: Coroutine function writing the current state.
+        :param delay: Quiet period after the last request before the state is written.
+        :param max_delay: Longest time a request waits for its write while requests keep coming in.
+        """
+        self.save = save
+        self.delay = delay
+        self.max_delay = max_delay
+        self.requests = 0
+        self.writes = 0
+        self.failures = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self._total_latency = 0.0
+        self._dirty = False
+        self._first_request_time = None
+        self._last_request_time = 0.0
+        self._lock = asyncio.Lock()
+        self._task = None
+
+    def request(self):
+        """Mark the state dirty and schedule a write, must be called from the event loop."""
+        now = time.monotonic()
+        self.requests += 1
+        self._dirty = True
+        self._last_request_time = now
+        if self._first_request_time is None:
+            self._first_request_time = now
+        if not self._task or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while self._dirty:
+            now = time.monotonic()
+            quiet_until = self._last_request_time + self.delay
+            deadline = (self._first_request_time or now) + self.max_delay
+            wait = min(quiet_until, deadline) - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            await self._write()
+
+    async def _write(self):
+        async with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._first_request_time = None
+            start = time.monotonic()
+            try:
+                await self.save()
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Write-behind save failed, retrying: {e}")
+                self._dirty = True
+                self._last_request_time = time.monotonic()
+                return
+            latency = time.monotonic() - start
+            self.writes += 1
+            self.last_latency = latency
+            self.max_latency = max(self.max_latency, latency)
+            self._total_latency += latency
+
+    async def flush(self):
+        """Write pending changes now and wait for any write in progress."""
+        await self._write()
+
+    @property
+    def is_dirty(self) -> bool:
+        return self._dirty
+
+    def get_stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "writes": self.writes,
+            "failures": self.failures,
+            "pending": self._dirty,
+            "last_latency_ms": round(self.last_latency * 1000, 1),
+            "avg_latency_ms": round(self._total_latency / self.writes * 1000, 1) if self.writes else 0.0,
+            "max_latency_ms": round(self.max_latency * 1000, 1),
+        }
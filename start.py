@@ -834,38 +834,41 @@ class StreamCapAPI:
             if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
                 save_path = file_path.rsplit(".", maxsplit=1)[0] + ".mp4"
                 
-                # 使用subprocess而不是asyncio，更稳定
-                import subprocess
-                
                 # 获取适合当前操作系统的startupinfo设置
                 startupinfo = None
                 if os.name == "nt":
+                    import subprocess
                     startupinfo = subprocess.STARTUPINFO()
                     startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
                 
-                _output = subprocess.check_output(
-                    [
-                        "ffmpeg",
-                        "-i", file_path,
-                        "-c:v", "copy",
-                        "-c:a", "copy",
-                        "-f", "mp4",
-                        save_path
-                    ],
-                    stderr=subprocess.STDOUT,
+                # 使用异步子进程, 转码期间不阻塞事件循环中的监控与其他录制任务
+                process = await asyncio.create_subprocess_exec(
+                    "ffmpeg",
+                    "-y",
+                    "-i", file_path,
+                    "-c:v", "copy",
+                    "-c:a", "copy",
+                    "-f", "mp4",
+                    save_path,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
                     startupinfo=startupinfo,
                 )
+                _, stderr = await process.communicate()
                 
-                converts_success = True
-                print(f"视频转码完成: {save_path}")
+                if process.returncode == 0:
+                    converts_success = True
+                    print(f"视频转码完成: {save_path}")
+                else:
+                    print(f"视频转码失败! 错误信息: {stderr.decode(errors='ignore')}")
                 
-        except subprocess.CalledProcessError as e:
-            print(f"视频转码失败! 错误信息: {e.output.decode() if hasattr(e, 'output') else str(e)}")
+        except OSError as e:
+            print(f"视频转码失败! 错误信息: {str(e)}")
             
         try:
             if converts_success:
                 if delete_original:
-                    time.sleep(1)  # 给文件系统一点时间完成操作
+                    await asyncio.sleep(1)  # 给文件系统一点时间完成操作
                     if os.path.exists(file_path):
                         os.remove(file_path)
                     print(f"已删除原始文件: {file_path}")
@@ -877,7 +880,7 @@ class StreamCapAPI:
                     shutil.move(file_path, converts_dir)
                     print(f"已移动转码文件: {file_path}")
                     
-        except subprocess.CalledProcessError as e:
+        except OSError as e:
             print(f"转换过程中发生错误: {str(e)}")
         except Exception as e:
             print(f"发生未知错误: {str(e)}")
@@ -0,0 +1,114 @@
+import contextlib
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from app.core.config_manager import read_config_file, write_config_file
+
+OLD_CONFIG = {"version": "old", "items": list(range(100))}
+NEW_CONFIG = {"version": "new", "items": list(range(200))}
+
+
+class SimulatedCrash(BaseException):
+    """Stands in for the process being killed at that point."""
+
+
+def crash_on_call(target, name: str, after_calls: int = 0):
+    """Patch `target.name` to behave normally `after_calls` times and then crash."""
+    original = getattr(target, name)
+    calls = 0
+
+    def side_effect(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls > after_calls:
+            raise SimulatedCrash
+        return original(*args, **kwargs)
+
+    return mock.patch.object(target, name, side_effect=side_effect)
+
+
+class WriteConfigFileCrashTest(unittest.TestCase):
+    """Interrupt `write_config_file` at each step, the old or the new version must always load."""
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.dir_path = temp_dir.name
+        self.config_path = os.path.join(self.dir_path, "user_settings.json")
+        self.backup_path = f"{self.config_path}.bak"
+        write_config_file(self.config_path, OLD_CONFIG)
+
+    def write_and_crash(self, crash_patch, keep_temp_file: bool = True):
+        # A killed process never gets to clean up, so the temp file stays behind
+        cleanup_patch = mock.patch.object(os, "remove") if keep_temp_file else contextlib.nullcontext()
+        with crash_patch, cleanup_patch, self.assertRaises(SimulatedCrash):
+            write_config_file(self.config_path, NEW_CONFIG)
+
+    def test_completed_write_keeps_previous_version_as_backup(self):
+        write_config_file(self.config_path, NEW_CONFIG)
+        self.assertEqual(read_config_file(self.config_path), NEW_CONFIG)
+        self.assertEqual(read_config_file(self.backup_path), OLD_CONFIG)
+
+    def test_crash_while_serializing(self):
+        def partial_dump(config, file, **kwargs):
+            file.write(json.dumps(config)[:50])
+            raise SimulatedCrash
+
+        self.write_and_crash(mock.patch.object(json, "dump", side_effect=partial_dump))
+        self.assertEqual(read_config_file(self.config_path), OLD_CONFIG)
+
+    def test_crash_before_fsync(self):
+        self.write_and_crash(crash_on_call(os, "fsync"))
+        self.assertEqual(read_config_file(self.config_path), OLD_CONFIG)
+
+    def test_crash_before_renames(self):
+        self.write_and_crash(crash_on_call(os, "replace"))
+        self.assertEqual(read_config_file(self.config_path), OLD_CONFIG)
+
+    def test_crash_between_backup_and_rename(self):
+        self.write_and_crash(crash_on_call(os, "replace", after_calls=1))
+        self.assertFalse(os.path.exists(self.config_path))
+        self.assertEqual(read_config_file(self.config_path), OLD_CONFIG)
+
+    def test_crash_after_rename(self):
+        self.write_and_crash(crash_on_call(os, "fsync", after_calls=1))
+        self.assertEqual(read_config_file(self.config_path), NEW_CONFIG)
+
+    def test_interrupted_write_removes_its_temp_file(self):
+        self.write_and_crash(crash_on_call(os, "replace"), keep_temp_file=False)
+        self.assertEqual(os.listdir(self.dir_path), ["user_settings.json"])
+
+    def test_truncated_temp_file_is_ignored(self):
+        serialized = json.dumps(NEW_CONFIG)
+        with open(os.path.join(self.dir_path, ".user_settings.json.abc.tmp"), "w", encoding="utf-8") as file:
+            file.write(serialized[: len(serialized) // 2])
+        self.assertEqual(read_config_file(self.config_path), OLD_CONFIG)
+        write_config_file(self.config_path, NEW_CONFIG)
+        self.assertEqual(read_config_file(self.config_path), NEW_CONFIG)
+
+    def test_truncated_file_falls_back_to_backup(self):
+        write_config_file(self.config_path, NEW_CONFIG)
+        with open(self.config_path, encoding="utf-8") as file:
+            serialized = file.read()
+        for length in range(0, len(serialized), 97):
+            with open(self.config_path, "w", encoding="utf-8") as file:
+                file.write(serialized[:length])
+            self.assertEqual(read_config_file(self.config_path), OLD_CONFIG)
+
+    def test_missing_file_without_backup_raises(self):
+        os.remove(self.config_path)
+        with self.assertRaises(FileNotFoundError):
+            read_config_file(self.config_path)
+
+    def test_corrupt_file_without_backup_raises(self):
+        with open(self.config_path, "w", encoding="utf-8") as file:
+            file.write('{"version": ')
+        with self.assertRaises(json.JSONDecodeError):
+            read_config_file(self.config_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
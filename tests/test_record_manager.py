@@ -0,0 +1,216 @@
+import gc
+import os
+import shutil
+import tempfile
+import tracemalloc
+import types
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+from streamget import StreamData
+
+from app.core.admission_controller import AdmissionController
+from app.core.config_manager import ConfigManager
+from app.core.language_manager import LanguageManager
+from app.core.record_manager import GlobalRecordingState, RecordingManager
+from app.core.room_identity import RoomIdentityResolver
+from app.core.stream_manager import LiveStreamRecorder
+from app.core.volume_manager import VolumeManager
+from app.models.recording_model import Recording
+from app.utils.logger import logger
+
+PROJECT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def fetch_offline_stream(recorder: LiveStreamRecorder) -> StreamData:
+    recorder.recording.is_checking = False
+    return StreamData(platform=recorder.platform, anchor_name="anchor", is_live=False)
+
+
+def create_recording(index: int) -> Recording:
+    return Recording(
+        rec_id=f"rec-{index}",
+        url=f"https://live.douyin.com/{100000 + index}",
+        streamer_name="anchor",
+        record_format="TS",
+        quality="OD",
+        segment_record=False,
+        segment_time="1800",
+        monitor_status=True,
+        scheduled_recording=False,
+        scheduled_start_time=None,
+        monitor_hours=None,
+        recording_dir=None,
+    )
+
+
+class RecordingManagerTestCase(unittest.IsolatedAsyncioTestCase):
+    RECORDINGS = 10
+
+    async def asyncSetUp(self):
+        logger.disable("app")
+        self.addCleanup(logger.enable, "app")
+
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        run_path = temp_dir.name
+        os.makedirs(os.path.join(run_path, "config"))
+        shutil.copy(
+            os.path.join(PROJECT_PATH, "config", "default_settings.json"),
+            os.path.join(run_path, "config", "default_settings.json"),
+        )
+        save_path = os.path.join(run_path, "downloads")
+
+        config_manager = ConfigManager(run_path)
+        self.addCleanup(config_manager.recordings_store.close)
+        settings = types.SimpleNamespace(
+            user_config=config_manager.load_user_config(),
+            accounts_config={},
+            cookies_config={},
+            language_code="en",
+            get_video_save_path=lambda: save_path,
+            get_video_save_paths=lambda: [save_path],
+        )
+        self.app = types.SimpleNamespace(
+            run_path=PROJECT_PATH,
+            config_manager=config_manager,
+            settings_cache=config_manager.settings_cache,
+            settings=settings,
+            subprocess_start_up_info=None,
+            recording_enabled=True,
+            admission_controller=AdmissionController(),
+            volume_manager=VolumeManager(),
+            room_identity=RoomIdentityResolver(os.path.join(run_path, "config", "room_identity.db")),
+            # Plain doubles rather than mocks, which would keep every call and skew the memory check
+            disk_monitor=types.SimpleNamespace(is_shed=lambda rec_id: False),
+            job_queue=types.SimpleNamespace(add_completion_listener=lambda listener: None),
+            page=types.SimpleNamespace(
+                run_task=lambda handler, *args, **kwargs: None,
+                pubsub=types.SimpleNamespace(send_others_on_topic=lambda topic, message: None),
+            ),
+        )
+        self.addCleanup(self.app.room_identity.close)
+        self.app.language_manager = LanguageManager(self.app)
+
+        GlobalRecordingState.registry.clear()
+        self.addCleanup(GlobalRecordingState.registry.clear)
+        self.manager = RecordingManager(self.app)
+        self.recordings = [create_recording(index) for index in range(self.RECORDINGS)]
+        await self.manager.add_recordings(self.recordings)
+
+        patcher = mock.patch.object(LiveStreamRecorder, "fetch_stream", fetch_offline_stream)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await self.manager.flush_recordings()
+
+
+class RecorderLifecycleTest(RecordingManagerTestCase):
+    """Soak test: live checks must reuse one recorder per recording instead of leaking one per check."""
+
+    ROUNDS = 200
+
+    @property
+    def observer_count(self) -> int:
+        return len(self.app.language_manager._observers)
+
+    async def check_all(self, rounds: int):
+        for _ in range(rounds):
+            for recording in self.recordings:
+                await self.manager.check_if_live(recording)
+
+    async def test_live_checks_reuse_one_recorder_per_recording(self):
+        await self.check_all(1)
+        recorders = {rec_id: id(recorder) for rec_id, recorder in self.manager.recorders.items()}
+        observer_count = self.observer_count
+        self.assertEqual(len(recorders), self.RECORDINGS)
+
+        await self.check_all(self.ROUNDS)
+        self.assertEqual({rec_id: id(recorder) for rec_id, recorder in self.manager.recorders.items()}, recorders)
+        self.assertEqual(self.observer_count, observer_count)
+        for recording in self.recordings:
+            self.assertIs(self.manager.get_recorder(recording).recording, recording)
+
+    async def test_live_checks_keep_memory_bounded(self):
+        await self.check_all(5)
+        gc.collect()
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        before = tracemalloc.take_snapshot()
+
+        await self.check_all(self.ROUNDS)
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+        growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        # A leaked recorder per check would grow by megabytes over this many checks
+        self.assertLess(growth, 256 * 1024)
+
+    async def test_removed_recordings_release_their_recorders(self):
+        await self.check_all(1)
+        observer_count = self.observer_count
+
+        await self.manager.remove_recording(self.recordings[0])
+        self.assertNotIn(self.recordings[0].rec_id, self.manager.recorders)
+        self.assertEqual(self.observer_count, observer_count - 1)
+
+        self.manager.close_recorders(self.recordings[1:3])
+        self.assertEqual(len(self.manager.recorders), self.RECORDINGS - 3)
+        self.assertEqual(self.observer_count, observer_count - 3)
+
+        await self.manager.clear_all_recordings()
+        self.assertEqual(self.manager.recorders, {})
+        self.assertEqual(self.observer_count, observer_count - self.RECORDINGS)
+
+    async def test_replaced_recording_gets_a_new_recorder(self):
+        recording = self.recordings[0]
+        recorder = self.manager.get_recorder(recording)
+        observer_count = self.observer_count
+
+        replacement = create_recording(0)
+        new_recorder = self.manager.get_recorder(replacement)
+        self.assertIsNot(new_recorder, recorder)
+        self.assertIs(self.manager.recorders[recording.rec_id], new_recorder)
+        self.assertEqual(self.observer_count, observer_count)
+
+
+class RecordingPersistenceTest(RecordingManagerTestCase):
+    async def test_only_dirty_recordings_are_serialized(self):
+        await self.manager.flush_recordings()
+        store = self.app.config_manager.recordings_store
+        self.recordings[0].quality = "HD"
+        self.recordings[1].last_duration = timedelta(minutes=5)
+        await self.manager.remove_recording(self.recordings[2])
+        with mock.patch.object(store, "save", wraps=store.save) as save:
+            await self.manager.flush_recordings()
+        recordings, rec_ids = save.call_args.args
+        self.assertEqual([data["rec_id"] for data in recordings], ["rec-0", "rec-1"])
+        self.assertEqual(len(rec_ids), self.RECORDINGS - 1)
+
+        saved = {data["rec_id"]: data for data in store.iter_recordings()}
+        self.assertEqual(len(saved), self.RECORDINGS - 1)
+        self.assertEqual(saved["rec-0"]["quality"], "HD")
+        self.assertEqual(saved["rec-1"]["last_duration"], 300.0)
+        self.assertNotIn("rec-2", saved)
+
+    async def test_failed_save_keeps_changes_pending(self):
+        await self.manager.flush_recordings()
+        recording = self.recordings[0]
+        recording.quality = "HD"
+        await self.manager.persist_recordings()
+        with mock.patch.object(
+            self.app.config_manager, "save_recordings_config", side_effect=OSError("disk full")
+        ):
+            await self.manager.flush_recordings()
+        self.assertEqual(self.manager.persister.failures, 1)
+        self.assertEqual(recording.dirty_fields, {"quality"})
+
+        await self.manager.flush_recordings()
+        self.assertFalse(recording.is_dirty)
+        saved = {data["rec_id"]: data for data in self.app.config_manager.recordings_store.iter_recordings()}
+        self.assertEqual(saved[recording.rec_id]["quality"], "HD")
+
+
+if __name__ == "__main__":
+    unittest.main()
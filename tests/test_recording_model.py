@@ -0,0 +1,169 @@
+import gc
+import timeit
+import tracemalloc
+import unittest
+from datetime import datetime, timedelta
+
+from app.models.recording_model import PERSISTENT_FIELDS, Recording, RecordingState
+
+RECORDING_DATA = {
+    "rec_id": "rec-1",
+    "url": "https://live.douyin.com/745964462470",
+    "streamer_name": "anchor",
+    "record_format": "TS",
+    "quality": "OD",
+    "segment_record": True,
+    "segment_time": "1800",
+    "monitor_status": True,
+    "scheduled_recording": False,
+    "scheduled_start_time": "18:30:00",
+    "monitor_hours": 3,
+    "recording_dir": "/downloads/anchor",
+    "priority": 2,
+    "output_profiles": ["M4A"],
+}
+
+
+class RecordingDirtyTrackingTest(unittest.TestCase):
+    def setUp(self):
+        self.recording = Recording.from_dict(RECORDING_DATA)
+
+    def test_loaded_recording_is_clean(self):
+        self.assertFalse(self.recording.is_dirty)
+        self.assertEqual(self.recording.dirty_fields, frozenset())
+
+    def test_changing_a_saved_setting_marks_it_dirty(self):
+        self.recording.quality = "HD"
+        self.recording.monitor_status = False
+        self.assertTrue(self.recording.is_dirty)
+        self.assertEqual(self.recording.dirty_fields, {"quality", "monitor_status"})
+
+    def test_assigning_the_same_value_keeps_it_clean(self):
+        self.recording.quality = "OD"
+        self.recording.output_profiles = ["M4A"]
+        self.assertFalse(self.recording.is_dirty)
+
+    def test_runtime_state_never_marks_dirty(self):
+        self.recording.recording = True
+        self.recording.status_info = "recording"
+        self.recording.start_time = datetime.now()
+        self.recording.display_title = "[live] anchor - OD"
+        self.assertFalse(self.recording.is_dirty)
+
+    def test_clear_dirty(self):
+        self.recording.url = "https://live.douyin.com/1"
+        self.recording.clear_dirty()
+        self.assertFalse(self.recording.is_dirty)
+        self.recording.url = "https://live.douyin.com/2"
+        self.assertEqual(self.recording.dirty_fields, {"url"})
+
+    def test_update_returns_changed_attributes(self):
+        changed = self.recording.update(
+            {"quality": "HD", "streamer_name": "anchor", "is_live": True, "speed": "X KB/s", "unknown": 1}
+        )
+        self.assertEqual(changed, {"quality", "is_live"})
+        self.assertEqual(self.recording.dirty_fields, {"quality"})
+        self.assertTrue(self.recording.is_live)
+
+    def test_last_duration_is_tracked(self):
+        self.recording.last_duration = timedelta()
+        self.assertFalse(self.recording.is_dirty)
+        self.recording.last_duration = timedelta(minutes=5)
+        self.assertEqual(self.recording.dirty_fields, {"last_duration"})
+
+        self.recording.clear_dirty()
+        changed = self.recording.update({"last_duration": timedelta(minutes=6), "cumulative_duration": timedelta()})
+        self.assertEqual(changed, {"last_duration"})
+        self.assertEqual(self.recording.dirty_fields, {"last_duration"})
+        self.assertEqual(self.recording.state.last_duration, timedelta(minutes=6))
+
+    def test_dirty_fields_is_a_snapshot(self):
+        dirty_fields = self.recording.dirty_fields
+        self.recording.priority = 5
+        self.assertEqual(dirty_fields, frozenset())
+
+
+class RecordingStateSplitTest(unittest.TestCase):
+    def setUp(self):
+        self.recording = Recording.from_dict(RECORDING_DATA)
+
+    def test_saved_and_runtime_keys_are_disjoint(self):
+        self.assertEqual(Recording.PERSISTENT_KEYS, frozenset(PERSISTENT_FIELDS))
+        self.assertEqual(Recording.STATE_KEYS, frozenset(RecordingState.__slots__))
+        self.assertFalse(Recording.PERSISTENT_KEYS & Recording.STATE_KEYS)
+
+    def test_runtime_state_lives_on_the_state_object(self):
+        self.recording.is_checking = True
+        self.assertTrue(self.recording.state.is_checking)
+        self.recording.state.live_title = "title"
+        self.assertEqual(self.recording.live_title, "title")
+
+    def test_to_dict_excludes_runtime_state(self):
+        self.recording.update({"recording": True, "is_live": True, "status_info": "recording", "speed": "1 MB/s"})
+        data = self.recording.to_dict()
+        self.assertEqual(set(data), set(PERSISTENT_FIELDS) | {"last_duration"})
+        # The last duration is the only runtime value that is saved, as seconds
+        self.assertFalse((set(data) - {"last_duration"}) & Recording.STATE_KEYS)
+
+    def test_from_dict_round_trip(self):
+        self.recording.last_duration = timedelta(minutes=90, seconds=5)
+        data = self.recording.to_dict()
+        self.assertEqual(data["last_duration"], 5405.0)
+
+        restored = Recording.from_dict(data)
+        self.assertEqual(restored.to_dict(), data)
+        self.assertEqual(restored.last_duration, timedelta(minutes=90, seconds=5))
+        self.assertFalse(restored.is_dirty)
+        for name in PERSISTENT_FIELDS:
+            self.assertEqual(getattr(restored, name), RECORDING_DATA[name])
+
+    def test_from_dict_defaults(self):
+        restored = Recording.from_dict({"rec_id": "rec-2", "url": "https://live.douyin.com/2"})
+        self.assertEqual(restored.priority, 0)
+        self.assertEqual(restored.output_profiles, [])
+        self.assertEqual(restored.last_duration, timedelta())
+
+    def test_slots_only(self):
+        self.assertFalse(hasattr(self.recording, "__dict__"))
+        self.assertFalse(hasattr(self.recording.state, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.recording.unknown_attribute = 1
+
+
+class RecordingFootprintTest(unittest.TestCase):
+    """Benchmark of the memory per recording and the cost of `update`, with generous bounds for slow machines."""
+
+    RECORDINGS = 10_000
+    # The former model kept every attribute in a __dict__ and took about 1,900 bytes per recording
+    MAX_BYTES_PER_RECORDING = 1_200
+    MAX_UPDATE_MICROSECONDS = 20
+
+    def test_memory_per_recording(self):
+        gc.collect()
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        before = tracemalloc.take_snapshot()
+        recordings = [
+            Recording.from_dict({**RECORDING_DATA, "rec_id": f"rec-{index}", "url": f"https://live.douyin.com/{index}"})
+            for index in range(self.RECORDINGS)
+        ]
+        after = tracemalloc.take_snapshot()
+        growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        self.assertEqual(len(recordings), self.RECORDINGS)
+        self.assertLess(growth / self.RECORDINGS, self.MAX_BYTES_PER_RECORDING)
+
+    def test_update_cost(self):
+        recording = Recording.from_dict(RECORDING_DATA)
+        updates = (
+            {"quality": "HD", "is_live": True, "speed": "1 MB/s"},
+            {"quality": "OD", "is_live": False, "speed": "2 MB/s"},
+        )
+        rounds = 20_000
+        seconds = min(
+            timeit.repeat(lambda: [recording.update(info) for info in updates], number=rounds // 2, repeat=3)
+        )
+        self.assertLess(seconds / rounds * 1_000_000, self.MAX_UPDATE_MICROSECONDS)
+
+
+if __name__ == "__main__":
+    unittest.main()